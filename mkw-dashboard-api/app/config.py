@@ -52,6 +52,9 @@ class Settings(BaseSettings):
     # API key for bot -> API communication
     api_key: str = os.getenv("API_KEY", "")
 
+    # Duplicate war detection window in days (0 = all history), same as the bot's
+    duplicate_war_window_days: float = float(os.getenv("DUPLICATE_WAR_WINDOW_DAYS", "0"))
+
     class Config:
         env_file = ".env"
         case_sensitive = False
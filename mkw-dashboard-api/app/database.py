@@ -14,6 +14,9 @@ from contextlib import contextmanager
 from urllib.parse import urlparse
 
 from app.config import settings
+from app.guild_cache import GuildConfigCache
+from app.stats_engine import GuildPerformances, compute_guild_metrics
+from app.war_fingerprint import war_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +43,9 @@ class DatabaseManager:
             logger.error(f"Failed to create PostgreSQL connection pool: {e}")
             raise
 
+        # Guild configs served from memory once main.py calls guild_configs.start()
+        self.guild_configs = GuildConfigCache(self.connection_params)
+
         # Initialize dashboard-specific tables
         self._init_dashboard_tables()
 
@@ -293,6 +299,103 @@ class DatabaseManager:
             logger.error(f"Error getting player stats: {e}")
             return None
 
+    # Same rows as the bot's DatabaseManager.PLAYER_ALIAS_ROWS_SQL (kept identical, see
+    # testing/test_dashboard_database.py): one per lowercased name/nickname/display name/username,
+    # best kind wins when a player has the same alias twice (name > nickname > display_name > username)
+    PLAYER_ALIAS_ROWS_SQL = """
+        SELECT DISTINCT ON (p.guild_id, LOWER(a.alias))
+               p.guild_id, LOWER(a.alias), p.id, a.kind
+        FROM players p
+        CROSS JOIN LATERAL (
+            SELECT p.player_name, 'name', 1
+            UNION ALL
+            SELECT nick, 'nickname', 2
+            FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(p.nicknames) = 'array' THEN p.nicknames ELSE '[]'::jsonb END
+            ) AS nick
+            UNION ALL
+            SELECT p.display_name, 'display_name', 3
+            UNION ALL
+            SELECT p.discord_username, 'username', 4
+        ) AS a(alias, kind, priority)
+        WHERE p.is_active = TRUE
+          AND (%(player_id)s::int IS NULL OR p.id = %(player_id)s::int)
+          AND a.alias IS NOT NULL AND a.alias <> ''
+        ORDER BY p.guild_id, LOWER(a.alias), a.priority, p.id
+    """
+
+    def _has_player_aliases(self, cursor) -> bool:
+        """Check whether the bot's player_aliases table exists (player_aliases migration)."""
+        if getattr(self, '_player_aliases_available', False):
+            return True
+        cursor.execute("SELECT to_regclass('public.player_aliases') IS NOT NULL")
+        self._player_aliases_available = cursor.fetchone()[0]
+        return self._player_aliases_available
+
+    def _sync_player_aliases(self, cursor, player_id: int) -> None:
+        """Rebuild a player's rows in the bot's player_aliases lookup table (no commit)."""
+        if not self._has_player_aliases(cursor):
+            return
+
+        cursor.execute("""
+            DELETE FROM player_aliases WHERE player_id = %s RETURNING guild_id, alias_casefold
+        """, (player_id,))
+        freed = cursor.fetchall()
+        # A real player name takes an alias over from another player's nickname/display name
+        cursor.execute(f"""
+            INSERT INTO player_aliases (guild_id, alias_casefold, player_id, kind)
+            {self.PLAYER_ALIAS_ROWS_SQL}
+            ON CONFLICT (guild_id, alias_casefold) DO UPDATE
+                SET player_id = EXCLUDED.player_id, kind = EXCLUDED.kind
+                WHERE EXCLUDED.kind = 'name' AND player_aliases.kind <> 'name'
+        """, {'player_id': player_id})
+
+        # Aliases the player gave up go back to the best remaining owner
+        if freed:
+            cursor.execute(f"""
+                INSERT INTO player_aliases (guild_id, alias_casefold, player_id, kind)
+                SELECT a.guild_id, a.alias_casefold, a.player_id, a.kind
+                FROM ({self.PLAYER_ALIAS_ROWS_SQL}) AS a(guild_id, alias_casefold, player_id, kind)
+                WHERE a.guild_id = %(guild_id)s AND a.alias_casefold = ANY(%(freed)s)
+                ON CONFLICT (guild_id, alias_casefold) DO NOTHING
+            """, {'player_id': None, 'guild_id': freed[0][0], 'freed': [row[1] for row in freed]})
+
+    def _find_alias_conflicts(self, cursor, player_id: int, guild_id: int, aliases: List[str]) -> List[str]:
+        """Return the aliases that already belong to a different active player in the guild."""
+        if not aliases or not self._has_player_aliases(cursor):
+            return []
+
+        cursor.execute("""
+            SELECT a.alias
+            FROM unnest(%s::text[]) AS a(alias)
+            WHERE EXISTS (
+                SELECT 1 FROM player_aliases pa
+                JOIN players p ON p.id = pa.player_id
+                WHERE pa.guild_id = %s
+                  AND pa.alias_casefold = LOWER(a.alias)
+                  AND pa.player_id <> %s
+                  AND p.is_active = TRUE
+            )
+        """, (list(aliases), guild_id, player_id))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _has_leaderboard_snapshots(self, cursor) -> bool:
+        """Check whether the bot's leaderboard snapshot tables exist (leaderboard_snapshots migration)."""
+        if getattr(self, '_leaderboard_snapshots_available', False):
+            return True
+        cursor.execute("SELECT to_regclass('public.leaderboard_snapshot_versions') IS NOT NULL")
+        self._leaderboard_snapshots_available = cursor.fetchone()[0]
+        return self._leaderboard_snapshots_available
+
+    def _mark_leaderboard_stale(self, cursor, guild_id: int) -> None:
+        """Flag the bot's leaderboard snapshot for this guild for a rebuild (no commit)."""
+        if not self._has_leaderboard_snapshots(cursor):
+            return
+
+        cursor.execute("""
+            UPDATE leaderboard_snapshot_versions SET stale = TRUE WHERE guild_id = %s
+        """, (guild_id,))
+
     def add_player(self, player_name: str, guild_id: int,
                    member_status: str = 'member', added_by: str = None) -> bool:
         """Add a new player to the roster."""
@@ -315,12 +418,16 @@ class DatabaseManager:
                         UPDATE players SET is_active = TRUE, member_status = %s
                         WHERE id = %s
                     """, (member_status, existing[0]))
+                    player_id = existing[0]
                 else:
                     cursor.execute("""
                         INSERT INTO players (player_name, guild_id, member_status, added_by)
                         VALUES (%s, %s, %s, %s)
+                        RETURNING id
                     """, (player_name, guild_id, member_status, added_by))
+                    player_id = cursor.fetchone()[0]
 
+                self._sync_player_aliases(cursor, player_id)
                 conn.commit()
                 return True
         except Exception as e:
@@ -351,7 +458,7 @@ class DatabaseManager:
 
                 # Get current nicknames
                 cursor.execute("""
-                    SELECT nicknames FROM players
+                    SELECT id, nicknames FROM players
                     WHERE guild_id = %s AND LOWER(player_name) = LOWER(%s)
                 """, (guild_id, player_name))
 
@@ -359,7 +466,12 @@ class DatabaseManager:
                 if not row:
                     return False
 
-                nicknames = row[0] or []
+                # Same rule as the bot: a nickname can't point at two players
+                if self._find_alias_conflicts(cursor, row[0], guild_id, [nickname]):
+                    logger.info(f"Nickname '{nickname}' is already used by another player")
+                    return False
+
+                nicknames = row[1] or []
                 if nickname not in nicknames:
                     nicknames.append(nickname)
 
@@ -368,6 +480,7 @@ class DatabaseManager:
                     WHERE guild_id = %s AND LOWER(player_name) = LOWER(%s)
                 """, (json.dumps(nicknames), guild_id, player_name))
 
+                self._sync_player_aliases(cursor, row[0])
                 conn.commit()
                 return True
         except Exception as e:
@@ -376,36 +489,72 @@ class DatabaseManager:
 
     # ==================== WAR METHODS ====================
 
-    def get_wars(self, guild_id: int, limit: int = 20, offset: int = 0) -> List[Dict]:
-        """Get wars for a guild with pagination."""
+    def _war_row_to_dict(self, row) -> Dict:
+        """Convert a (id, war_date, race_count, results, player_count, team_score,
+        team_differential, created_at) row to the API's war dict."""
+        results = row[3] if isinstance(row[3], list) else json.loads(row[3]) if row[3] else []
+        return {
+            'id': row[0],
+            'war_date': row[1].isoformat() if row[1] else None,
+            'race_count': row[2],
+            'players': results,
+            'player_count': row[4] if row[4] is not None else len(results),
+            'team_score': row[5],
+            'team_differential': row[6],
+            'created_at': row[7].isoformat() if row[7] else None
+        }
+
+    def get_wars(self, guild_id: int, limit: int = 20, offset: int = 0,
+                 before: Optional[tuple] = None) -> List[Dict]:
+        """Get wars for a guild with pagination, newest first.
+
+        Pass before=(created_at, id) of the previous page's last war to page by
+        keyset instead of OFFSET. Only the results array of players_data is read.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                if before:
+                    cursor.execute("""
+                        SELECT id, war_date, race_count, players_data->'results', player_count,
+                               team_score, team_differential, created_at
+                        FROM wars
+                        WHERE guild_id = %s AND (created_at, id) < (%s::timestamptz, %s)
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT %s
+                    """, (guild_id, before[0], before[1], limit))
+                else:
+                    cursor.execute("""
+                        SELECT id, war_date, race_count, players_data->'results', player_count,
+                               team_score, team_differential, created_at
+                        FROM wars
+                        WHERE guild_id = %s
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT %s OFFSET %s
+                    """, (guild_id, limit, offset))
+
+                return [self._war_row_to_dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting wars: {e}")
+            return []
+
+    def get_war(self, guild_id: int, war_id: int) -> Optional[Dict]:
+        """Get a single war by ID."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT id, war_date, race_count, players_data,
+                    SELECT id, war_date, race_count, players_data->'results', player_count,
                            team_score, team_differential, created_at
                     FROM wars
-                    WHERE guild_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT %s OFFSET %s
-                """, (guild_id, limit, offset))
+                    WHERE id = %s AND guild_id = %s
+                """, (war_id, guild_id))
 
-                wars = []
-                for row in cursor.fetchall():
-                    players_data = row[3] if isinstance(row[3], dict) else json.loads(row[3]) if row[3] else {}
-                    wars.append({
-                        'id': row[0],
-                        'war_date': row[1].isoformat() if row[1] else None,
-                        'race_count': row[2],
-                        'players': players_data.get('results', []),
-                        'team_score': row[4],
-                        'team_differential': row[5],
-                        'created_at': row[6].isoformat() if row[6] else None
-                    })
-                return wars
+                row = cursor.fetchone()
+                return self._war_row_to_dict(row) if row else None
         except Exception as e:
-            logger.error(f"Error getting wars: {e}")
-            return []
+            logger.error(f"Error getting war: {e}")
+            return None
 
     def get_war_count(self, guild_id: int) -> int:
         """Get total war count for pagination."""
@@ -421,6 +570,74 @@ class DatabaseManager:
             logger.error(f"Error getting war count: {e}")
             return 0
 
+    def _resolve_player_names(self, cursor, names: List[str], guild_id: int) -> Dict[str, str]:
+        """{name: player_name} for names matching an active player's name or alias, case-insensitively."""
+        names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        if not names:
+            return {}
+
+        if self._has_player_aliases(cursor):
+            cursor.execute("""
+                SELECT q.name, p.player_name
+                FROM unnest(%s::text[]) AS q(name)
+                JOIN player_aliases pa ON pa.guild_id = %s AND pa.alias_casefold = LOWER(q.name)
+                JOIN players p ON p.id = pa.player_id AND p.is_active = TRUE
+            """, (names, guild_id))
+        else:
+            cursor.execute("""
+                SELECT q.name, p.player_name
+                FROM unnest(%s::text[]) AS q(name)
+                JOIN players p ON p.guild_id = %s AND p.is_active = TRUE
+                                AND LOWER(p.player_name) = LOWER(q.name)
+            """, (names, guild_id))
+        return dict(cursor.fetchall())
+
+    def find_duplicate_wars(self, guild_id: int, wars: List[tuple],
+                            window_days: Optional[float] = None) -> List[Optional[Dict]]:
+        """Check (results, race_count) wars against the guild's saved wars and each other.
+
+        Returns one entry per war: None if it's new, {'war_id', 'created_at'} for the
+        saved war it repeats, or {'batch_index'} for an earlier war in the list.
+        """
+        if not wars:
+            return []
+        if window_days is None:
+            window_days = settings.duplicate_war_window_days
+
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                names = self._resolve_player_names(
+                    cursor, [result.get('name') for results, _ in wars for result in results], guild_id
+                )
+                fingerprints = [war_fingerprint(results, race_count, names) for results, race_count in wars]
+
+                cursor.execute("""
+                    SELECT DISTINCT ON (fingerprint) fingerprint, id, created_at
+                    FROM wars
+                    WHERE guild_id = %s
+                      AND fingerprint = ANY(%s)
+                      AND (%s <= 0 OR created_at >= NOW() - %s * INTERVAL '1 day')
+                    ORDER BY fingerprint, created_at DESC, id DESC
+                """, (guild_id, list(set(fingerprints)), window_days, window_days))
+                existing = {row[0]: {'war_id': row[1], 'created_at': row[2].isoformat() if row[2] else None}
+                            for row in cursor.fetchall()}
+
+            duplicates = []
+            first_in_batch = {}
+            for index, fingerprint in enumerate(fingerprints):
+                if fingerprint in existing:
+                    duplicates.append(dict(existing[fingerprint]))
+                elif fingerprint in first_in_batch:
+                    duplicates.append({'batch_index': first_in_batch[fingerprint]})
+                else:
+                    duplicates.append(None)
+                first_in_batch.setdefault(fingerprint, index)
+            return duplicates
+        except Exception as e:
+            logger.error(f"Error checking for duplicate wars: {e}")
+            return [None] * len(wars)
+
     def add_war(self, guild_id: int, results: List[Dict], race_count: int = 12) -> Optional[int]:
         """Add a new war to the database."""
         try:
@@ -439,13 +656,16 @@ class DatabaseManager:
                     'race_count': race_count
                 }
 
+                names = self._resolve_player_names(cursor, [r.get('name') for r in results], guild_id)
+
                 cursor.execute("""
                     INSERT INTO wars (war_date, race_count, players_data, guild_id,
-                                     team_score, team_differential)
-                    VALUES (CURRENT_DATE, %s, %s, %s, %s, %s)
+                                     team_score, team_differential, player_count, fingerprint)
+                    VALUES (CURRENT_DATE, %s, %s, %s, %s, %s, %s, %s)
                     RETURNING id
                 """, (race_count, json.dumps(players_data), guild_id,
-                      team_score, team_differential))
+                      team_score, team_differential, len(results),
+                      war_fingerprint(results, race_count, names)))
 
                 war_id = cursor.fetchone()[0]
                 conn.commit()
@@ -459,7 +679,10 @@ class DatabaseManager:
     def update_player_stats(self, player_name: str, score: int, races_played: int,
                             war_participation: float, war_date: str, guild_id: int,
                             team_differential: int = 0) -> bool:
-        """Update player statistics when a war is added with fractional war support."""
+        """Update player statistics when a war is added with fractional war support.
+
+        recompute_war_player_aggregates finishes the war, once all its players are written.
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
@@ -480,10 +703,17 @@ class DatabaseManager:
                     # Correct average calculation: total_score / war_count
                     new_average = round(new_total_score / new_war_count, 2) if new_war_count > 0 else 0
 
+                    # Volatile metrics are invalidated for the bot's metrics warmer to recompute
                     cursor.execute("""
                         UPDATE players
                         SET total_score = %s, total_races = %s, war_count = %s,
                             average_score = %s, last_war_date = %s, total_team_differential = %s,
+                            avg10_score = NULL,
+                            form_score = NULL,
+                            clutch_factor = NULL,
+                            potential = NULL,
+                            hotstreak = NULL,
+                            cached_metrics_updated_at = NULL,
                             updated_at = CURRENT_TIMESTAMP
                         WHERE player_name = %s AND guild_id = %s
                     """, (new_total_score, new_total_races, new_war_count, new_average,
@@ -534,6 +764,92 @@ class DatabaseManager:
             logger.error(f"Error adding player war performance: {e}")
             return False
 
+    # Same statements as the bot's DatabaseManager.PLAYER_AGGREGATE_RECOMPUTE_SQL and
+    # PLAYER_AGGREGATE_UPDATE_SQL (kept identical, see testing/test_dashboard_database.py):
+    # the bot's running aggregates, recomputed from player_war_performances
+    PLAYER_AGGREGATE_RECOMPUTE_SQL = """
+        SELECT p.id AS player_id,
+               COUNT(pwp.id) AS stat_war_rows,
+               COALESCE(SUM(pwp.score), 0) AS stat_score_sum,
+               COALESCE(SUM(pwp.score::BIGINT * pwp.score), 0) AS stat_score_sq_sum,
+               COUNT(pwp.id) FILTER (WHERE pwp.races_played = 12) AS stat_full_wars,
+               COALESCE(MAX(pwp.score) FILTER (WHERE pwp.races_played = 12), 0) AS highest_score,
+               COALESCE(MIN(pwp.score) FILTER (WHERE pwp.races_played = 12), 0) AS lowest_score,
+               COUNT(pwp.id) FILTER (WHERE w.team_differential > 0) AS wins,
+               COUNT(pwp.id) FILTER (WHERE w.team_differential < 0) AS losses,
+               COUNT(pwp.id) FILTER (WHERE w.team_differential = 0) AS ties
+        FROM players p
+        LEFT JOIN player_war_performances pwp ON pwp.player_id = p.id
+        LEFT JOIN wars w ON w.id = pwp.war_id AND w.guild_id = p.guild_id
+        WHERE p.is_active = TRUE
+          AND (%(guild_id)s::bigint IS NULL OR p.guild_id = %(guild_id)s::bigint)
+          AND (%(player_ids)s::int[] IS NULL OR p.id = ANY(%(player_ids)s::int[]))
+        GROUP BY p.id
+    """
+
+    # Writes the recompute back, with the stable metrics derived from it
+    PLAYER_AGGREGATE_UPDATE_SQL = f"""
+        WITH expected AS ({PLAYER_AGGREGATE_RECOMPUTE_SQL}),
+        stddev AS (
+            SELECT player_id,
+                   CASE WHEN stat_war_rows > 0
+                        THEN SQRT(GREATEST(0,
+                            stat_score_sq_sum::FLOAT8 / stat_war_rows
+                            - POWER(stat_score_sum::FLOAT8 / stat_war_rows, 2)))
+                        ELSE 0 END AS score_stddev
+            FROM expected
+        )
+        UPDATE players p
+        SET stat_war_rows = e.stat_war_rows,
+            stat_score_sum = e.stat_score_sum,
+            stat_score_sq_sum = e.stat_score_sq_sum,
+            stat_full_wars = e.stat_full_wars,
+            highest_score = e.highest_score,
+            lowest_score = e.lowest_score,
+            wins = e.wins,
+            losses = e.losses,
+            ties = e.ties,
+            score_stddev = sd.score_stddev,
+            consistency_score = CASE
+                WHEN p.war_count >= 2 AND p.average_score > 0
+                THEN GREATEST(0, 100 - sd.score_stddev / p.average_score * 100)
+                ELSE NULL
+            END,
+            win_percentage = CASE
+                WHEN p.war_count > 0 THEN e.wins::DECIMAL / p.war_count * 100
+                ELSE 0.0
+            END
+        FROM expected e
+        JOIN stddev sd ON sd.player_id = e.player_id
+        WHERE p.id = e.player_id
+    """
+
+    def recompute_war_player_aggregates(self, guild_id: int, war_id: int) -> bool:
+        """Bring the running aggregates of a saved war's players up to date.
+
+        update_player_stats only maintains the totals; the bot's stat_* sums,
+        extremes, wins/losses/ties and the stable metrics derived from them are
+        recomputed here, set-based, for just this war's players. Marks the guild's
+        leaderboard snapshot stale once for the war.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT ARRAY_AGG(player_id) FROM player_war_performances WHERE war_id = %s
+                """, (war_id,))
+                player_ids = cursor.fetchone()[0]
+                if not player_ids:
+                    return False
+
+                cursor.execute(self.PLAYER_AGGREGATE_UPDATE_SQL, {'guild_id': guild_id, 'player_ids': player_ids})
+                self._mark_leaderboard_stale(cursor, guild_id)
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error recomputing player aggregates for war {war_id}: {e}")
+            return False
+
     # ==================== STATS METHODS ====================
 
     def get_leaderboard(self, guild_id: int, sort_by: str = 'average_score',
@@ -616,6 +932,38 @@ class DatabaseManager:
             logger.error(f"Error getting guild overview: {e}")
             return {}
 
+    def get_player_metrics(self, guild_id: int, player_name: Optional[str] = None) -> Dict[str, Dict]:
+        """Get Form Score, Clutch Factor, Potential and consistency per active player.
+
+        Computed for the whole guild at once by stats_engine from player_war_performances,
+        with the stored score_stddev for Potential and the bot's war_count minimums, so the
+        values match the bot's /stats. Only player_name (case-insensitive) if given.
+        Players without wars are left out.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT p.id, p.player_name, p.score_stddev, p.war_count,
+                           pwp.score, pwp.war_participation, pwp.team_differential,
+                           pwp.war_created_at, pwp.races_played
+                    FROM players p
+                    JOIN player_war_performances pwp ON pwp.player_id = p.id AND pwp.guild_id = p.guild_id
+                    WHERE p.guild_id = %s AND p.is_active = TRUE
+                      AND (%s::text IS NULL OR LOWER(p.player_name) = LOWER(%s))
+                """, (guild_id, player_name, player_name))
+                rows = cursor.fetchall()
+
+            names = {row[0]: row[1] for row in rows}
+            score_stddev = {row[0]: float(row[2]) if row[2] else 0.0 for row in rows}
+            war_counts = {row[0]: float(row[3]) if row[3] else 0.0 for row in rows}
+            perf = GuildPerformances.from_rows((row[0],) + tuple(row[4:9]) for row in rows)
+            metrics = compute_guild_metrics(perf, score_stddev, war_counts=war_counts)
+            return {names[player_id]: player_metrics for player_id, player_metrics in metrics.items()}
+        except Exception as e:
+            logger.error(f"Error getting player metrics: {e}")
+            return {}
+
     # ==================== BULK SCAN SESSION METHODS ====================
 
     def create_bulk_session(self, guild_id: int, user_id: int,
@@ -980,30 +1328,37 @@ class DatabaseManager:
 
     # ==================== GUILD CONFIG METHODS ====================
 
+    def _load_guild_config(self, guild_id: int) -> Optional[Dict]:
+        """Read a guild's config (raises on database errors, for GuildConfigCache)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT guild_name, team_names, ocr_channel_id, is_active
+                FROM guild_configs
+                WHERE guild_id = %s
+            """, (guild_id,))
+
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            team_names = row[1] if isinstance(row[1], list) else json.loads(row[1]) if row[1] else []
+
+            return {
+                'guild_id': guild_id,
+                'guild_name': row[0],
+                'team_names': team_names,
+                'ocr_channel_id': row[2],
+                'is_active': row[3]
+            }
+
     def get_guild_config(self, guild_id: int) -> Optional[Dict]:
         """Get guild configuration."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT guild_name, team_names, ocr_channel_id, is_active
-                    FROM guild_configs
-                    WHERE guild_id = %s
-                """, (guild_id,))
-
-                row = cursor.fetchone()
-                if not row:
-                    return None
-
-                team_names = row[1] if isinstance(row[1], list) else json.loads(row[1]) if row[1] else []
-
-                return {
-                    'guild_id': guild_id,
-                    'guild_name': row[0],
-                    'team_names': team_names,
-                    'ocr_channel_id': row[2],
-                    'is_active': row[3]
-                }
+            config = self.guild_configs.get(guild_id, self._load_guild_config)
+            if not config:
+                return None
+            return {**config, 'team_names': list(config['team_names'])}
         except Exception as e:
             logger.error(f"Error getting guild config: {e}")
             return None
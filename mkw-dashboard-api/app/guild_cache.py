@@ -0,0 +1,131 @@
+"""
+Guild config cache for the Dashboard API, kept coherent with LISTEN/NOTIFY.
+Adapted from mkw_stats_bot/mkw_stats/guild_cache.py.
+
+Every guild list request looks up the config of each guild the user can see.
+The bot's cache_invalidation migration installs triggers that send
+'<table>:<guild_id>' on the mkw_cache_invalidation channel whenever
+guild_configs changes (from the bot, this API or scripts); a listener thread
+drops the affected entry.
+
+Configs are only served from memory while the listener is connected; before
+start(), while reconnecting, or without the triggers, reads hit the database.
+"""
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = 'mkw_cache_invalidation'
+
+
+class GuildConfigCache:
+    """Per-guild config cache invalidated by Postgres notifications."""
+
+    def __init__(self, connection_params: Dict, keepalive_seconds: float = 30.0,
+                 reconnect_delay: float = 5.0):
+        self.connection_params = connection_params
+        self.keepalive_seconds = keepalive_seconds
+        self.reconnect_delay = reconnect_delay
+
+        self._lock = threading.Lock()
+        self._configs: Dict[int, Optional[Dict]] = {}
+        # Bumped on every invalidation so a load that raced a write isn't stored
+        self._generations: Dict[int, int] = defaultdict(int)
+        self._epoch = 0
+
+        self._listening = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._listening.is_set()
+
+    def start(self):
+        """Start the listener thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="guild-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the listener; reads go to the database afterwards."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.keepalive_seconds)
+            self._thread = None
+
+    def get(self, guild_id: int, loader: Callable[[int], Optional[Dict]]) -> Optional[Dict]:
+        """Cached config for a guild; loader must raise (not return None) on database errors."""
+        if not self.enabled:
+            return loader(guild_id)
+
+        with self._lock:
+            if guild_id in self._configs:
+                return self._configs[guild_id]
+            token = (self._epoch, self._generations[guild_id])
+
+        value = loader(guild_id)
+
+        with self._lock:
+            if self.enabled and token == (self._epoch, self._generations[guild_id]):
+                self._configs[guild_id] = value
+        return value
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        """Drop one guild's config, or every config."""
+        with self._lock:
+            if guild_id is None:
+                self._epoch += 1
+                self._configs.clear()
+            else:
+                self._generations[guild_id] += 1
+                self._configs.pop(guild_id, None)
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.connection_params)
+                conn.autocommit = True
+                cursor = conn.cursor()
+
+                cursor.execute("SELECT to_regproc('public.notify_cache_invalidation') IS NOT NULL")
+                if not cursor.fetchone()[0]:
+                    logger.warning("Guild config cache disabled: cache invalidation triggers are not installed")
+                    return
+
+                cursor.execute(f"LISTEN {CACHE_INVALIDATION_CHANNEL}")
+                # Anything loaded before LISTEN took effect may have missed a notification
+                self.invalidate()
+                self._listening.set()
+                logger.info("Guild config cache listening for invalidations")
+
+                while not self._stopping.is_set():
+                    readable, _, _ = select.select([conn], [], [], self.keepalive_seconds)
+                    if not readable:
+                        # Idle: make sure the connection is still alive, or we'd miss notifications
+                        cursor.execute("SELECT 1")
+                    conn.poll()
+                    while conn.notifies:
+                        table, _, guild_id = conn.notifies.pop(0).payload.partition(':')
+                        # Roster changes don't affect configs
+                        if table == 'guild_configs' and guild_id.isdigit():
+                            self.invalidate(int(guild_id))
+
+            except Exception as e:
+                logger.warning(f"Guild config cache listener disconnected: {e}")
+            finally:
+                self._listening.clear()
+                self.invalidate()
+                if conn is not None:
+                    conn.close()
+
+            self._stopping.wait(self.reconnect_delay)
@@ -184,51 +184,64 @@ async def confirm_session(token: str, db: DatabaseManager = Depends(get_db)):
     guild_id = session["guild_id"]
     results = db.get_bulk_results(token)
 
+    # Use corrected players if available, otherwise detected
+    approved = [
+        (result["corrected_players"] or result["detected_players"], result["race_count"] or 12)
+        for result in results if result["review_status"] == "approved"
+    ]
+
+    # Wars already saved, or approved twice in this review, are skipped
+    duplicates = db.find_duplicate_wars(guild_id, approved)
+
     # Save approved results as wars
     created_wars = []
-    for result in results:
-        if result["review_status"] == "approved":
-            # Use corrected players if available, otherwise detected
-            players = result["corrected_players"] or result["detected_players"]
-            race_count = result["race_count"] or 12
-            war_id = db.add_war(guild_id, players, race_count)
-
-            if war_id:
-                created_wars.append(war_id)
-
-                # Calculate team differential
-                team_score = sum(p.get('score', 0) for p in players)
-                breakeven = 41 * race_count
-                team_differential = team_score - breakeven
-
-                # Update player stats and add war performance for each player
-                war_date = datetime.now().strftime('%Y-%m-%d')
-                for player in players:
-                    player_name = player.get('name')
-                    score = player.get('score', 0)
-                    races_played = player.get('races_played', race_count)
-                    war_participation = races_played / race_count if race_count > 0 else 1.0
-
-                    # Add player war performance record
-                    db.add_player_war_performance(
-                        player_name=player_name,
-                        war_id=war_id,
-                        score=score,
-                        races_played=races_played,
-                        race_count=race_count,
-                        guild_id=guild_id
-                    )
-
-                    # Update player statistics
-                    db.update_player_stats(
-                        player_name=player_name,
-                        score=score,
-                        races_played=races_played,
-                        war_participation=war_participation,
-                        war_date=war_date,
-                        guild_id=guild_id,
-                        team_differential=team_differential
-                    )
+    duplicates_skipped = 0
+    for (players, race_count), duplicate in zip(approved, duplicates):
+        if duplicate:
+            duplicates_skipped += 1
+            continue
+
+        war_id = db.add_war(guild_id, players, race_count)
+
+        if war_id:
+            created_wars.append(war_id)
+
+            # Calculate team differential
+            team_score = sum(p.get('score', 0) for p in players)
+            breakeven = 41 * race_count
+            team_differential = team_score - breakeven
+
+            # Update player stats and add war performance for each player
+            war_date = datetime.now().strftime('%Y-%m-%d')
+            for player in players:
+                player_name = player.get('name')
+                score = player.get('score', 0)
+                races_played = player.get('races_played', race_count)
+                war_participation = races_played / race_count if race_count > 0 else 1.0
+
+                # Add player war performance record
+                db.add_player_war_performance(
+                    player_name=player_name,
+                    war_id=war_id,
+                    score=score,
+                    races_played=races_played,
+                    race_count=race_count,
+                    guild_id=guild_id
+                )
+
+                # Update player statistics
+                db.update_player_stats(
+                    player_name=player_name,
+                    score=score,
+                    races_played=races_played,
+                    war_participation=war_participation,
+                    war_date=war_date,
+                    guild_id=guild_id,
+                    team_differential=team_differential
+                )
+
+            # Running aggregates (sums, extremes, wins/losses) for the war's players, as the bot keeps them
+            db.recompute_war_player_aggregates(guild_id, war_id)
 
     # Mark session as completed
     db.complete_bulk_session(token)
@@ -236,7 +249,8 @@ async def confirm_session(token: str, db: DatabaseManager = Depends(get_db)):
     return {
         "status": "success",
         "wars_created": len(created_wars),
-        "war_ids": created_wars
+        "war_ids": created_wars,
+        "duplicates_skipped": duplicates_skipped
     }
 
 
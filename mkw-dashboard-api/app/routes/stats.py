@@ -43,4 +43,12 @@ async def get_player_stats(
     stats = db.get_player_stats(player_name, guild_id)
     if not stats:
         raise HTTPException(status_code=404, detail="Player not found")
+    stats['metrics'] = db.get_player_metrics(guild_id, stats['name']).get(stats['name'])
     return stats
+
+
+@router.get("/metrics")
+async def get_metrics(guild_id: int, db: DatabaseManager = Depends(get_db)):
+    """Get Form Score, Clutch Factor, Potential and consistency for every player."""
+    metrics = db.get_player_metrics(guild_id)
+    return {"metrics": [{"name": name, **values} for name, values in sorted(metrics.items())]}
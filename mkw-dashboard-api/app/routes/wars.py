@@ -66,11 +66,8 @@ async def create_war(
 @router.get("/{war_id}")
 async def get_war(guild_id: int, war_id: int, db: DatabaseManager = Depends(get_db)):
     """Get details for a specific war."""
-    wars = db.get_wars(guild_id, limit=1000, offset=0)
-
-    # Find the specific war
-    for war in wars:
-        if war["id"] == war_id:
-            return war
+    war = db.get_war(guild_id, war_id)
+    if war:
+        return war
 
     raise HTTPException(status_code=404, detail="War not found")
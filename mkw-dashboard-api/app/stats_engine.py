@@ -0,0 +1,302 @@
+"""
+Vectorized player metrics for a whole guild.
+Adapted from mkw_stats_bot/mkw_stats/stats_engine.py; testing/test_dashboard_database.py
+keeps the code identical.
+
+Takes a guild's player_war_performances as columns and computes every player's
+Form Score, Clutch Factor, Potential, last-X stats and consistency at once with
+NumPy group-by reductions, using the same windows, thresholds and rounding as
+the bot's per-player metric methods, so the dashboard shows the numbers /stats
+does.
+
+Usage:
+    perf = GuildPerformances.from_rows(rows)  # (player_id, score, war_participation,
+                                              #  team_differential, war_created_at[, races_played])
+    metrics = compute_guild_metrics(perf)     # {player_id: {'form_score': ..., ...}}
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+FORM_SCORE_DECAY_FACTOR = 0.85
+FORM_SCORE_MIN_WARS = 10
+FORM_SCORE_WINDOW = 20          # most recent performances searched for valid form wars
+CLOSE_WAR_DIFFERENTIAL = 38     # |team_differential| <= 38 is a close war (clutch factor)
+POTENTIAL_WARS = 10
+FULL_WAR_RACES = 12
+
+# players.war_count needed before a metric is shown; below it the bot caches NULL
+METRIC_MIN_WAR_COUNTS = {'avg10_score': 10, 'form_score': 10, 'potential': 10, 'clutch_factor': 2}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _microseconds(value) -> int:
+    """Exact integer sort key for a war timestamp (datetime or number)."""
+    if isinstance(value, datetime):
+        epoch = _EPOCH if value.tzinfo else _EPOCH.replace(tzinfo=None)
+        return (value - epoch) // _MICROSECOND
+    return int(value)
+
+
+class GuildPerformances:
+    """One guild's war performances as columns, grouped by player, newest first.
+
+    team_differential may contain None (no differential recorded); it becomes NaN,
+    which never counts as a close war, win, loss or tie.
+    """
+
+    def __init__(self, player_id, score, participation, team_differential, created_at, races_played=None):
+        player_id = np.asarray(player_id, dtype=np.int64)
+        created_at = np.array([_microseconds(value) for value in created_at], dtype=np.int64)
+
+        # Player, then newest first; equal timestamps keep their input order
+        order = np.lexsort((np.arange(len(player_id)), -created_at, player_id))
+
+        self.player_id = player_id[order]
+        self.created_at = created_at[order]
+        self.score = np.asarray(score, dtype=np.float64)[order]
+        self.participation = np.asarray(participation, dtype=np.float64)[order]
+        self.team_differential = np.asarray(team_differential, dtype=np.float64)[order]
+        self.races_played = None if races_played is None else np.asarray(races_played, dtype=np.int64)[order]
+
+        self.players, self.starts, self.counts = np.unique(self.player_id, return_index=True, return_counts=True)
+        self.group = np.repeat(np.arange(len(self.players)), self.counts)
+        # 0 = the player's most recent performance
+        self.rank = np.arange(len(self.player_id)) - np.repeat(self.starts, self.counts)
+
+        # Scores scaled to a full war; performances without participation keep their raw score
+        self.normalized = np.divide(self.score, self.participation, out=self.score.copy(),
+                                    where=self.participation > 0)
+
+    @classmethod
+    def from_rows(cls, rows) -> 'GuildPerformances':
+        """Build from (player_id, score, war_participation, team_differential, war_created_at[, races_played]) rows."""
+        rows = list(rows)
+        if not rows:
+            return cls([], [], [], [], [])
+        return cls(*zip(*rows))
+
+    def __len__(self) -> int:
+        return len(self.player_id)
+
+    def count(self, mask: np.ndarray) -> np.ndarray:
+        """Per-player number of rows in mask."""
+        return np.bincount(self.group[mask], minlength=len(self.players))
+
+    def sum(self, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Per-player sum of values over mask, added newest first."""
+        sums = np.bincount(self.group[mask], weights=values[mask], minlength=len(self.players))
+        return sums.astype(np.float64, copy=False)  # bincount of nothing is int64
+
+    def running_count(self, mask: np.ndarray) -> np.ndarray:
+        """For each row, how many of its player's rows up to and including it are in mask."""
+        running = np.cumsum(mask)
+        before = running[self.starts] - mask[self.starts]
+        return running - np.repeat(before, self.counts)
+
+    def mean_and_stddev(self, values: np.ndarray, mask: np.ndarray):
+        """Per-player (count, mean, population stddev) of values over mask; NaN where empty."""
+        counts = self.count(mask)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.sum(values, mask) / counts
+            deviations = values - means[self.group]
+            stddevs = np.sqrt(self.sum(deviations * deviations, mask) / counts)
+        return counts, means, stddevs
+
+    def spread(self, values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Per-player True where values over mask are not all equal."""
+        low = np.full(len(self.players), np.inf)
+        high = np.full(len(self.players), -np.inf)
+        np.minimum.at(low, self.group[mask], values[mask])
+        np.maximum.at(high, self.group[mask], values[mask])
+        return high > low
+
+
+def _round(value, digits: int) -> Optional[float]:
+    return None if value is None else round(float(value), digits)
+
+
+def form_score_ratings(raw_form_scores: np.ndarray) -> np.ndarray:
+    """Vectorized DatabaseManager._form_score_rating, before rounding."""
+    raw = np.asarray(raw_form_scores, dtype=np.float64)
+    rating = np.select(
+        [raw <= 84, raw <= 100, raw <= 110],
+        [(raw / 84.0) * 6.0,
+         6.0 + ((raw - 84) / 16.0) * 3.0,
+         9.0 + ((raw - 100) / 10.0)],
+        10.0 + ((raw - 110) / 10.0),
+    )
+    return np.maximum(0.0, rating)
+
+
+def form_scores(perf: GuildPerformances, decay: float = FORM_SCORE_DECAY_FACTOR,
+                min_wars: int = FORM_SCORE_MIN_WARS, window: int = FORM_SCORE_WINDOW) -> Dict[int, float]:
+    """Form Score per player: EWMA of the first min_wars valid performances among the last window.
+
+    Players without min_wars valid performances in the window are left out.
+    """
+    valid = (perf.rank < window) & (perf.participation > 0)
+    valid_rank = perf.running_count(valid) - 1
+    used = valid & (valid_rank < min_wars)
+
+    # decay^i for the i-th most recent valid performance
+    weights = np.zeros(len(perf))
+    np.power(decay, valid_rank, out=weights, where=used)
+
+    counts = perf.count(used)
+    weight_sums = perf.sum(weights, used)
+    weighted_sums = perf.sum(perf.normalized * weights, used)
+
+    eligible = (counts >= min_wars) & (weight_sums > 0)
+    ratings = form_score_ratings(np.divide(weighted_sums, weight_sums, out=np.zeros_like(weight_sums),
+                                           where=eligible))
+    return {int(perf.players[i]): _round(ratings[i], 1) for i in np.flatnonzero(eligible)}
+
+
+def clutch_factors(perf: GuildPerformances, close_differential: int = CLOSE_WAR_DIFFERENTIAL) -> Dict[int, float]:
+    """Clutch Factor per player: (close-war mean - overall mean) / overall stddev, as a z-score.
+
+    Needs 2+ valid performances, 1+ close war and non-zero spread; other players are left out.
+    """
+    valid = perf.participation > 0
+    counts, means, stddevs = perf.mean_and_stddev(perf.normalized, valid)
+
+    close = valid & (np.abs(perf.team_differential) <= close_differential)
+    close_counts = perf.count(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        close_means = perf.sum(perf.normalized, close) / close_counts
+        factors = (close_means - means) / stddevs
+
+    eligible = (counts >= 2) & (close_counts >= 1) & perf.spread(perf.normalized, valid)
+    return {int(perf.players[i]): _round(factors[i], 2) for i in np.flatnonzero(eligible)}
+
+
+def last_x_stats(perf: GuildPerformances, x_wars: Optional[int] = None) -> Dict[int, Dict]:
+    """get_player_stats_last_x_wars' numbers for every player's last x_wars performances (all if None).
+
+    total_races, highest_score and lowest_score need races_played; they are None without it.
+    """
+    window = perf.rank < x_wars if x_wars is not None else np.ones(len(perf), dtype=bool)
+    num_wars, _, stddevs = perf.mean_and_stddev(perf.normalized, window)
+    total_scores = perf.sum(perf.score, window)
+    war_counts = perf.sum(perf.participation, window)
+
+    differential = perf.team_differential
+    scaled_differentials = perf.sum(np.trunc(np.nan_to_num(differential) * perf.participation), window)
+    wins = perf.count(window & (differential > 0))
+    losses = perf.count(window & (differential < 0))
+    ties = perf.count(window & (differential == 0))
+
+    total_races = highest = lowest = None
+    if perf.races_played is not None:
+        total_races = perf.sum(perf.races_played.astype(np.float64), window)
+        full = window & (perf.races_played == FULL_WAR_RACES)
+        # Matches the per-player loop: highest starts at 0, lowest defaults to 0
+        highest = np.zeros(len(perf.players))
+        lowest = np.full(len(perf.players), np.inf)
+        np.maximum.at(highest, perf.group[full], perf.score[full])
+        np.minimum.at(lowest, perf.group[full], perf.score[full])
+        lowest[np.isinf(lowest)] = 0
+
+    stats = {}
+    for i in np.flatnonzero(num_wars):
+        war_count = float(war_counts[i])
+        average_score = round(float(total_scores[i]) / war_count, 2) if war_count > 0 else 0.0
+        score_stddev = float(stddevs[i])
+        cv_percent = score_stddev / average_score * 100 if average_score > 0 and num_wars[i] >= 2 else None
+        decided = int(wins[i] + losses[i] + ties[i])
+        stats[int(perf.players[i])] = {
+            'total_score': int(total_scores[i]),
+            'total_races': int(total_races[i]) if total_races is not None else None,
+            'war_count': war_count,
+            'num_wars': int(num_wars[i]),
+            'average_score': average_score,
+            'total_team_differential': int(scaled_differentials[i]),
+            'highest_score': int(highest[i]) if highest is not None else None,
+            'lowest_score': int(lowest[i]) if lowest is not None else None,
+            'score_stddev': score_stddev,
+            'cv_percent': cv_percent,
+            'consistency_score': max(0, 100 - cv_percent) if cv_percent is not None else None,
+            'wins': int(wins[i]),
+            'losses': int(losses[i]),
+            'ties': int(ties[i]),
+            'win_percentage': int(wins[i]) / decided * 100 if decided > 0 else 0.0,
+        }
+    return stats
+
+
+def overall_score_stddev(perf: GuildPerformances) -> Dict[int, float]:
+    """Population stddev of raw scores over all performances (what players.score_stddev stores)."""
+    _, _, stddevs = perf.mean_and_stddev(perf.score, np.ones(len(perf), dtype=bool))
+    return {int(player_id): float(stddev) for player_id, stddev in zip(perf.players, stddevs)}
+
+
+def potentials(perf: GuildPerformances, score_stddev: Optional[Mapping[int, float]] = None,
+               last10: Optional[Dict[int, Dict]] = None) -> Dict[int, float]:
+    """Potential per player: avg10 + overall score stddev.
+
+    Needs 10+ performances and a positive avg10; other players are left out.
+
+    Args:
+        perf: The guild's performances
+        score_stddev: Overall stddev per player_id (players.score_stddev); computed from perf if None
+        last10: last_x_stats(perf, 10), if already computed
+    """
+    if last10 is None:
+        last10 = last_x_stats(perf, POTENTIAL_WARS)
+    if score_stddev is None:
+        score_stddev = overall_score_stddev(perf)
+
+    result = {}
+    for player_id, stats in last10.items():
+        if stats['num_wars'] >= POTENTIAL_WARS and stats['average_score'] > 0:
+            result[player_id] = round(stats['average_score'] + (score_stddev.get(player_id) or 0.0), 1)
+    return result
+
+
+def qualifies(metric: str, war_count: Optional[float]) -> bool:
+    """Whether a player with this players.war_count is shown the metric (METRIC_MIN_WAR_COUNTS)."""
+    return float(war_count or 0) >= METRIC_MIN_WAR_COUNTS.get(metric, 0)
+
+
+def compute_guild_metrics(perf: GuildPerformances, score_stddev: Optional[Mapping[int, float]] = None,
+                          decay: float = FORM_SCORE_DECAY_FACTOR,
+                          min_wars: int = FORM_SCORE_MIN_WARS,
+                          war_counts: Optional[Mapping[int, float]] = None) -> Dict[int, Dict]:
+    """Every metric for every player in perf.
+
+    With war_counts (players.war_count by player_id), metrics the player hasn't
+    played enough wars for are None, as in the bot's cached values.
+
+    Returns:
+        {player_id: {'avg10_score', 'form_score', 'clutch_factor', 'potential',
+                     'score_stddev', 'consistency_score'}}; a metric is None when the
+        player doesn't qualify. score_stddev and consistency_score cover all wars.
+    """
+    last10 = last_x_stats(perf, POTENTIAL_WARS)
+    overall = last_x_stats(perf)
+    forms = form_scores(perf, decay, min_wars)
+    clutch = clutch_factors(perf)
+    potential = potentials(perf, score_stddev, last10)
+
+    metrics = {
+        player_id: {
+            'avg10_score': last10[player_id]['average_score'],
+            'form_score': forms.get(player_id),
+            'clutch_factor': clutch.get(player_id),
+            'potential': potential.get(player_id),
+            'score_stddev': overall[player_id]['score_stddev'],
+            'consistency_score': overall[player_id]['consistency_score'],
+        }
+        for player_id in overall
+    }
+    if war_counts is not None:
+        for player_id, player_metrics in metrics.items():
+            for metric in METRIC_MIN_WAR_COUNTS:
+                if not qualifies(metric, war_counts.get(player_id)):
+                    player_metrics[metric] = None
+    return metrics
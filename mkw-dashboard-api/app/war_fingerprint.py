@@ -0,0 +1,42 @@
+"""
+Canonical content fingerprints for wars.
+Adapted from mkw_stats_bot/mkw_stats/war_fingerprint.py; testing/test_dashboard_database.py
+keeps the code identical.
+
+Wars the dashboard saves get the same wars.fingerprint the bot computes, so
+the bot's duplicate check and the bulk review confirm see each other's wars,
+and a screenshot approved twice in one review is caught before any insert.
+
+Usage:
+    resolved = {'Nick': 'PlayerName', ...}     # raw name -> players.player_name
+    fingerprint = war_fingerprint(results, race_count, resolved)
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+def canonical_war_results(results: List[Dict], race_count: int,
+                          resolved_names: Optional[Mapping[str, str]] = None) -> Tuple[int, List[Tuple[str, int]]]:
+    """(race_count, sorted [(casefolded resolved name, score), ...]) for a war's results.
+
+    Names missing from resolved_names (players not on the roster) keep their own
+    name. Repeated players stay repeated, so a mis-scanned war doesn't collide
+    with the real one.
+    """
+    resolved_names = resolved_names or {}
+    entries = []
+    for result in results:
+        name = (result.get('name') or '').strip()
+        entries.append((resolved_names.get(name, name).casefold(), int(result.get('score', 0) or 0)))
+    return int(race_count), sorted(entries)
+
+
+def war_fingerprint(results: List[Dict], race_count: int,
+                    resolved_names: Optional[Mapping[str, str]] = None) -> str:
+    """SHA-256 hex digest of canonical_war_results (64 characters, wars.fingerprint)."""
+    canonical = canonical_war_results(results, race_count, resolved_names)
+    # JSON keeps names containing separators unambiguous
+    payload = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -33,11 +33,15 @@ async def lifespan(app: FastAPI):
     db = DatabaseManager()
     app.state.db = db
     logger.info("Database connection pool initialized")
+    # Keep guild configs coherent with the bot's writes via LISTEN/NOTIFY
+    db.guild_configs.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down MKW Dashboard API...")
+    if db:
+        db.guild_configs.stop()
     if db and db.connection_pool:
         db.connection_pool.closeall()
         logger.info("Database connections closed")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Asyncio front end for DatabaseManager.
+
+Slash command handlers run on the discord.py event loop, so calling the
+synchronous psycopg2 methods there blocks gateway heartbeats and every other
+guild's interactions for as long as each query takes. AsyncDatabaseManager
+exposes the same API as coroutines:
+
+    stats = await self.bot.async_db.get_player_stats(name, guild_id)
+
+Each call runs on a dedicated thread pool sized to the connection pool, so a
+slow query only delays the command that issued it, and a burst of commands
+queues for connections (see db_pool.py) instead of piling up threads.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from .database import DatabaseManager
+
+
+class AsyncDatabaseManager:
+    """Awaitable wrapper exposing DatabaseManager's public methods."""
+
+    def __init__(self, db: DatabaseManager, max_workers: int = None):
+        self.db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or db.connection_pool.maxconn,
+            thread_name_prefix="db",
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run any blocking database callable on the database threads."""
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context (e.g. the command's query scope) onto the thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.db, name)
+        # Constants and cursor-level private helpers pass straight through
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def close(self):
+        """Stop the database threads (queued calls still finish)."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+In-memory ranked autocomplete for player and team names.
+
+Discord drops autocomplete responses that take more than a few seconds, and
+every keystroke is a request. AutocompleteIndex is built once per guild roster
+(GuildCache rebuilds it whenever the roster changes) and answers a query with:
+- a prefix trie over every name and nickname, for what the user is typing
+- a trigram index, for substrings and typo-tolerant matches
+
+Ranking, best first: exact name, exact nickname, name prefix, nickname prefix,
+word prefix ("aha" -> "CAP ahaha"), substring, then fuzzy trigram matches by
+similarity. Ties sort alphabetically. Matching ignores case and accents
+("jose" finds "José"). See testing/benchmark_autocomplete.py.
+"""
+
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Match kinds, lower is better (a name beats one of its nicknames at each level)
+EXACT_NAME, EXACT_NICKNAME, NAME_PREFIX, NICKNAME_PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(7)
+
+# Share of the query's trigrams a term must contain to count as a fuzzy match
+MIN_TRIGRAM_SIMILARITY = 0.5
+# Fuzzy matches rank in FUZZY .. FUZZY + FUZZY_BUCKETS by similarity
+FUZZY_BUCKETS = 10
+
+
+def fold(text: str) -> str:
+    """Casefold and drop accents, so 'JOSÉ' and 'jose' are the same term."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _start_grams(text: str) -> set:
+    """Padded grams for the start of a term, so typos keep their first letters' weight."""
+    return {'  ' + text[:1], ' ' + text[:2]} if len(text) >= 2 else set()
+
+
+class AutocompleteIndex:
+    """Prefix trie plus trigram index over (value, aliases) entries."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Sequence[str]]]):
+        """
+        Args:
+            entries: (value, aliases) pairs; value is what autocomplete returns
+                and is matched as a name, aliases (e.g. nicknames) rank just below it
+        """
+        self._values: List[str] = []
+        self._sort_keys: List[str] = []
+        self._terms: List[List[Tuple[str, bool]]] = []  # entry -> [(folded term, is_name)]
+        # Trie node: (children, {entry: best kind for a term with this prefix},
+        #             {entry: best kind for a term ending here})
+        self._trie: Tuple[Dict, Dict[int, int], Dict[int, int]] = ({}, {}, {})
+        self._word_prefixes: Dict[str, set] = defaultdict(set)
+        # Every 1-2 character substring, since those queries are too short for trigrams
+        self._short_substrings: Dict[str, set] = defaultdict(set)
+        self._trigrams: Dict[str, set] = defaultdict(set)
+
+        for value, aliases in entries:
+            entry = len(self._values)
+            self._values.append(value)
+            self._sort_keys.append(fold(value))
+
+            terms = []
+            for term, is_name in [(value, True)] + [(alias, False) for alias in aliases if alias]:
+                term = fold(term)
+                if any(existing == term for existing, _ in terms):
+                    continue
+                terms.append((term, is_name))
+                self._add_prefixes(entry, term, NAME_PREFIX if is_name else NICKNAME_PREFIX)
+                for word in term.split()[1:]:
+                    for end in range(1, len(word) + 1):
+                        self._word_prefixes[word[:end]].add(entry)
+                for start in range(len(term)):
+                    self._short_substrings[term[start]].add(entry)
+                    self._short_substrings[term[start:start + 2]].add(entry)
+                for gram in _trigrams(term) | _start_grams(term):
+                    self._trigrams[gram].add(entry)
+            self._terms.append(terms)
+
+        # Results sort by kind * len + alphabetical position: one int key per candidate
+        self._alphabetical = sorted(range(len(self._values)), key=lambda e: self._sort_keys[e])
+        self._alpha_rank = [0] * len(self._values)
+        for position, entry in enumerate(self._alphabetical):
+            self._alpha_rank[entry] = position
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _add_prefixes(self, entry: int, term: str, kind: int):
+        node = self._trie
+        for char in term:
+            node = node[0].setdefault(char, ({}, {}, {}))
+            if node[1].get(entry, FUZZY) > kind:
+                node[1][entry] = kind
+        exact = EXACT_NAME if kind == NAME_PREFIX else EXACT_NICKNAME
+        if node[2].get(entry, FUZZY) > exact:
+            node[2][entry] = exact
+
+    def _find_node(self, query: str) -> Optional[Tuple]:
+        node = self._trie
+        for char in query:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        return node
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        """Return up to limit values ranked by how well they match query."""
+        query = fold(query.strip())
+        if not query:
+            return [self._values[e] for e in self._alphabetical[:limit]]
+
+        ranks: Dict[int, int] = {}
+
+        node = self._find_node(query)
+        if node is not None:
+            ranks.update(node[1])
+            ranks.update(node[2])
+
+        for entry in self._word_prefixes.get(query, ()):
+            ranks.setdefault(entry, WORD_PREFIX)
+
+        # Later passes only matter when the better kinds didn't fill the page
+        if len(ranks) < limit:
+            for entry in self._substring_matches(query):
+                ranks.setdefault(entry, SUBSTRING)
+        if len(ranks) < limit and len(query) >= 3:
+            self._rank_fuzzy(query, ranks)
+
+        count = len(self._values)
+        alpha_rank = self._alpha_rank
+        best = heapq.nsmallest(limit, [kind * count + alpha_rank[entry] for entry, kind in ranks.items()])
+        return [self._values[self._alphabetical[key % count]] for key in best]
+
+    def _substring_matches(self, query: str) -> Iterable[int]:
+        if len(query) <= 2:
+            return self._short_substrings.get(query, ())
+        postings = [self._trigrams.get(gram) for gram in _trigrams(query)]
+        if not all(postings):
+            return ()
+        # Entries with every trigram of the query, confirmed against the actual terms
+        return [
+            entry for entry in set.intersection(*postings)
+            if any(query in term for term, _ in self._terms[entry])
+        ]
+
+    def _rank_fuzzy(self, query: str, ranks: Dict[int, int]):
+        grams = _trigrams(query) | _start_grams(query)
+        hits = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+        needed = MIN_TRIGRAM_SIMILARITY * len(grams)
+        for entry, count in hits.items():
+            if count >= needed and entry not in ranks:
+                # Within the FUZZY band, more shared trigrams ranks higher
+                ranks[entry] = FUZZY + round((1 - count / len(grams)) * FUZZY_BUCKETS)
+
+
+def build_player_index(players: Iterable[Dict]) -> AutocompleteIndex:
+    """Index roster rows (get_all_players_stats format) by player name and nicknames."""
+    return AutocompleteIndex((p['player_name'], p.get('nicknames') or []) for p in players)
+
+
+def build_team_index(team_names: Iterable[str], extra: Optional[Iterable[str]] = None) -> AutocompleteIndex:
+    """Index team names (plus extras such as 'Unassigned')."""
+    names = list(dict.fromkeys(list(team_names) + list(extra or [])))
+    return AutocompleteIndex((name, ()) for name in names)
@@ -1,8 +1,10 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import asyncio
 import json
 import os
+import socket
 import tempfile
 import aiohttp
 from typing import Optional, Dict, List, Union
@@ -13,6 +15,11 @@ from .ocr_processor import OCRProcessor
 from .logging_config import get_logger, log_discord_command, setup_logging
 from .ocr_modals import EditPlayerModal, AddPlayerModal, ReportIssueModal
 from .dashboard_client import dashboard_client
+from .ocr_worker_client import ocr_worker_client
+from .metrics_warmer import MetricsWarmer
+from .async_database import AsyncDatabaseManager
+from .migration_runner import MigrationRunner
+from .query_stats import begin_query_scope
 
 # Load environment variables from .env file if it exists
 load_dotenv()
@@ -328,6 +335,18 @@ class ReportIssueView(discord.ui.View):
                 logger.error(f"Unexpected error deleting report issue message on timeout: {e}", exc_info=True)
 
 
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree that counts the database statements each slash command issues."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type == discord.InteractionType.application_command:
+            # Runs in the command's own task, so the scope covers the whole command
+            # (and AsyncDatabaseManager carries it onto the database threads)
+            name = interaction.command.qualified_name if interaction.command else interaction.data.get('name')
+            interaction.extras['query_scope'] = begin_query_scope(f"/{name}")
+        return True
+
+
 class MarioKartBot(commands.Bot):
  
     """
@@ -346,16 +365,42 @@ class MarioKartBot(commands.Bot):
         intents.members = True
 
         # Initialize the bot with no command prefix (slash commands only)
-        super().__init__(command_prefix=None, intents=intents)
+        super().__init__(command_prefix=None, intents=intents, tree_cls=InstrumentedCommandTree)
         
         # Initialize the new v2 database system
         self.db = DatabaseManager()
-        # Initialize OCR processor at startup for instant response across all guilds
-        self.ocr = OCRProcessor(db_manager=self.db)
+        # Queries assume the latest schema; an older one fails on missing columns at first use
+        pending = MigrationRunner(self.db).pending_versions()
+        if pending:
+            raise RuntimeError(
+                f"Database schema is behind: migrations {', '.join(f'v{version}' for version in pending)} "
+                f"are pending. Run python scripts/utilities/migrate.py first"
+            )
+        # Serve guild configs and rosters from memory (invalidated via LISTEN/NOTIFY)
+        self.db.guild_cache.start()
+        # Same API as awaitables, for command handlers (keeps queries off the event loop)
+        self.async_db = AsyncDatabaseManager(self.db)
+        # Initialize OCR processor at startup for instant response across all guilds,
+        # unless OCR runs in standalone workers (then it's only loaded as a fallback)
+        self._ocr = None if ocr_worker_client.is_enabled() else OCRProcessor(db_manager=self.db)
         # Initialize the pending confirmations dictionary
         self.pending_confirmations = {}  # message_id -> confirmation_data
         # Track timeout tasks so we can cancel them if needed
         self.timeout_tasks = {}  # message_id -> asyncio.Task
+        # Persistent OCR job queue worker (bulk scans resume after restarts)
+        self.ocr_worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.ocr_job_task = None
+        self._ocr_status_messages = {}  # batch_id -> discord.Message
+        # Recomputes volatile metrics invalidated by war saves off the interaction path
+        self.metrics_warmer = MetricsWarmer(self.db, config.METRICS_WARMER_DEBOUNCE_SECONDS)
+    
+    @property
+    def ocr(self) -> OCRProcessor:
+        """In-process OCR processor, created on first use when OCR workers are configured."""
+        if self._ocr is None:
+            logger.info("📝 Loading in-process OCR processor")
+            self._ocr = OCRProcessor(db_manager=self.db)
+        return self._ocr
     
     """
     This is the on_ready event.
@@ -384,7 +429,9 @@ class MarioKartBot(commands.Bot):
         
         # Initialize OCR resource management if available
         try:
-            if hasattr(self.ocr, 'resource_management_enabled') and self.ocr.resource_management_enabled:
+            if ocr_worker_client.is_enabled():
+                logger.info(f"📝 OCR delegated to {len(ocr_worker_client.worker_urls)} worker service(s)")
+            elif hasattr(self.ocr, 'resource_management_enabled') and self.ocr.resource_management_enabled:
                 from .ocr_resource_manager import initialize_ocr_resource_manager
                 from .ocr_performance_monitor import get_ocr_performance_monitor
                 
@@ -401,6 +448,12 @@ class MarioKartBot(commands.Bot):
         except Exception as e:
             logger.warning(f"Failed to initialize OCR resource management: {e}")
         
+        # Resume any bulk scans that were queued before a restart
+        self.ensure_ocr_job_worker()
+        
+        # Keep leaderboard metrics warm after war saves/removals
+        self.metrics_warmer.start()
+        
         # Set bot status
         await self.change_presence(
             # Set the bot's status to watching for Mario Kart results
@@ -410,6 +463,18 @@ class MarioKartBot(commands.Bot):
             )
         )
     
+    async def on_app_command_completion(self, interaction: discord.Interaction, command) -> None:
+        """Log how many database statements the command issued (N+1 regressions stand out)."""
+        scope = interaction.extras.get('query_scope')
+        if scope is None:
+            return
+        summary = self.db.query_recorder.finish_scope(scope)
+        message = f"📊 {summary['name']}: {summary['queries']} queries in {summary['total_ms']:.1f}ms {summary['by_site']}"
+        if summary['queries'] > config.QUERY_COUNT_WARN_THRESHOLD:
+            logger.warning(f"{message} (over {config.QUERY_COUNT_WARN_THRESHOLD}, possible N+1)")
+        else:
+            logger.debug(message)
+    
     async def on_command_error(self, ctx, error):
         """Handle command errors - should not occur with prefix commands disabled."""
         if isinstance(error, commands.CommandNotFound):
@@ -449,11 +514,12 @@ class MarioKartBot(commands.Bot):
     async def process_ocr_image(self, temp_path: str, guild_id: int, filename: str, original_message):
         """Shared OCR processing logic for both automatic and manual scanning."""
         try:
-            # Use bot's OCR processor (initialized at startup)
-            ocr = self.ocr
-            
-            # Perform OCR (raw results)
-            ocr_result = ocr.perform_ocr_on_file(temp_path)
+            # Perform OCR (raw results) on a worker service, falling back to the bot's OCR processor
+            ocr_result = None
+            if ocr_worker_client.is_enabled():
+                ocr_result = await ocr_worker_client.perform_ocr(temp_path, guild_id)
+            if ocr_result is None:
+                ocr_result = self.ocr.perform_ocr_on_file(temp_path)
             
             if not ocr_result["success"]:
                 embed = discord.Embed(
@@ -474,7 +540,10 @@ class MarioKartBot(commands.Bot):
                 
             # Process OCR results for database validation
             extracted_texts = [{'text': ocr_result["text"], 'confidence': 0.9}]
-            processed_results = ocr._parse_mario_kart_results(extracted_texts, guild_id)
+            if 'parsed_results' in ocr_result:
+                processed_results = ocr_result['parsed_results']
+            else:
+                processed_results = self.ocr._parse_mario_kart_results(extracted_texts, guild_id)
             
             # Add confirmation workflow if we have processed results
             if processed_results:
@@ -784,28 +853,10 @@ class MarioKartBot(commands.Bot):
             # Calculate total race count for the war
             total_race_count = max(result['races'] for result in parsed_results)
 
-            # Add war to database
-            war_id = commands_cog.bot.db.add_race_results(parsed_results, total_race_count, guild_id=guild_id)
-
-            if war_id is not None:
-                # Calculate team differential for player stats
-                team_score = sum(r['score'] for r in parsed_results)
-                total_points = 82 * total_race_count
-                opponent_score = total_points - team_score
-                team_differential = team_score - opponent_score
-
-                # Update player statistics
-                for result in parsed_results:
-                    commands_cog.bot.db.update_player_stats(
-                        result['name'],
-                        result['score'],
-                        result['races'],
-                        result['races'] / total_race_count,
-                        datetime.now(pytz.timezone('America/New_York')).isoformat(),
-                        guild_id,
-                        team_differential
-                    )
+            # Add war to database and update player statistics in one transaction
+            saved_war = commands_cog.bot.db.save_war(parsed_results, total_race_count, guild_id=guild_id)
 
+            if saved_war is not None:
                 # Add checkmark to original image message
                 try:
                     await view.original_message_obj.add_reaction("✅")
@@ -905,28 +956,10 @@ class MarioKartBot(commands.Bot):
                 # Calculate total race count for the war (use max race count from all players)
                 total_race_count = max(result['races'] for result in parsed_results)
 
-                # Add war to database
-                war_id = commands_cog.bot.db.add_race_results(parsed_results, total_race_count, guild_id=guild_id)
-
-                if war_id is not None:
-                    # Calculate team differential for player stats
-                    team_score = sum(r['score'] for r in parsed_results)
-                    total_points = 82 * total_race_count
-                    opponent_score = total_points - team_score
-                    team_differential = team_score - opponent_score
-
-                    # Update player statistics
-                    for result in parsed_results:
-                        commands_cog.bot.db.update_player_stats(
-                            result['name'],
-                            result['score'],
-                            result['races'],  # Use individual race count
-                            result['races'] / total_race_count,  # war_participation (races played / total races)
-                            datetime.now(pytz.timezone('America/New_York')).isoformat(),
-                            guild_id,
-                            team_differential
-                        )
-                    
+                # Add war to database and update player statistics in one transaction
+                saved_war = commands_cog.bot.db.save_war(parsed_results, total_race_count, guild_id=guild_id)
+
+                if saved_war is not None:
                     # Add checkmark to original image message
                     if 'original_message_obj' in confirmation_data:
                         try:
@@ -1012,7 +1045,7 @@ class MarioKartBot(commands.Bot):
             asyncio.create_task(self._countdown_and_delete_message(message, embed))
     
     async def handle_bulk_scan_processing(self, message: discord.Message, confirmation_data: Dict):
-        """Handle bulk scan processing after user confirms."""
+        """Handle bulk scan processing after user confirms by queueing one OCR job per image."""
         try:
             images_found = confirmation_data['images_found']
             guild_id = confirmation_data['guild_id']
@@ -1039,157 +1072,30 @@ class MarioKartBot(commands.Bot):
             
             await message.edit(embed=embed)
             
-            # Process each image
-            successful_wars = []
-            failed_images = []
+            # Persist the scan so a restart mid-scan resumes instead of losing everything
+            jobs = [{
+                'image_url': image_data['attachment'].url,
+                'image_filename': image_data['attachment'].filename,
+                'discord_message_id': image_data['message'].id,
+                'author_id': image_data['message'].author.id,
+                'message_timestamp': image_data['message'].created_at
+            } for image_data in images_found]
             
-            for i, image_data in enumerate(images_found, 1):
-                try:
-                    # Update progress
-                    progress_embed = discord.Embed(
-                        title="🔄 Processing Bulk Image Scan",
-                        description=f"Processing image {i}/{total_images}: {image_data['attachment'].filename}",
-                        color=0x00ff00
-                    )
-                    progress_embed.add_field(
-                        name="⏳ Progress",
-                        value=f"{'▓' * (i * 20 // total_images)}{'░' * (20 - (i * 20 // total_images))} {i}/{total_images}",
-                        inline=False
-                    )
-                    progress_embed.set_footer(text=f"Estimated time remaining: ~{(total_images - i) * 5} seconds")
-                    
-                    await message.edit(embed=progress_embed)
-                    
-                    # Download and process the image
-                    import tempfile
-                    import aiohttp
-                    import os
-                    
-                    temp_file_path = None
-                    try:
-                        # Download image
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(image_data['attachment'].url) as response:
-                                if response.status == 200:
-                                    with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as temp_file:
-                                        temp_file_path = temp_file.name
-                                        image_bytes = await response.read()
-                                        temp_file.write(image_bytes)
-                                else:
-                                    raise Exception(f"Failed to download: HTTP {response.status}")
-                        
-                        # Process OCR using enhanced async processing if available
-                        if hasattr(self.ocr, 'process_image_async'):
-                            # Use enhanced async processing with resource management
-                            result = await self.ocr.process_image_async(
-                                temp_file_path, 
-                                guild_id, 
-                                image_data['message'].author.id,
-                                image_data['message'].created_at
-                            )
-                            success = result.get('success', False)
-                            processed_results = result.get('results', [])
-                        else:
-                            # Fallback to existing shared logic
-                            success, _, processed_results = await self.process_ocr_image(
-                                temp_file_path, guild_id, image_data['attachment'].filename, image_data['message']
-                            )
-                        
-                        if success and processed_results:
-                            # Store OCR results for later confirmation (don't save to database yet)
-                            from datetime import datetime
-                            import pytz
-                            
-                            # Process war submission data for confirmation
-                            parsed_results = []
-                            for result in processed_results:
-                                player_name = result['name']
-                                score = result['score']
-                                race_count = result.get('races', 12)
-                                
-                                parsed_results.append({
-                                    'name': player_name,
-                                    'original_name': result.get('raw_name', player_name),
-                                    'score': score,
-                                    'races': race_count,
-                                    'date': datetime.now(pytz.UTC).strftime('%Y-%m-%d'),
-                                    'time': datetime.now(pytz.UTC).strftime('%H:%M:%S'),
-                                    'war_type': '6v6',
-                                    'notes': f'Auto-processed via bulk OCR from {image_data["attachment"].filename}'
-                                })
-                            
-                            if parsed_results:
-                                # Calculate total race count
-                                total_race_count = max(result['races'] for result in parsed_results)
-                                
-                                # Store for confirmation (not saved to database yet)
-                                successful_wars.append({
-                                    'filename': image_data['attachment'].filename,
-                                    'players': parsed_results,
-                                    'total_race_count': total_race_count,
-                                    'message': image_data['message']  # Store message for adding checkmark later
-                                })
-                            else:
-                                failed_images.append({
-                                    'filename': image_data['attachment'].filename,
-                                    'error': 'No valid players found',
-                                    'message': image_data['message']
-                                })
-                        else:
-                            failed_images.append({
-                                'filename': image_data['attachment'].filename,
-                                'error': 'OCR processing failed',
-                                'message': image_data['message']
-                            })
-                            
-                    finally:
-                        # Clean up temp file
-                        if temp_file_path and os.path.exists(temp_file_path):
-                            try:
-                                os.unlink(temp_file_path)
-                            except:
-                                pass
-                    
-                    # Add small delay to respect rate limits
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    failed_images.append({
-                        'filename': image_data['attachment'].filename,
-                        'error': str(e),
-                        'message': image_data['message']
-                    })
-                    logger.error(f"Error processing {image_data['attachment'].filename}: {e}")
+            batch_id = await self.async_db.create_ocr_batch(
+                guild_id,
+                confirmation_data.get('user_id', 0),
+                message.channel.id,
+                message.id,
+                jobs
+            )
             
-            # Show confirmation embed with all OCR results (before saving to database)
-            if successful_wars or failed_images:
-                # Get original user ID from the bulk scan confirmation data
-                original_confirmation = self.pending_confirmations.get(str(message.id), {})
-                original_user_id = original_confirmation.get('user_id', 0)
-
-                # Check if dashboard integration is enabled for bulk scans
-                if dashboard_client.is_enabled() and len(successful_wars) >= 1:
-                    # Use web dashboard for review
-                    await self._create_dashboard_review_session(
-                        message, successful_wars, failed_images,
-                        total_images, guild_id, original_user_id
-                    )
-                else:
-                    # Use Discord-based confirmation for small scans or when dashboard is disabled
-                    await self.create_bulk_scan_confirmation_embed(
-                        message, successful_wars, failed_images,
-                        total_images, guild_id, original_user_id
-                    )
-            else:
-                # No results at all
-                embed = discord.Embed(
-                    title="❌ No Results Found",
-                    description="No images could be processed successfully.",
-                    color=0xff0000
-                )
-                await message.edit(embed=embed)
-                self.cleanup_confirmation(str(message.id))
-                asyncio.create_task(self._countdown_and_delete_message(message, embed, 30))
+            if batch_id is None:
+                raise Exception("Could not queue the images for processing, please try again")
+            
+            # The OCR job worker picks it up from here
+            self.cleanup_confirmation(str(message.id))
+            self._ocr_status_messages[batch_id] = message
+            self.ensure_ocr_job_worker()
             
         except Exception as e:
             logger.error(f"Error in bulk scan processing: {e}")
@@ -1201,6 +1107,279 @@ class MarioKartBot(commands.Bot):
             await message.edit(embed=embed)
             self.cleanup_confirmation(str(message.id))
 
+    def _build_bulk_progress_embed(self, current: int, total_images: int, filename: str) -> discord.Embed:
+        """Build the progress embed shown while a bulk scan is running."""
+        progress_embed = discord.Embed(
+            title="🔄 Processing Bulk Image Scan",
+            description=f"Processing image {current}/{total_images}: {filename}",
+            color=0x00ff00
+        )
+        progress_embed.add_field(
+            name="⏳ Progress",
+            value=f"{'▓' * (current * 20 // total_images)}{'░' * (20 - (current * 20 // total_images))} {current}/{total_images}",
+            inline=False
+        )
+        progress_embed.set_footer(text=f"Estimated time remaining: ~{(total_images - current) * 5} seconds")
+        return progress_embed
+
+    async def _run_bulk_ocr_image(self, image_url: str, filename: str, guild_id: int,
+                                  author_id: int, message_timestamp) -> Dict:
+        """
+        Download one bulk scan image and run OCR on it.
+
+        Returns:
+            Dict with filename, players and total_race_count
+
+        Raises:
+            Exception with a user-facing message when the image yields no war
+        """
+        from datetime import datetime
+        import pytz
+        
+        temp_file_path = None
+        try:
+            # Download image
+            async with aiohttp.ClientSession() as session:
+                async with session.get(image_url) as response:
+                    if response.status == 200:
+                        with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as temp_file:
+                            temp_file_path = temp_file.name
+                            image_bytes = await response.read()
+                            temp_file.write(image_bytes)
+                    else:
+                        raise Exception(f"Failed to download: HTTP {response.status}")
+            
+            # Process OCR on a worker service if configured, otherwise in-process with resource management
+            result = None
+            if ocr_worker_client.is_enabled():
+                result = await ocr_worker_client.process_image(temp_file_path, guild_id, author_id, message_timestamp)
+            if result is None:
+                result = await self.ocr.process_image_async(temp_file_path, guild_id, author_id, message_timestamp)
+            processed_results = result.get('results', [])
+            
+            if not result.get('success', False) or not processed_results:
+                raise Exception('OCR processing failed')
+            
+            # Process war submission data for confirmation (not saved to database yet)
+            parsed_results = []
+            for player in processed_results:
+                player_name = player['name']
+                parsed_results.append({
+                    'name': player_name,
+                    'original_name': player.get('raw_name', player_name),
+                    'score': player['score'],
+                    'races': player.get('races', 12),
+                    'date': datetime.now(pytz.UTC).strftime('%Y-%m-%d'),
+                    'time': datetime.now(pytz.UTC).strftime('%H:%M:%S'),
+                    'war_type': '6v6',
+                    'notes': f'Auto-processed via bulk OCR from {filename}'
+                })
+            
+            if not parsed_results:
+                raise Exception('No valid players found')
+            
+            return {
+                'filename': filename,
+                'players': parsed_results,
+                'total_race_count': max(p['races'] for p in parsed_results)
+            }
+        finally:
+            # Clean up temp file
+            if temp_file_path and os.path.exists(temp_file_path):
+                try:
+                    os.unlink(temp_file_path)
+                except:
+                    pass
+
+    async def _present_bulk_scan_results(self, message: discord.Message, successful_wars: List[Dict],
+                                         failed_images: List[Dict], total_images: int,
+                                         guild_id: int, user_id: int):
+        """Hand finished bulk scan results to the dashboard or the Discord confirmation flow."""
+        if successful_wars or failed_images:
+            # Check if dashboard integration is enabled for bulk scans
+            if dashboard_client.is_enabled() and len(successful_wars) >= 1:
+                # Use web dashboard for review
+                await self._create_dashboard_review_session(
+                    message, successful_wars, failed_images,
+                    total_images, guild_id, user_id
+                )
+            else:
+                # Use Discord-based confirmation for small scans or when dashboard is disabled
+                await self.create_bulk_scan_confirmation_embed(
+                    message, successful_wars, failed_images,
+                    total_images, guild_id, user_id
+                )
+        else:
+            # No results at all
+            embed = discord.Embed(
+                title="❌ No Results Found",
+                description="No images could be processed successfully.",
+                color=0xff0000
+            )
+            await message.edit(embed=embed)
+            self.cleanup_confirmation(str(message.id))
+            asyncio.create_task(self._countdown_and_delete_message(message, embed, 30))
+
+    # ==================== OCR JOB WORKER ====================
+
+    def ensure_ocr_job_worker(self):
+        """Start the OCR job worker loop if it is not already running."""
+        if self.ocr_job_task is None or self.ocr_job_task.done():
+            self.ocr_job_task = asyncio.create_task(self.ocr_job_worker())
+
+    async def ocr_job_worker(self):
+        """
+        Drain the persistent OCR job queue.
+
+        Runs for the lifetime of the bot. On boot it first finalizes batches whose
+        last image finished right before a restart, then keeps claiming jobs;
+        jobs abandoned by a dead process are reclaimed once their lock goes stale.
+        """
+        await self.wait_until_ready()
+        logger.info(f"🚀 OCR job worker started ({self.ocr_worker_id})")
+        
+        for batch_id in await self.async_db.get_unfinalized_ocr_batch_ids():
+            await self._finalize_ocr_batch(batch_id)
+        
+        while not self.is_closed():
+            try:
+                job = await self.async_db.claim_next_ocr_job(self.ocr_worker_id, config.OCR_JOB_STALE_SECONDS)
+                if not job:
+                    await asyncio.sleep(config.OCR_JOB_POLL_INTERVAL)
+                    continue
+                
+                await self._update_ocr_batch_progress(job)
+                await self._process_ocr_job(job)
+                await self._finalize_ocr_batch(job['batch_id'])
+                
+                # Add small delay to respect rate limits
+                await asyncio.sleep(1)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ OCR job worker error: {e}")
+                await asyncio.sleep(config.OCR_JOB_POLL_INTERVAL)
+
+    async def _process_ocr_job(self, job: Dict):
+        """Run OCR for a claimed job and store its result or error."""
+        filename = job['image_filename'] or f"image_{job['position'] + 1}"
+        
+        if job['attempts'] > config.OCR_JOB_MAX_ATTEMPTS:
+            # Most likely the image crashed the process on every previous attempt
+            await self.async_db.fail_ocr_job(job['id'], f"Gave up after {config.OCR_JOB_MAX_ATTEMPTS} attempts")
+            return
+        
+        try:
+            war = await self._run_bulk_ocr_image(
+                job['image_url'], filename, job['guild_id'],
+                job['author_id'], job['message_timestamp']
+            )
+            await self.async_db.complete_ocr_job(job['id'], war)
+        except Exception as e:
+            logger.error(f"Error processing {filename}: {e}")
+            await self.async_db.fail_ocr_job(job['id'], str(e))
+
+    async def _get_ocr_status_message(self, batch: Dict) -> Optional[discord.Message]:
+        """Get the progress message of a batch, fetching it again after a restart."""
+        message = self._ocr_status_messages.get(batch['id'])
+        if message is not None:
+            return message
+        
+        try:
+            channel = self.get_channel(batch['channel_id']) or await self.fetch_channel(batch['channel_id'])
+            if batch['status_message_id']:
+                message = await channel.fetch_message(batch['status_message_id'])
+            else:
+                message = await channel.send(embed=discord.Embed(
+                    title="🔄 Processing Bulk Image Scan",
+                    description=f"Resuming {batch['total_images']} images...",
+                    color=0x00ff00
+                ))
+        except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
+            logger.warning(f"⚠️ Status message for OCR batch {batch['id']} unavailable: {e}")
+            return None
+        
+        self._ocr_status_messages[batch['id']] = message
+        return message
+
+    async def _update_ocr_batch_progress(self, job: Dict):
+        """Edit the batch's progress message before a job is processed."""
+        batch = await self.async_db.get_ocr_batch(job['batch_id'])
+        if not batch:
+            return
+        
+        message = await self._get_ocr_status_message(batch)
+        if message is None:
+            return
+        
+        try:
+            await message.edit(embed=self._build_bulk_progress_embed(
+                job['position'] + 1, batch['total_images'],
+                job['image_filename'] or f"image_{job['position'] + 1}"
+            ))
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ Could not update progress for OCR batch {batch['id']}: {e}")
+
+    async def _finalize_ocr_batch(self, batch_id: int):
+        """Present a batch's results once all of its jobs are finished (exactly once across workers)."""
+        if not await self.async_db.finalize_ocr_batch(batch_id):
+            return
+        
+        batch = await self.async_db.get_ocr_batch(batch_id)
+        if batch is None:
+            logger.error(f"❌ OCR batch {batch_id} disappeared before its results could be shown")
+            return
+        jobs = await self.async_db.get_ocr_batch_jobs(batch_id)
+        message = await self._get_ocr_status_message(batch)
+        self._ocr_status_messages.pop(batch_id, None)
+        
+        if message is None:
+            # Progress message was deleted - post the results as a fresh message
+            try:
+                channel = self.get_channel(batch['channel_id']) or await self.fetch_channel(batch['channel_id'])
+                message = await channel.send(embed=discord.Embed(
+                    title="🔄 Bulk Image Scan Finished",
+                    description="Preparing results...",
+                    color=0x00ff00
+                ))
+            except discord.HTTPException as e:
+                logger.error(f"❌ Cannot deliver results for OCR batch {batch_id}: {e}")
+                return
+        
+        successful_wars = []
+        failed_images = []
+        
+        for job in jobs:
+            filename = job['image_filename'] or f"image_{job['position'] + 1}"
+            
+            # Source messages are needed for timestamps, image URLs and the ✅ reaction on save
+            source_message = None
+            if job['discord_message_id']:
+                try:
+                    source_message = await message.channel.fetch_message(job['discord_message_id'])
+                except discord.HTTPException:
+                    source_message = None
+            
+            if job['status'] == 'completed' and job['result'] and source_message is not None:
+                war = dict(job['result'])
+                war['message'] = source_message
+                successful_wars.append(war)
+            else:
+                error = job['error_message'] or 'OCR processing failed'
+                if job['status'] == 'completed' and source_message is None:
+                    error = 'Original message was deleted'
+                failed_images.append({
+                    'filename': filename,
+                    'error': error,
+                    'message': source_message
+                })
+        
+        await self._present_bulk_scan_results(
+            message, successful_wars, failed_images,
+            batch['total_images'], batch['guild_id'], batch['user_id']
+        )
+
     async def _create_dashboard_review_session(
         self,
         message: discord.Message,
@@ -1335,34 +1514,28 @@ class MarioKartBot(commands.Bot):
             # Save each war to database
             saved_wars = []
             save_failures = []
-            
-            from datetime import datetime
-            import pytz
-            
-            for war_info in successful_wars:
+
+            # Screenshots already saved, or posted twice in this scan, are skipped
+            duplicates = await self.async_db.find_duplicate_wars(
+                [(war_info['players'], war_info['total_race_count']) for war_info in successful_wars], guild_id
+            )
+
+            for war_info, duplicate in zip(successful_wars, duplicates):
+                if duplicate:
+                    if 'war_id' in duplicate:
+                        error = f"Duplicate of war #{duplicate['war_id']}"
+                    else:
+                        error = f"Duplicate of {successful_wars[duplicate['batch_index']]['filename']} in this scan"
+                    save_failures.append({'filename': war_info['filename'], 'error': error})
+                    continue
+
                 try:
-                    # Add war to database
-                    war_id = self.db.add_race_results(war_info['players'], war_info['total_race_count'], guild_id=guild_id)
-
-                    if war_id is not None:
-                        # Calculate team differential for player stats
-                        team_score = sum(p['score'] for p in war_info['players'])
-                        total_points = 82 * war_info['total_race_count']
-                        opponent_score = total_points - team_score
-                        team_differential = team_score - opponent_score
-
-                        # Update player statistics
-                        for result in war_info['players']:
-                            self.db.update_player_stats(
-                                result['name'],
-                                result['score'],
-                                result['races'],
-                                result['races'] / war_info['total_race_count'],
-                                datetime.now(pytz.timezone('America/New_York')).isoformat(),
-                                guild_id,
-                                team_differential
-                            )
-                        
+                    # Add war to database and update player statistics in one transaction
+                    saved_war = await self.async_db.save_war(war_info['players'], war_info['total_race_count'], guild_id=guild_id)
+
+                    if saved_war is not None:
+                        war_id = saved_war['war_id']
+
                         # Store successful save info
                         saved_wars.append({
                             'filename': war_info['filename'],
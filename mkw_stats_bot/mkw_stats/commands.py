@@ -14,6 +14,7 @@ import traceback
 from typing import List, Dict, Any, Optional
 from . import config
 from .database import DatabaseManager
+from .stats_engine import qualifies
 # OCR processor initialized in bot.py at startup for instant response
 
 # Member status choices - centralized definition
@@ -77,25 +78,61 @@ def has_admin_permission(interaction: discord.Interaction) -> bool:
 
 
 class LeaderboardView(discord.ui.View):
-    """Pagination view for player statistics leaderboard."""
+    """Pagination view for player statistics leaderboard.
 
-    def __init__(self, all_players: list, sortby: str, total_players_count: int, bot, guild_id: int):
+    Ranked members are read one pre-ranked page at a time from the guild's
+    leaderboard snapshot (DatabaseManager.get_guild_leaderboard_page); members
+    without wars follow them.
+    """
+
+    def __init__(self, first_page: dict, sortby: str, member_names: list, bot, guild_id: int,
+                 players_per_page: int = 10):
         super().__init__(timeout=300)  # 5 minute timeout
-        self.all_players = all_players
         self.sortby = sortby
-        self.total_players_count = total_players_count
+        self.member_names = member_names
         self.bot = bot
         self.guild_id = guild_id
         self.current_page = 1
-        self.players_per_page = 10
-        self.total_pages = max(1, (len(all_players) + self.players_per_page - 1) // self.players_per_page)
-
-        # Cache team tags to reduce DB calls during pagination
-        self.team_tags = self.bot.db.get_all_team_tags(guild_id)
+        self.players_per_page = players_per_page
+        self.unranked_players = first_page['unranked'] or []
+        self.snapshot_version = first_page['version']
+        self._set_ranked_count(first_page['ranked_count'])
+        self.page_players = first_page['players'] + self._unranked_slice(0, len(first_page['players']))
 
         # Update button states
         self.update_buttons()
 
+    def _set_ranked_count(self, ranked_count: int):
+        self.ranked_count = ranked_count
+        self.total_players_count = ranked_count + len(self.unranked_players)
+        self.total_pages = max(1, (self.total_players_count + self.players_per_page - 1) // self.players_per_page)
+
+    def _unranked_slice(self, start_idx: int, ranked_on_page: int) -> list:
+        """Members without wars that fill the rest of the page starting at start_idx."""
+        unranked_start = max(0, start_idx + ranked_on_page - self.ranked_count)
+        return self.unranked_players[unranked_start:unranked_start + self.players_per_page - ranked_on_page]
+
+    async def _load_page(self, page: int):
+        """Fetch the requested page from the snapshot (re-sized if it was re-ranked meanwhile)."""
+        start_idx = (page - 1) * self.players_per_page
+        ranked_players = []
+        if start_idx < self.ranked_count:
+            result = await self.bot.async_db.get_guild_leaderboard_page(
+                self.guild_id, self.sortby, self.member_names,
+                offset=start_idx, page_size=self.players_per_page
+            )
+            if result is None:
+                return
+            ranked_players = result['players']
+            if result['version'] != self.snapshot_version:
+                self.snapshot_version = result['version']
+                self._set_ranked_count(result['ranked_count'])
+                if page > self.total_pages:
+                    return await self._load_page(self.total_pages)
+
+        self.current_page = min(page, self.total_pages)
+        self.page_players = ranked_players + self._unranked_slice(start_idx, len(ranked_players))
+
     def update_buttons(self):
         """Enable/disable buttons based on current page."""
         self.first_button.disabled = (self.current_page == 1)
@@ -105,10 +142,8 @@ class LeaderboardView(discord.ui.View):
 
     def create_embed(self) -> discord.Embed:
         """Create embed for current page."""
-        # Calculate slice
         start_idx = (self.current_page - 1) * self.players_per_page
-        end_idx = min(start_idx + self.players_per_page, len(self.all_players))
-        page_players = self.all_players[start_idx:end_idx]
+        page_players = self.page_players
 
         # Dynamic title based on sort
         if self.sortby:
@@ -274,80 +309,91 @@ class LeaderboardView(discord.ui.View):
     @discord.ui.button(label="⏮️", style=discord.ButtonStyle.gray)
     async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to first page."""
-        self.current_page = 1
-        # Create new view instance to refresh timeout
-        new_view = LeaderboardView(
-            self.all_players, self.sortby, self.total_players_count, self.bot, self.guild_id
-        )
-        new_view.current_page = self.current_page
-        new_view.update_buttons()
-        await interaction.response.edit_message(embed=new_view.create_embed(), view=new_view)
+        await self._load_page(1)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="◀️", style=discord.ButtonStyle.primary)
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to previous page."""
-        self.current_page = max(1, self.current_page - 1)
-        # Create new view instance to refresh timeout
-        new_view = LeaderboardView(
-            self.all_players, self.sortby, self.total_players_count, self.bot, self.guild_id
-        )
-        new_view.current_page = self.current_page
-        new_view.update_buttons()
-        await interaction.response.edit_message(embed=new_view.create_embed(), view=new_view)
+        await self._load_page(max(1, self.current_page - 1))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.primary)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to next page."""
-        self.current_page = min(self.total_pages, self.current_page + 1)
-        # Create new view instance to refresh timeout
-        new_view = LeaderboardView(
-            self.all_players, self.sortby, self.total_players_count, self.bot, self.guild_id
-        )
-        new_view.current_page = self.current_page
-        new_view.update_buttons()
-        await interaction.response.edit_message(embed=new_view.create_embed(), view=new_view)
+        await self._load_page(min(self.total_pages, self.current_page + 1))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="⏭️", style=discord.ButtonStyle.gray)
     async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to last page."""
-        self.current_page = self.total_pages
-        # Create new view instance to refresh timeout
-        new_view = LeaderboardView(
-            self.all_players, self.sortby, self.total_players_count, self.bot, self.guild_id
-        )
-        new_view.current_page = self.current_page
-        new_view.update_buttons()
-        await interaction.response.edit_message(embed=new_view.create_embed(), view=new_view)
+        await self._load_page(self.total_pages)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
 
 class GlobalLeaderboardView(discord.ui.View):
-    """Paginated view for global cross-guild leaderboard."""
+    """Paginated view for global cross-guild leaderboard.
 
-    def __init__(self, all_players: list, sortby: str, total_players_count: int, bot):
+    Holds only the current page; each button press fetches the next page with a
+    keyset cursor via DatabaseManager.get_global_leaderboard_page.
+    """
+
+    def __init__(self, first_page: dict, sortby: str, bot, players_per_page: int = 10):
         super().__init__(timeout=300)  # 5 minute timeout
-        self.all_players = all_players
+        self.page_players = first_page['players']
         self.sortby = sortby
-        self.total_players_count = total_players_count
+        self.total_players_count = first_page['total_count'] or 0
         self.bot = bot
         self.current_page = 1
-        self.players_per_page = 10
-        self.total_pages = max(1, (len(all_players) + self.players_per_page - 1) // self.players_per_page)
+        self.players_per_page = players_per_page
+        self.total_pages = max(1, (self.total_players_count + self.players_per_page - 1) // self.players_per_page)
 
-        # Cache team tags for all guilds
+        # Cache team tags for all guilds seen so far (call _populate_team_tags before the first embed)
         self.all_team_tags = {}  # {guild_id: {team_name: tag}}
-        self._populate_team_tags()
 
         # Update button states
         self.update_buttons()
 
-    def _populate_team_tags(self):
-        """Populate team tags for all guilds represented in the leaderboard."""
-        # Get unique guild_ids from all_players
-        guild_ids = set(player.get('guild_id') for player in self.all_players if player.get('guild_id'))
+    async def _populate_team_tags(self):
+        """Populate team tags for guilds on the current page that aren't cached yet."""
+        guild_ids = set(player.get('guild_id') for player in self.page_players if player.get('guild_id'))
+
+        for guild_id in guild_ids - self.all_team_tags.keys():
+            self.all_team_tags[guild_id] = await self.bot.async_db.get_all_team_tags(guild_id)
+
+    @staticmethod
+    def _cursor(player: dict) -> tuple:
+        return (player['sort_value'], player['id'])
+
+    async def _load_page(self, page: int):
+        """Fetch the requested page (first/last directly, neighbours by keyset cursor)."""
+        if page == self.current_page:
+            return
+
+        if page == 1 or not self.page_players:
+            page = 1
+            result = await self.bot.async_db.get_global_leaderboard_page(self.sortby, page_size=self.players_per_page)
+        elif page == self.total_pages:
+            result = await self.bot.async_db.get_global_leaderboard_page(
+                self.sortby, last_page=True, page_size=self.players_per_page
+            )
+        elif page == self.current_page + 1:
+            result = await self.bot.async_db.get_global_leaderboard_page(
+                self.sortby, after=self._cursor(self.page_players[-1]), page_size=self.players_per_page
+            )
+        else:
+            result = await self.bot.async_db.get_global_leaderboard_page(
+                self.sortby, before=self._cursor(self.page_players[0]), page_size=self.players_per_page
+            )
 
-        # Fetch team tags for each guild
-        for guild_id in guild_ids:
-            self.all_team_tags[guild_id] = self.bot.db.get_all_team_tags(guild_id)
+        if result is not None:
+            self.page_players = result['players']
+            self.current_page = page
+            await self._populate_team_tags()
 
     def update_buttons(self):
         """Enable/disable buttons based on current page."""
@@ -359,8 +405,7 @@ class GlobalLeaderboardView(discord.ui.View):
     def create_embed(self) -> discord.Embed:
         """Create embed for current page."""
         start_idx = (self.current_page - 1) * self.players_per_page
-        end_idx = min(start_idx + self.players_per_page, len(self.all_players))
-        page_players = self.all_players[start_idx:end_idx]
+        page_players = self.page_players
 
         # Title based on sortby
         title_map = {
@@ -505,28 +550,28 @@ class GlobalLeaderboardView(discord.ui.View):
     @discord.ui.button(label="⏮️", style=discord.ButtonStyle.gray)
     async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to first page."""
-        self.current_page = 1
+        await self._load_page(1)
         self.update_buttons()
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="◀️", style=discord.ButtonStyle.primary)
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to previous page."""
-        self.current_page = max(1, self.current_page - 1)
+        await self._load_page(max(1, self.current_page - 1))
         self.update_buttons()
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="▶️", style=discord.ButtonStyle.primary)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to next page."""
-        self.current_page = min(self.total_pages, self.current_page + 1)
+        await self._load_page(min(self.total_pages, self.current_page + 1))
         self.update_buttons()
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="⏭️", style=discord.ButtonStyle.gray)
     async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to last page."""
-        self.current_page = self.total_pages
+        await self._load_page(self.total_pages)
         self.update_buttons()
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
@@ -561,41 +606,14 @@ class AddPlayerToWarConfirmView(discord.ui.View):
 
         await interaction.response.edit_message(view=self)
 
-        # Execute the war update
-        import datetime
-        current_date = datetime.datetime.now().strftime('%Y-%m-%d')
-
-        success = self.commands_cog.bot.db.append_players_to_war_by_id(
+        # Execute the war update; the new players' stats are applied in the same transaction
+        appended = await self.commands_cog.bot.async_db.append_players_to_war_by_id(
             self.war_id, self.new_players, guild_id=self.guild_id
         )
 
-        if success:
-            # Get the updated war to get the new team_differential
-            updated_war = self.commands_cog.bot.db.get_war_by_id(self.war_id, self.guild_id)
-            team_score = sum(p['score'] for p in updated_war.get('results', []))
-            race_count = updated_war.get('race_count', 12)
-            total_points = 82 * race_count
-            opponent_score = total_points - team_score
-            team_differential = team_score - opponent_score
-
-            # Add statistics for new players only
-            stats_added = []
-            stats_failed = []
-
-            for new_player in self.new_players:
-                stats_success = self.commands_cog.bot.db.update_player_stats(
-                    new_player['name'],
-                    new_player['score'],
-                    new_player['races_played'],
-                    new_player['war_participation'],
-                    current_date,
-                    self.guild_id,
-                    team_differential
-                )
-                if stats_success:
-                    stats_added.append(new_player['name'])
-                else:
-                    stats_failed.append(new_player['name'])
+        if appended:
+            stats_added = appended['updated_players']
+            stats_failed = appended['unresolved_players']
 
             embed = discord.Embed(
                 title="✅ Players Added Successfully!",
@@ -729,18 +747,98 @@ class RemoveWarConfirmView(discord.ui.View):
         self.stop()
 
 
+class DebugOverlayView(discord.ui.View):
+    """Lets the /debugocr user render box overlays from the scan's cached OCR results."""
+
+    def __init__(self, overlay_sources: List[Dict], user: discord.User, commands_cog):
+        super().__init__(timeout=600)  # 10 minute timeout
+        self.overlay_sources = overlay_sources[:25]  # Discord select limit
+        self.user = user
+        self.commands_cog = commands_cog
+
+        select = discord.ui.Select(
+            placeholder="🎨 Render OCR overlay for an image...",
+            options=[
+                discord.SelectOption(
+                    label=source['filename'][:100],
+                    value=str(idx),
+                    description=f"{len(source['ocr_result'].get('results', []))} text boxes"
+                )
+                for idx, source in enumerate(self.overlay_sources)
+            ]
+        )
+        select.callback = self._overlay_select_callback
+        self.add_item(select)
+
+    async def _overlay_select_callback(self, interaction: discord.Interaction):
+        """Download the image again and draw the cached boxes on it (no OCR re-run)."""
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message(
+                "❌ Only the command user can render overlays.",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        source = self.overlay_sources[int(interaction.data['values'][0])]
+        temp_path = None
+        overlay_path = None
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(source['url']) as resp:
+                    if resp.status != 200:
+                        await interaction.followup.send(f"❌ Failed to download image (HTTP {resp.status})", ephemeral=True)
+                        return
+                    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(source['filename'])[1] or '.png')
+                    os.close(fd)
+                    async with aiofiles.open(temp_path, 'wb') as tmp_file:
+                        await tmp_file.write(await resp.read())
+
+            # Drawing is CPU-bound PIL work, keep it off the event loop
+            overlay_path = await asyncio.to_thread(
+                self.commands_cog.bot.ocr.render_debug_overlay, temp_path, source['ocr_result']
+            )
+
+            if not overlay_path:
+                await interaction.followup.send("❌ Failed to render overlay. Check logs for details.", ephemeral=True)
+                return
+
+            overlay_name = f"{os.path.splitext(source['filename'])[0]}_debug.png"
+            await interaction.followup.send(
+                content=f"🎨 OCR overlay for `{source['filename']}` (🟥 crop region, 🟩 names, 🟦 numbers)",
+                file=discord.File(overlay_path, filename=overlay_name),
+                ephemeral=True
+            )
+
+        except Exception as e:
+            logging.error(f"[DEBUG-OCR] Error rendering overlay: {e}")
+            await interaction.followup.send(f"❌ An error occurred: {str(e)}", ephemeral=True)
+
+        finally:
+            for path in (temp_path, overlay_path):
+                try:
+                    if path and os.path.exists(path):
+                        os.unlink(path)
+                except OSError as e:
+                    logging.debug(f"[DEBUG-OCR] Failed to delete temporary file: {e}")
+
+
 def get_member_status_text() -> str:
     """Get formatted member status text for help documentation."""
     return "/".join(choice.name for choice in MEMBER_STATUS_CHOICES)
 
-def create_duplicate_war_embed(resolved_results: list, races: int) -> discord.Embed:
+def create_duplicate_war_embed(resolved_results: list, races: int, duplicate: dict) -> discord.Embed:
     """
     Create an embed showing duplicate war detection with comparison.
     Follows existing embed patterns in the codebase.
+
+    duplicate is the existing war from DatabaseManager.find_duplicate_war().
     """
     embed = discord.Embed(
         title="⚠️ Duplicate War Detected",
-        description="The war you're trying to add appears identical to your most recent war.",
+        description=f"The war you're trying to add appears identical to war #{duplicate['war_id']}.",
         color=0xffa500  # Orange warning color (same as other warnings)
     )
     
@@ -1127,85 +1225,6 @@ class MarioKartCommands(commands.Cog):
 
         return member_stats
 
-    def _sort_player_stats(self, players_with_stats: List[Dict[str, Any]], sortby: Optional[str], guild_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Sort player statistics by specified criteria.
-
-        Args:
-            players_with_stats: List of players with war statistics
-            sortby: Sort criteria (avg10, avgdiff, clutch, cv, form, highest, hotstreak, lastwar, lowest, potential, totaldiff, warcount, winrate)
-            guild_id: Guild ID for database queries (required for some sorting options)
-
-        Returns:
-            Sorted list of player statistics
-        """
-        if sortby and sortby.lower() == 'avg10':
-            # Sort by average of last 10 wars (descending)
-            # Filter players with at least 10 wars
-            players_filtered = [p for p in players_with_stats if p.get('avg10_score') is not None]
-            players_filtered.sort(key=lambda x: x.get('avg10_score', 0), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'avgdiff':
-            # Sort by average team differential (total_team_differential / war_count)
-            players_with_stats.sort(
-                key=lambda x: x.get('total_team_differential', 0) / x.get('war_count', 1) if x.get('war_count', 1) > 0 else 0,
-                reverse=True
-            )
-        elif sortby and sortby.lower() == 'clutch':
-            # Sort by clutch factor (descending - higher is more clutch)
-            # Filter players with clutch factor available
-            players_filtered = [p for p in players_with_stats if p.get('clutch_factor') is not None]
-            players_filtered.sort(key=lambda x: x.get('clutch_factor', 0), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'cv':
-            # Sort by consistency score descending (higher is better)
-            # Filter out players with insufficient data (< 2 wars minimum)
-            players_with_cv = [p for p in players_with_stats if p.get('war_count', 0) >= 2]
-            players_with_cv.sort(key=lambda x: x.get('consistency_score', 0), reverse=True)
-            players_with_stats = players_with_cv
-        elif sortby and sortby.lower() == 'form':
-            # Sort by form score (descending)
-            # Filter players with form score available
-            players_filtered = [p for p in players_with_stats if p.get('form_score') is not None and p.get('form_score', 0) > 0]
-            players_filtered.sort(key=lambda x: x.get('form_score', 0), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'highest':
-            # Sort by highest score (descending)
-            players_with_stats.sort(key=lambda x: x.get('highest_score', 0), reverse=True)
-        elif sortby and sortby.lower() == 'hotstreak':
-            # Sort by hotstreak (avg10 - career average) (descending)
-            # Filter players with hotstreak data available
-            players_filtered = [p for p in players_with_stats if p.get('hotstreak') is not None]
-            players_filtered.sort(key=lambda x: x.get('hotstreak', 0), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'lastwar':
-            # Sort by last war date (most recent first)
-            players_filtered = [p for p in players_with_stats if p.get('last_war_date') is not None]
-            players_filtered.sort(key=lambda x: x.get('last_war_date', ''), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'lowest':
-            # Sort by lowest score (descending - higher lowest scores are better)
-            players_with_stats.sort(key=lambda x: x.get('lowest_score', 0), reverse=True)
-        elif sortby and sortby.lower() == 'potential':
-            # Sort by potential (descending)
-            # Filter players with potential available
-            players_filtered = [p for p in players_with_stats if p.get('potential') is not None]
-            players_filtered.sort(key=lambda x: x.get('potential', 0), reverse=True)
-            players_with_stats = players_filtered
-        elif sortby and sortby.lower() == 'totaldiff':
-            # Sort by total team differential (descending)
-            players_with_stats.sort(key=lambda x: x.get('total_team_differential', 0), reverse=True)
-        elif sortby and sortby.lower() == 'warcount':
-            # Sort by number of wars (war_count)
-            players_with_stats.sort(key=lambda x: x.get('war_count', 0), reverse=True)
-        elif sortby and sortby.lower() == 'winrate':
-            # Sort by win percentage (descending)
-            players_with_stats.sort(key=lambda x: x.get('win_percentage', 0), reverse=True)
-        else:
-            # Default: sort by average score
-            players_with_stats.sort(key=lambda x: x.get('average_score', 0), reverse=True)
-
-        return players_with_stats
-
     async def _display_player_stats(self, interaction: discord.Interaction, player_name: str, stats: Dict[str, Any], lastxwars: Optional[int] = None, guild_id: Optional[int] = None) -> None:
         """Display individual player statistics with embed.
 
@@ -1235,7 +1254,8 @@ class MarioKartCommands(commands.Cog):
 
         # Get player display name with team tag
         team_name = stats.get('team', 'Unassigned')
-        display_name = get_player_display_name(stats['player_name'], team_name, guild_id, self.bot.db)
+        team_tags = {team_name: await self.bot.async_db.get_team_tag(guild_id, team_name)}
+        display_name = get_player_display_name(stats['player_name'], team_name, guild_id, self.bot.db, team_tags)
 
         # Determine title and color based on context
         if lastxwars is not None:
@@ -1280,12 +1300,18 @@ class MarioKartCommands(commands.Cog):
         overall_avg = avg_score  # Default to current avg (which is overall avg in normal case)
         form_score = stats.get('form_score')
 
+        # Volatile metrics invalidated by a war save or removal are shown as pending;
+        # the metrics warmer recomputes them instead of this interaction
+        metrics_pending = lastxwars is None and stats.get('cached_metrics_updated_at') is None
+        if metrics_pending and qualifies('clutch_factor', stats.get('war_count')):
+            self.bot.metrics_warmer.invalidate(guild_id, [player_name])
+
         if lastxwars == 10:
             # Reuse existing calculation to avoid duplicate query
             avg10_score = avg_score
             # HtSk = avg10 - avg (use overall avg from career stats)
             # When viewing last 10 wars, we need to fetch overall avg for comparison
-            overall_stats = self.bot.db.get_player_stats(player_name, guild_id)
+            overall_stats = await self.bot.async_db.get_player_stats(player_name, guild_id)
             if overall_stats:
                 fetched_avg = overall_stats.get('average_score')
                 if fetched_avg is not None and fetched_avg > 0:
@@ -1293,16 +1319,7 @@ class MarioKartCommands(commands.Cog):
         else:
             # Use cached avg10 from stats dict if available
             avg10_score = stats.get('avg10_score')
-            # Only display avg10 if player has participated in at least 10 wars
-            war_count = stats.get('war_count', 0)
-            if avg10_score is None and war_count >= 10:
-                # Cache miss - refresh volatile metrics
-                self.bot.db._refresh_volatile_metrics(player_name, guild_id)
-                # Re-fetch stats with updated cache
-                updated_stats = self.bot.db.get_player_stats(player_name, guild_id)
-                if updated_stats:
-                    avg10_score = updated_stats.get('avg10_score')
-                    form_score = updated_stats.get('form_score')
+        avg10_pending = avg10_score is None and metrics_pending and qualifies('avg10_score', stats.get('war_count'))
 
         # Use cached hotstreak if available, calculate from avg10 if needed
         if stats.get('hotstreak') is not None:
@@ -1338,6 +1355,8 @@ class MarioKartCommands(commands.Cog):
         elif avg10_score is not None:
             # Show avg10 without HtSk (edge case: missing data for HtSk calculation)
             performance_text = f"```\nHighest:    {highest_score}\nAverage:    {avg_score:.1f}\navg10:      {avg10_score:.1f}\nLowest:     {lowest_score}\n```"
+        elif avg10_pending:
+            performance_text = f"```\nHighest:    {highest_score}\nAverage:    {avg_score:.1f}\navg10:      pending\nLowest:     {lowest_score}\n```"
         else:
             performance_text = f"```\nHighest:    {highest_score}\nAverage:    {avg_score:.1f}\nLowest:     {lowest_score}\n```"
 
@@ -1352,19 +1371,19 @@ class MarioKartCommands(commands.Cog):
         embed.add_field(name="📊 Consistency", value=consistency_text, inline=True)
 
         # Clutch Factor (performance in close wars)
-        # Use cached value from stats; compute and cache if needed
+        # Use cached value from stats; pending while the warmer recomputes it,
+        # computed here only when the stats don't carry it (last-x-wars view)
         clutch_factor = stats.get('clutch_factor')
-        if clutch_factor is None and float(stats.get('war_count', 0)) >= 2:
-            # Cache miss - compute and cache
-            clutch_factor = self.bot.db.get_player_clutch_factor(player_name, guild_id)
-            if clutch_factor is not None:
-                # Update cache with computed value
-                stats['clutch_factor'] = clutch_factor
+        clutch_pending = clutch_factor is None and metrics_pending and qualifies('clutch_factor', stats.get('war_count'))
+        if clutch_factor is None and not clutch_pending and float(stats.get('war_count', 0)) >= 2:
+            clutch_factor = await self.bot.async_db.get_player_clutch_factor(player_name, guild_id)
 
         if clutch_factor is not None:
             clutch_symbol = "+" if clutch_factor >= 0 else ""
             clutch_category = self.bot.db.get_clutch_category(clutch_factor)
             clutch_text = f"```\n{clutch_symbol}{clutch_factor:.2f}\n{clutch_category}\n```"
+        elif clutch_pending:
+            clutch_text = "```\nPending\n(Refreshing)\n```"
         else:
             clutch_text = "```\nN/A\n(Need 2+ wars)\n```"
         embed.add_field(name="⚡ Clutch Factor", value=clutch_text, inline=True)
@@ -1416,7 +1435,7 @@ class MarioKartCommands(commands.Cog):
         embed.add_field(name="📅 Activity", value=activity_text, inline=True)
 
         # Last 10 War Scores
-        last_scores = self.bot.db.get_player_last_war_scores(player_name, limit=10, guild_id=guild_id)
+        last_scores = await self.bot.async_db.get_player_last_war_scores(player_name, limit=10, guild_id=guild_id)
         if last_scores:
             # Format scores with race count notation for non-standard wars
             scores_list = []
@@ -1446,57 +1465,23 @@ class MarioKartCommands(commands.Cog):
             member_stats: List of active member statistics
             sortby: Sort criteria for leaderboard
         """
-        # Get war statistics for members who have them
-        players_with_stats = []
-        players_without_stats = []
-
-        for roster_player in member_stats:
-            war_stats = self.bot.db.get_player_stats(roster_player['player_name'], guild_id)
-            if war_stats:
-                # For volatile metrics that need refreshing (first access after war change)
-                if sortby in ['avg10', 'hotstreak', 'form', 'clutch', 'potential']:
-                    player_name = roster_player['player_name']
-                    war_count = war_stats.get('war_count', 0)
-
-                    # Map sortby to metric key and required minimum wars
-                    metric_requirements = {
-                        'avg10': ('avg10_score', 10),
-                        'hotstreak': ('hotstreak', 10),
-                        'form': ('form_score', 10),
-                        'clutch': ('clutch_factor', 2),
-                        'potential': ('potential', 10),
-                    }
-
-                    metric_key, min_wars = metric_requirements.get(sortby, (None, 0))
-
-                    # If metric is NULL but player has enough wars, refresh cache
-                    if metric_key and war_stats.get(metric_key) is None and war_count >= min_wars:
-                        self.bot.db._refresh_volatile_metrics(player_name, guild_id)
-                        # Re-fetch with updated cache
-                        war_stats = self.bot.db.get_player_stats(player_name, guild_id)
-
-                    # Fetch clutch factor for Clutch sorting
-                    if sortby == 'clutch':
-                        clutch_factor = self.bot.db.get_player_clutch_factor(player_name, guild_id)
-                        war_stats['clutch_factor'] = clutch_factor
-
-                    # Fetch potential for Potential sorting
-                    if sortby == 'potential':
-                        potential = self.bot.db.get_player_potential(player_name, guild_id)
-                        war_stats['potential'] = potential
-
-                players_with_stats.append(war_stats)
-            else:
-                players_without_stats.append(roster_player)
+        member_names = [member['player_name'] for member in member_stats]
 
-        # Sort players with stats by sortby parameter
-        players_with_stats = self._sort_player_stats(players_with_stats, sortby, guild_id)
+        # One pre-ranked page from the guild's leaderboard snapshot; the view fetches the rest on demand
+        first_page = await self.bot.async_db.get_guild_leaderboard_page(
+            guild_id, sortby, member_names, include_unranked=True
+        )
+        if first_page is None:
+            await interaction.response.send_message("❌ An error occurred while retrieving stats.", ephemeral=True)
+            return
 
-        # Combine and sort all players - those with stats first, then without stats
-        all_players = players_with_stats + players_without_stats
+        # Members missing from a volatile-metric ranking are re-warmed in the background
+        stale_players = await self.bot.async_db.get_players_missing_metric(sortby, guild_id, member_names)
+        if stale_players:
+            self.bot.metrics_warmer.invalidate(guild_id, stale_players[guild_id])
 
         # Use pagination view for leaderboard
-        view = LeaderboardView(all_players, sortby, len(all_players), self.bot, guild_id)
+        view = LeaderboardView(first_page, sortby, member_names, self.bot, guild_id)
         embed = view.create_embed()
 
         await interaction.response.send_message(embed=embed, view=view)
@@ -1546,27 +1531,17 @@ class MarioKartCommands(commands.Cog):
             # Auto-default to Discord user if lastxwars is specified but player is not
             if not player and lastxwars is not None:
                 # Look up player by Discord user ID
-                with self.bot.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT player_name
-                        FROM players
-                        WHERE discord_user_id = %s AND guild_id = %s AND is_active = TRUE
-                    """, (interaction.user.id, guild_id))
-                    result = cursor.fetchone()
-
-                    if result:
-                        player = result[0]
-                    else:
-                        await interaction.response.send_message(
-                            f"❌ You're not linked to a player in this guild. Ask an admin to add you with `/addplayer`.",
-                            ephemeral=True
-                        )
-                        return
+                player = await self.bot.async_db.get_player_name_by_discord_id(interaction.user.id, guild_id)
+                if not player:
+                    await interaction.response.send_message(
+                        f"❌ You're not linked to a player in this guild. Ask an admin to add you with `/addplayer`.",
+                        ephemeral=True
+                    )
+                    return
 
             if player:
                 # Resolve nickname to actual player name first
-                resolved_player = self.bot.db.resolve_player_name(player, guild_id)
+                resolved_player = await self.bot.async_db.resolve_player_name(player, guild_id)
                 if not resolved_player:
                     await interaction.response.send_message(f"❌ No player found with name or nickname: {player}", ephemeral=True)
                     return
@@ -1579,7 +1554,7 @@ class MarioKartCommands(commands.Cog):
                         return
 
                     # Get player's distinct war count for validation
-                    distinct_wars = self.bot.db.get_player_distinct_war_count(resolved_player, guild_id)
+                    distinct_wars = await self.bot.async_db.get_player_distinct_war_count(resolved_player, guild_id)
                     if distinct_wars == 0:
                         await interaction.response.send_message(f"❌ {resolved_player} hasn't participated in any wars yet.", ephemeral=True)
                         return
@@ -1589,16 +1564,16 @@ class MarioKartCommands(commands.Cog):
                         return
 
                     # Get stats for last X wars
-                    stats = self.bot.db.get_player_stats_last_x_wars(resolved_player, lastxwars, guild_id)
+                    stats = await self.bot.async_db.get_player_stats_last_x_wars(resolved_player, lastxwars, guild_id)
                 else:
                     # Get all-time stats (default behavior)
-                    stats = self.bot.db.get_player_stats(resolved_player, guild_id)
+                    stats = await self.bot.async_db.get_player_stats(resolved_player, guild_id)
 
                 if stats:
                     await self._display_player_stats(interaction, resolved_player, stats, lastxwars, guild_id)
                 else:
                     # Check if player exists in players table but has no stats yet
-                    roster_stats = self.bot.db.get_player_info(resolved_player, guild_id)
+                    roster_stats = await self.bot.async_db.get_player_info(resolved_player, guild_id)
                     if roster_stats:
                         embed = discord.Embed(
                             title=f"📊 Stats for {roster_stats['player_name']}",
@@ -1620,10 +1595,10 @@ class MarioKartCommands(commands.Cog):
                         await interaction.response.send_message(f"❌ No stats found for player: {player}", ephemeral=True)
             else:
                 # Get all player statistics from players table
-                roster_stats = self.bot.db.get_all_players_stats(guild_id)
+                roster_stats = await self.bot.async_db.get_all_players_stats(guild_id)
 
                 # Get guild role configuration to check actual Discord roles
-                role_config = self.bot.db.get_guild_role_config(guild_id)
+                role_config = await self.bot.async_db.get_guild_role_config(guild_id)
 
                 # Filter for active members
                 member_stats = self._filter_active_members(roster_stats, interaction, role_config)
@@ -1678,94 +1653,34 @@ class MarioKartCommands(commands.Cog):
             sortby = 'avg'
 
         # Global minimum war threshold for leaderboard data quality
-        MIN_WARS_FOR_LEADERBOARD = 20
+        MIN_WARS_FOR_LEADERBOARD = self.bot.db.GLOBAL_LEADERBOARD_MIN_WARS
 
         try:
-            # Get all players across all guilds (excludes testing guilds via env var)
-            all_players_basic = self.bot.db.get_all_players_stats_global()
+            # Filter, sort and page in SQL (excludes testing guilds via env var)
+            first_page = await self.bot.async_db.get_global_leaderboard_page(sortby, include_total=True)
+
+            # Qualified players missing from a volatile-metric ranking are re-warmed in the background
+            stale_players = await self.bot.async_db.get_players_missing_metric(sortby)
+            for stale_guild_id, player_names in stale_players.items():
+                self.bot.metrics_warmer.invalidate(stale_guild_id, player_names)
 
-            if not all_players_basic:
+            if first_page is None:
                 await interaction.followup.send(
-                    "❌ No active players found in the database.",
+                    "❌ An error occurred while generating the leaderboard.",
                     ephemeral=True
                 )
                 return
 
-            # Get full stats for each player (cached metrics)
-            players_with_stats = []
-            for player_basic in all_players_basic:
-                player_name = player_basic['player_name']
-                guild_id = player_basic['guild_id']
-
-                # Get full stats including cached metrics
-                stats = self.bot.db.get_player_stats(player_name, guild_id)
-                if stats and stats.get('war_count', 0) >= MIN_WARS_FOR_LEADERBOARD:
-                    # Add guild_id to stats for guild identification
-                    stats['guild_id'] = guild_id
-                    players_with_stats.append(stats)
-
-            if not players_with_stats:
+            if not first_page['players']:
                 await interaction.followup.send(
                     f"❌ No players found with {MIN_WARS_FOR_LEADERBOARD}+ wars. Global leaderboard requires players to have at least {MIN_WARS_FOR_LEADERBOARD} wars for data quality.",
                     ephemeral=True
                 )
                 return
 
-            # Trigger volatile metrics refresh if needed (same as guild leaderboard)
-            if sortby in ['avg10', 'hotstreak', 'form', 'clutch', 'potential']:
-                metric_key = {
-                    'avg10': 'avg10_score',
-                    'hotstreak': 'hotstreak',
-                    'form': 'form_score',
-                    'clutch': 'clutch_factor',
-                    'potential': 'potential'
-                }.get(sortby, sortby)
-
-                for stats in players_with_stats:
-                    if stats.get(metric_key) is None and stats.get('war_count', 0) >= MIN_WARS_FOR_LEADERBOARD:
-                        self.bot.db._refresh_volatile_metrics(
-                            stats['player_name'],
-                            stats['guild_id']
-                        )
-                        # Re-fetch stats
-                        refreshed = self.bot.db.get_player_stats(
-                            stats['player_name'],
-                            stats['guild_id']
-                        )
-                        if refreshed:
-                            stats.update(refreshed)
-
-                        # Explicitly populate clutch_factor and potential if needed
-                        if sortby == 'clutch' and stats.get('clutch_factor') is None:
-                            clutch = self.bot.db.get_player_clutch_factor(
-                                stats['player_name'],
-                                stats['guild_id']
-                            )
-                            if clutch is not None:
-                                stats['clutch_factor'] = clutch
-
-                        if sortby == 'potential' and stats.get('potential') is None:
-                            potential = self.bot.db.get_player_potential(
-                                stats['player_name'],
-                                stats['guild_id']
-                            )
-                            if potential is not None:
-                                stats['potential'] = potential
-
-            # Sort using existing method (works cross-guild)
-            players_with_stats = self._sort_player_stats(
-                players_with_stats,
-                sortby,
-                guild_id=0  # Not used for global leaderboard
-            )
-
             # Display with GlobalLeaderboardView
-            view = GlobalLeaderboardView(
-                players_with_stats,
-                sortby,
-                len(players_with_stats),
-                self.bot
-            )
+            view = GlobalLeaderboardView(first_page, sortby, self.bot)
+            await view._populate_team_tags()
             embed = view.create_embed()
             await interaction.followup.send(embed=embed, view=view)
 
@@ -1787,12 +1702,14 @@ class MarioKartCommands(commands.Cog):
             # Get guild id 
             guild_id = self.get_guild_id(interaction)
             # Get all players with their team and nickname info
-            all_players = self.bot.db.get_all_players_stats(guild_id)
+            all_players = await self.bot.async_db.get_all_players_stats(guild_id)
             
             if not all_players:
                 await interaction.response.send_message("❌ No players found in players table. Use `/addplayer <player>` to add players.")
                 return
             
+            team_tags = await self.bot.async_db.get_all_team_tags(guild_id)
+
             embed = discord.Embed(
                 title="👥 Complete Clan Roster",
                 description=f"All {len(all_players)} clan members organized by teams:",
@@ -1814,7 +1731,7 @@ class MarioKartCommands(commands.Cog):
 
                     for player in players:
                         # Get display name with tag
-                        display_name = get_player_display_name(player['player_name'], team_name, guild_id, self.bot.db)
+                        display_name = get_player_display_name(player['player_name'], team_name, guild_id, self.bot.db, team_tags)
                         nickname_count = len(player.get('nicknames', []))
                         nickname_text = f" ({nickname_count} nicknames)" if nickname_count > 0 else ""
                         player_list.append(f"• **{display_name}**{nickname_text}")
@@ -2732,13 +2649,9 @@ class MarioKartCommands(commands.Cog):
         """Autocomplete callback for player names."""
         try:
             guild_id = self.get_guild_id(interaction)
-            all_players = self.bot.db.get_all_players_stats(guild_id)
-
-            # Filter players based on current input
-            filtered = [p['player_name'] for p in all_players if current.lower() in p['player_name'].lower()]
-
-            # Return up to 25 choices (Discord limit)
-            return [app_commands.Choice(name=name, value=name) for name in filtered[:25]]
+            # Ranked by the guild's in-memory autocomplete index (up to 25 choices, the Discord limit)
+            names = await self.bot.async_db.autocomplete_players(guild_id, current)
+            return [app_commands.Choice(name=name, value=name) for name in names]
         except Exception as e:
             logging.error(f"Error in player autocomplete: {e}")
             return []
@@ -2747,14 +2660,9 @@ class MarioKartCommands(commands.Cog):
         """Autocomplete callback for team names."""
         try:
             guild_id = self.get_guild_id(interaction)
-            team_names = self.bot.db.get_guild_team_names(guild_id)
-            team_names.append('Unassigned')  # Always include Unassigned option
-
-            # Filter teams based on current input
-            filtered = [name for name in team_names if current.lower() in name.lower()]
-
-            # Return up to 25 choices (Discord limit)
-            return [app_commands.Choice(name=name, value=name) for name in filtered[:25]]
+            # Always includes the Unassigned option (up to 25 choices, the Discord limit)
+            names = await self.bot.async_db.autocomplete_teams(guild_id, current)
+            return [app_commands.Choice(name=name, value=name) for name in names]
         except Exception as e:
             logging.error(f"Error in team autocomplete: {e}")
             return []
@@ -2782,12 +2690,13 @@ class MarioKartCommands(commands.Cog):
                 await interaction.response.send_message(f"❌ Invalid team name. Valid teams: {', '.join(valid_teams)}\nUse `/showallteams` to see available teams or `/addteam` to create new teams.")
                 return
             
-            # Resolve all player names first
+            # Resolve all player names first (single query)
             resolved_players = []
             failed_players = []
+            resolved_names = self.bot.db.resolve_player_names(player_names, guild_id)
             
             for player_name in player_names:
-                resolved = self.bot.db.resolve_player_name(player_name, guild_id)
+                resolved = resolved_names.get(player_name)
                 if resolved:
                     resolved_players.append(resolved)
                 else:
@@ -3334,12 +3243,13 @@ class MarioKartCommands(commands.Cog):
                 await interaction.response.send_message("❌ No player scores provided. Use format: `PlayerName: Score`", ephemeral=True)
                 return
             
-            # Resolve player names and validate they exist in players table
+            # Resolve player names and validate they exist in players table (single query)
             resolved_results = []
             failed_players = []
+            resolved_names = await self.bot.async_db.resolve_player_names([result['name'] for result in results], guild_id)
             
             for result in results:
-                resolved_player = self.bot.db.resolve_player_name(result['name'], guild_id)
+                resolved_player = resolved_names.get(result['name'])
                 logging.info(f"Player resolution: '{result['name']}' -> {resolved_player}")
                 if resolved_player:
                     resolved_results.append({
@@ -3368,15 +3278,14 @@ class MarioKartCommands(commands.Cog):
                     result['war_participation'] = 0.0
 
             # Check for duplicate war before adding to database
-            last_war_results = self.bot.db.get_last_war_for_duplicate_check(guild_id)
-            is_duplicate = self.bot.db.check_for_duplicate_war(resolved_results, last_war_results)
+            duplicate = await self.bot.async_db.find_duplicate_war(resolved_results, actual_war_race_count, guild_id)
 
             # Track if we've already responded to the interaction
             already_responded = False
 
-            if is_duplicate:
+            if duplicate:
                 # Show duplicate warning embed with reactions
-                duplicate_embed = create_duplicate_war_embed(resolved_results, actual_war_race_count)
+                duplicate_embed = create_duplicate_war_embed(resolved_results, actual_war_race_count, duplicate)
                 
                 await interaction.response.send_message(embed=duplicate_embed)
                 confirmation_msg = await interaction.original_response()
@@ -3416,42 +3325,21 @@ class MarioKartCommands(commands.Cog):
                     await interaction.edit_original_response(embed=timeout_embed)
                     return
 
-            # Store war in database with actual race count (already calculated above)
-            war_id = self.bot.db.add_race_results(resolved_results, actual_war_race_count, guild_id=guild_id)
+            # Store war and update player statistics in one transaction (actual race count calculated above)
+            saved_war = await self.bot.async_db.save_war(resolved_results, actual_war_race_count, guild_id=guild_id)
             
-            if war_id is None:
+            if saved_war is None:
                 await interaction.response.send_message("❌ Failed to add war to database. Check logs for details.", ephemeral=True)
                 return
             
-            # Update player statistics
+            war_id = saved_war['war_id']
             import datetime
             current_date = datetime.datetime.now().strftime('%Y-%m-%d')
 
-            # Calculate team differential for player stats using actual war race count
-            team_score = sum(r['score'] for r in resolved_results)
-            total_points = 82 * actual_war_race_count
-            opponent_score = total_points - team_score
-            team_differential = team_score - opponent_score
-
-            stats_updated = []
-            stats_failed = []
-
-            for result in resolved_results:
-                success = self.bot.db.update_player_stats(
-                    result['name'],
-                    result['score'],
-                    result['races_played'],
-                    result['war_participation'],
-                    current_date,
-                    guild_id,
-                    team_differential
-                )
-                if success:
-                    stats_updated.append(result['name'])
-                    logging.info(f"✅ Stats updated for {result['name']}")
-                else:
-                    stats_failed.append(result['name'])
-                    logging.error(f"❌ Stats update failed for {result['name']}")
+            stats_updated = saved_war['updated_players']
+            stats_failed = saved_war['unresolved_players']
+            for player_name in stats_failed:
+                logging.error(f"❌ Stats update failed for {player_name}")
 
             # Create success response
             embed = discord.Embed(
@@ -3519,8 +3407,8 @@ class MarioKartCommands(commands.Cog):
                 await interaction.response.send_message("❌ Limit must be between 1 and 50.", ephemeral=True)
                 return
 
-            # Get wars from database
-            wars = self.bot.db.get_all_wars(limit, guild_id)
+            # Get the most recent wars (one keyset page), shown oldest first
+            wars = list(reversed(await self.bot.async_db.get_wars_page(guild_id, limit=limit, include_results=True)))
 
             if not wars:
                 await interaction.response.send_message("❌ No wars found.", ephemeral=True)
@@ -3947,7 +3835,7 @@ class MarioKartCommands(commands.Cog):
         """Autocomplete callback for teams that have tags set."""
         try:
             guild_id = self.get_guild_id(interaction)
-            team_tags = self.bot.db.get_all_team_tags(guild_id)
+            team_tags = await self.bot.async_db.get_all_team_tags(guild_id)
 
             # Only show teams that have tags
             teams_with_tags = list(team_tags.keys())
@@ -4850,6 +4738,8 @@ class MarioKartCommands(commands.Cog):
 
             # Process each image with detailed logging
             results_summary = []
+            # OCR results (boxes + crop offsets) kept so overlays can be drawn later on request
+            overlay_sources = []
 
             for idx, img_data in enumerate(images_found):
                 message = img_data['message']
@@ -4903,13 +4793,14 @@ class MarioKartCommands(commands.Cog):
                     # Add handler to capture all OCR processing logs
                     logging.getLogger().addHandler(debug_handler)
 
-                    # Step 1: Crop and detect format
-                    cropped_path, visual_path, crop_coords = ocr.crop_image_to_target_region(temp_path)
+                    # Step 1: Detect format
                     table_format = ocr.detect_table_format(img_width, img_height)
-                    debug_lines.append(f"Dim: {img_width}x{img_height} | Format: {table_format.value} | Crop: {crop_coords}")
 
-                    # Step 2: Perform OCR
+                    # Step 2: Perform OCR (crops to the target region itself)
                     ocr_result = ocr.perform_ocr_on_file(temp_path)
+                    cropped_path = ocr_result.get('cropped_path')
+                    visual_path = ocr_result.get('visual_path')
+                    debug_lines.append(f"Dim: {img_width}x{img_height} | Format: {table_format.value} | Crop: {ocr_result.get('crop_coords')}")
 
                     if not ocr_result["success"]:
                         error_msg = ocr_result.get('error', 'Unknown error')
@@ -4923,6 +4814,16 @@ class MarioKartCommands(commands.Cog):
                         })
                         continue
 
+                    overlay_sources.append({
+                        'filename': attachment.filename,
+                        'url': attachment.url,
+                        'ocr_result': {
+                            'success': True,
+                            'results': ocr_result.get('results', []),
+                            'crop_coords': ocr_result.get('crop_coords')
+                        }
+                    })
+
                     # Step 3: Log raw OCR text
                     raw_text = ocr_result.get("text", "")
                     debug_lines.append(f"OCR:\n{raw_text if raw_text.strip() else '(empty)'}")
@@ -5061,11 +4962,19 @@ class MarioKartCommands(commands.Cog):
                 inline=False
             )
 
+            if overlay_sources:
+                summary_embed.add_field(
+                    name="🎨 Overlays",
+                    value="Pick an image below to render its OCR boxes (uses this scan's results, no re-scan)",
+                    inline=False
+                )
+
             summary_embed.set_footer(text="Debug mode - no changes made to database")
 
             # Send the debug file and edit the status message with final results
             debug_file = discord.File(debug_output_path, filename=f"debug_ocr_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.txt")
-            await status_msg.edit(embed=summary_embed, attachments=[debug_file])
+            overlay_view = DebugOverlayView(overlay_sources, interaction.user, self) if overlay_sources else None
+            await status_msg.edit(embed=summary_embed, attachments=[debug_file], view=overlay_view)
 
         except Exception as e:
             logging.error(f"[DEBUG-OCR] Error in debugocr command: {e}")
@@ -50,6 +50,9 @@ DEFAULT_RACE_COUNT = 12  # Most wars are 12 races
 MIN_RACE_COUNT = 1  # Minimum races in a war
 MAX_RACE_COUNT = 12  # Maximum races in a war
 
+# Duplicate war detection (wars.fingerprint, see war_fingerprint.py)
+DUPLICATE_WAR_WINDOW_DAYS = float(os.getenv('DUPLICATE_WAR_WINDOW_DAYS', '0'))  # Only flag repeats of wars this recent; 0 = all history
+
 # War result metadata that can be extracted or manually entered
 WAR_METADATA_FIELDS = [
     'date',           # Date of the war
@@ -85,4 +88,42 @@ DASHBOARD_API_KEY = os.getenv('DASHBOARD_API_KEY')  # Shared secret for bot -> A
 DASHBOARD_WEB_URL = os.getenv('DASHBOARD_WEB_URL')  # URL of the Next.js frontend
 
 # Enable/disable dashboard integration (falls back to Discord-only flow if disabled)
-DASHBOARD_ENABLED = os.getenv('DASHBOARD_ENABLED', 'false').lower() == 'true'
\ No newline at end of file
+DASHBOARD_ENABLED = os.getenv('DASHBOARD_ENABLED', 'false').lower() == 'true'
+
+# Persistent OCR job queue (bulk scans survive restarts, see the ocr_jobs migration in migrations.py)
+OCR_JOB_POLL_INTERVAL = float(os.getenv('OCR_JOB_POLL_INTERVAL', '2'))  # Seconds between polls when queue is empty
+OCR_JOB_STALE_SECONDS = int(os.getenv('OCR_JOB_STALE_SECONDS', '300'))  # Reclaim jobs locked longer than this (dead worker)
+OCR_JOB_MAX_ATTEMPTS = int(os.getenv('OCR_JOB_MAX_ATTEMPTS', '3'))  # Give up on an image after this many claims
+
+# Standalone OCR worker service (python ocr_worker.py)
+# When OCR_WORKER_URLS is set the bot sends images to the workers instead of running PaddleOCR itself
+OCR_WORKER_URLS = [url.strip().rstrip('/') for url in os.getenv('OCR_WORKER_URLS', '').split(',') if url.strip()]  # Comma-separated, round-robin
+OCR_WORKER_API_KEY = os.getenv('OCR_WORKER_API_KEY')  # Shared secret for bot -> worker auth
+OCR_WORKER_TIMEOUT = float(os.getenv('OCR_WORKER_TIMEOUT', '120'))  # Seconds to wait for one image
+OCR_WORKER_HOST = os.getenv('OCR_WORKER_HOST', '0.0.0.0')  # Bind address for the worker service
+OCR_WORKER_PORT = int(os.getenv('OCR_WORKER_PORT', '8081'))  # Bind port for the worker service
+
+# Background metrics warmer (recomputes invalidated avg10/form/clutch/potential after war saves)
+METRICS_WARMER_DEBOUNCE_SECONDS = float(os.getenv('METRICS_WARMER_DEBOUNCE_SECONDS', '2'))  # Coalesce saves within this window
+
+# Database connection pool (shared by commands, OCR executor threads and background tasks)
+DB_POOL_MIN_CONNECTIONS = int(os.getenv('DB_POOL_MIN_CONNECTIONS', '1'))
+DB_POOL_MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX_CONNECTIONS', '10'))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10'))  # Seconds to wait for a free connection
+DB_POOL_LEAK_THRESHOLD = float(os.getenv('DB_POOL_LEAK_THRESHOLD', '60'))  # Warn about connections held longer than this
+
+# Read replica (optional; read-only DatabaseManager methods run there, see read_routing.py)
+DATABASE_READ_URL = os.getenv('DATABASE_READ_URL')  # Unset = every query goes to the primary
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', '5'))  # Read from the primary while the replica is further behind
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '5'))  # Seconds between replica lag/health checks
+DB_REPLICA_PIN_SECONDS = float(os.getenv('DB_REPLICA_PIN_SECONDS', '10'))  # Keep a guild's reads on the primary this long after a war write
+
+# Query instrumentation (per-method statement counts/latency, see query_stats.py)
+QUERY_SLOW_THRESHOLD_MS = float(os.getenv('QUERY_SLOW_THRESHOLD_MS', '200'))  # Log statements slower than this (parameters redacted)
+QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('QUERY_EXPLAIN_SAMPLE_RATE', '0'))  # Share of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv('QUERY_COUNT_WARN_THRESHOLD', '25'))  # Warn when one command issues more statements (likely N+1)
+
+# Schema migrations (python scripts/utilities/migrate.py, see migration_runner.py)
+MIGRATION_BATCH_SIZE = int(os.getenv('MIGRATION_BATCH_SIZE', '1000'))  # Rows per backfill transaction
+MIGRATION_THROTTLE_SECONDS = float(os.getenv('MIGRATION_THROTTLE_SECONDS', '0.1'))  # Pause between backfill chunks
+MIGRATION_LOCK_TIMEOUT_MS = int(os.getenv('MIGRATION_LOCK_TIMEOUT_MS', '3000'))  # Give up (and retry) a DDL lock wait after this
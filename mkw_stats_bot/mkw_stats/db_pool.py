@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Thread-safe, instrumented PostgreSQL connection pool for DatabaseManager.
+
+psycopg2's SimpleConnectionPool is not thread-safe and raises as soon as its
+connections run out. This pool can be shared by the event loop, OCR executor
+threads and the metrics warmer:
+- getconn() blocks until a connection frees up (up to a timeout) instead of raising
+- every checkout records its call site, so stats() shows who holds what
+- wait times, in-use and waiting gauges are tracked
+- connections held longer than a threshold are reported as possible leaks
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import psycopg2.pool
+
+
+class PoolTimeoutError(psycopg2.pool.PoolError):
+    """No connection became available within the acquire timeout."""
+
+
+@dataclass
+class Checkout:
+    """One connection currently checked out of the pool."""
+    site: str
+    thread_name: str
+    checked_out_at: float
+    leak_reported: bool = False
+
+    @property
+    def held_seconds(self) -> float:
+        return time.monotonic() - self.checked_out_at
+
+
+@dataclass
+class SiteStats:
+    """Checkout totals for one call site."""
+    checkouts: int = 0
+    total_wait_seconds: float = 0.0
+    total_held_seconds: float = 0.0
+    max_held_seconds: float = 0.0
+
+
+class InstrumentedConnectionPool:
+    """Blocking, thread-safe connection pool with checkout tracking and leak detection."""
+
+    def __init__(self, minconn: int, maxconn: int, acquire_timeout: float = 10.0,
+                 leak_threshold: float = 60.0, **connection_params):
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.leak_threshold = leak_threshold
+
+        self._pool = psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **connection_params)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+
+        self._checkouts: Dict[int, Checkout] = {}
+        self._site_stats: Dict[str, SiteStats] = defaultdict(SiteStats)
+        self._waiting = 0
+        self._peak_in_use = 0
+        self._total_checkouts = 0
+        self._total_timeouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def getconn(self, site: str = "unknown", timeout: Optional[float] = None):
+        """Check out a connection, waiting up to timeout seconds for one to free up.
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        # Cheap (at most maxconn entries), and catches connections that are never returned
+        self.report_leaks()
+
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        waited = time.monotonic() - started
+        if not acquired:
+            with self._lock:
+                self._total_timeouts += 1
+            raise PoolTimeoutError(
+                f"No database connection available after {waited:.1f}s "
+                f"({self.maxconn} in use, requested by {site})"
+            )
+
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._checkouts[id(conn)] = Checkout(site, threading.current_thread().name, time.monotonic())
+            self._peak_in_use = max(self._peak_in_use, len(self._checkouts))
+            self._total_checkouts += 1
+            self._total_wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            site_stats = self._site_stats[site]
+            site_stats.checkouts += 1
+            site_stats.total_wait_seconds += waited
+
+        if waited > 1.0:
+            logging.warning(f"⚠️ {site} waited {waited:.2f}s for a database connection")
+        return conn
+
+    def putconn(self, conn, close: bool = False):
+        """Return a connection to the pool (closed connections are discarded)."""
+        with self._lock:
+            checkout = self._checkouts.pop(id(conn), None)
+            if checkout is not None:
+                held = checkout.held_seconds
+                site_stats = self._site_stats[checkout.site]
+                site_stats.total_held_seconds += held
+                site_stats.max_held_seconds = max(site_stats.max_held_seconds, held)
+
+        if checkout is not None and held > self.leak_threshold and not checkout.leak_reported:
+            logging.warning(f"⚠️ {checkout.site} held a database connection for {held:.1f}s")
+
+        try:
+            self._pool.putconn(conn, close=close or conn.closed)
+        finally:
+            if checkout is not None:
+                self._slots.release()
+
+    def report_leaks(self) -> List[Dict]:
+        """Log (once each) and return checkouts held longer than the leak threshold."""
+        leaks = []
+        with self._lock:
+            for checkout in self._checkouts.values():
+                held = checkout.held_seconds
+                if held <= self.leak_threshold:
+                    continue
+                leaks.append({'site': checkout.site, 'thread': checkout.thread_name, 'held_seconds': round(held, 1)})
+                if not checkout.leak_reported:
+                    checkout.leak_reported = True
+                    logging.warning(
+                        f"⚠️ Possible connection leak: {checkout.site} ({checkout.thread_name}) "
+                        f"has held a connection for {held:.1f}s"
+                    )
+        return leaks
+
+    def stats(self) -> Dict:
+        """Snapshot of the pool gauges and per-call-site checkout totals."""
+        with self._lock:
+            return {
+                'max_connections': self.maxconn,
+                'in_use': len(self._checkouts),
+                'waiting': self._waiting,
+                'peak_in_use': self._peak_in_use,
+                'total_checkouts': self._total_checkouts,
+                'total_timeouts': self._total_timeouts,
+                'avg_wait_ms': round(self._total_wait_seconds / self._total_checkouts * 1000, 2)
+                               if self._total_checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait_seconds * 1000, 2),
+                'held_by': [
+                    {'site': c.site, 'thread': c.thread_name, 'held_seconds': round(c.held_seconds, 1)}
+                    for c in self._checkouts.values()
+                ],
+                'sites': {
+                    site: {
+                        'checkouts': s.checkouts,
+                        'avg_wait_ms': round(s.total_wait_seconds / s.checkouts * 1000, 2) if s.checkouts else 0.0,
+                        'avg_held_ms': round(s.total_held_seconds / s.checkouts * 1000, 2) if s.checkouts else 0.0,
+                        'max_held_ms': round(s.max_held_seconds * 1000, 2),
+                    }
+                    for site, s in self._site_stats.items()
+                },
+            }
+
+    def closeall(self):
+        """Close every connection in the pool."""
+        self._pool.closeall()
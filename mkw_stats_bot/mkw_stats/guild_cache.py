@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Process-wide cache of guild configs and rosters, kept coherent with LISTEN/NOTIFY.
+
+Guild configs (OCR channel, roles, teams, tags) and rosters (players plus their
+aliases) are read on every attachment, autocomplete keystroke and OCR pass but
+change rarely. Triggers installed by the cache_invalidation migration
+(mkw_stats/migrations.py) send '<table>:<guild_id>' on the mkw_cache_invalidation channel whenever a
+guild_configs row or a player's roster columns change, from any process (bot,
+dashboard API, scripts). A listener thread drops the affected guild's entry, so
+readers get dictionary lookups until the next write.
+
+The cache only serves reads while the listener is connected. Before start(),
+while reconnecting, or if the triggers aren't installed, every read goes
+straight to the database, so a missed notification can never leave stale data.
+"""
+
+import logging
+import select
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+
+from .autocomplete_index import AutocompleteIndex
+
+CACHE_INVALIDATION_CHANNEL = 'mkw_cache_invalidation'
+
+CONFIGS = 'guild_configs'
+ROSTERS = 'players'
+
+
+@dataclass
+class GuildRoster:
+    """Active players of one guild and the aliases they resolve by."""
+    players: List[Dict] = field(default_factory=list)
+    # alias_casefold -> player_name, best alias kind wins (see DatabaseManager.PLAYER_ALIAS_ROWS_SQL)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    # Ranked name/nickname search for slash command autocomplete
+    index: Optional[AutocompleteIndex] = None
+
+
+class GuildCache:
+    """Per-guild config and roster cache invalidated by Postgres notifications."""
+
+    def __init__(self, connection_params: Dict, keepalive_seconds: float = 30.0,
+                 reconnect_delay: float = 5.0):
+        self.connection_params = connection_params
+        self.keepalive_seconds = keepalive_seconds
+        self.reconnect_delay = reconnect_delay
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[int, object]] = {CONFIGS: {}, ROSTERS: {}}
+        # Bumped on every invalidation so a load that raced a write isn't stored
+        self._generations: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._epoch = 0
+
+        self._listening = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True while notifications are being received and reads may be served from memory."""
+        return self._listening.is_set()
+
+    def start(self):
+        """Start the listener thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="guild-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the listener; reads go to the database afterwards."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.keepalive_seconds)
+            self._thread = None
+
+    def get_config(self, guild_id: int, loader: Callable[[int], Optional[Dict]]) -> Optional[Dict]:
+        """Cached guild_configs row for a guild (None is cached too: most guilds never configure OCR)."""
+        return self._get(CONFIGS, guild_id, loader)
+
+    def get_roster(self, guild_id: int, loader: Callable[[int], GuildRoster]) -> GuildRoster:
+        """Cached active roster and alias map for a guild."""
+        return self._get(ROSTERS, guild_id, loader)
+
+    def _get(self, table: str, guild_id: int, loader: Callable):
+        if not self.enabled:
+            return loader(guild_id)
+
+        with self._lock:
+            entries = self._entries[table]
+            if guild_id in entries:
+                self.hits += 1
+                return entries[guild_id]
+            self.misses += 1
+            token = (self._epoch, self._generations[(table, guild_id)])
+
+        # Loaders raise on database errors, so failures are never cached
+        value = loader(guild_id)
+
+        with self._lock:
+            if self.enabled and token == (self._epoch, self._generations[(table, guild_id)]):
+                self._entries[table][guild_id] = value
+        return value
+
+    def invalidate(self, guild_id: Optional[int] = None, table: Optional[str] = None):
+        """Drop cached entries for one guild (or all guilds), for one table (or both)."""
+        with self._lock:
+            self.invalidations += 1
+            if guild_id is None:
+                self._epoch += 1
+                for entries in self._entries.values():
+                    entries.clear()
+                return
+            for name in ([table] if table else list(self._entries)):
+                self._generations[(name, guild_id)] += 1
+                self._entries[name].pop(guild_id, None)
+
+    def _handle_notification(self, payload: str):
+        table, _, guild_id = payload.partition(':')
+        try:
+            guild_id = int(guild_id)
+        except ValueError:
+            logging.warning(f"⚠️ Ignoring malformed cache invalidation: {payload!r}")
+            return
+        if table not in self._entries:
+            # Unknown table from a newer trigger: drop the whole guild to be safe
+            table = None
+        self.invalidate(guild_id, table)
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**self.connection_params)
+                conn.autocommit = True
+                cursor = conn.cursor()
+
+                cursor.execute("SELECT to_regproc('public.notify_cache_invalidation') IS NOT NULL")
+                if not cursor.fetchone()[0]:
+                    logging.warning(
+                        "⚠️ Guild cache disabled: run scripts/utilities/migrate.py"
+                    )
+                    return
+
+                cursor.execute(f"LISTEN {CACHE_INVALIDATION_CHANNEL}")
+                # Anything loaded before LISTEN took effect may have missed a notification
+                self.invalidate()
+                self._listening.set()
+                logging.info("✅ Guild cache listening for invalidations")
+
+                while not self._stopping.is_set():
+                    readable, _, _ = select.select([conn], [], [], self.keepalive_seconds)
+                    if not readable:
+                        # Idle: make sure the connection is still alive, or we'd miss notifications
+                        cursor.execute("SELECT 1")
+                    conn.poll()
+                    while conn.notifies:
+                        self._handle_notification(conn.notifies.pop(0).payload)
+
+            except Exception as e:
+                logging.warning(f"⚠️ Guild cache listener disconnected: {e}")
+            finally:
+                self._listening.clear()
+                self.invalidate()
+                if conn is not None:
+                    conn.close()
+
+            self._stopping.wait(self.reconnect_delay)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and entry counts."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'guild_configs': len(self._entries[CONFIGS]),
+                'rosters': len(self._entries[ROSTERS]),
+            }
@@ -0,0 +1,86 @@
+"""
+Background warmer for cached volatile player metrics.
+
+War saves and removals set a player's volatile metrics (avg10, form, clutch,
+potential, hotstreak) to NULL. Instead of recomputing them while a user waits
+on /leaderboard, DatabaseManager reports the invalidated (guild, players) pairs
+here; the warmer coalesces them and refreshes each guild in one batch with
+DatabaseManager.refresh_guild_volatile_metrics off the interaction path, then
+re-ranks the guild's leaderboard snapshot so /stats pages are ready to read.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class MetricsWarmer:
+    """Coalesces metric invalidations and refreshes them in the background."""
+
+    def __init__(self, db, debounce_seconds: float = 2.0):
+        self.db = db
+        self.debounce_seconds = debounce_seconds
+        # guild_id -> player names to refresh (None = whole guild)
+        self._pending: Dict[int, Optional[Set[str]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the warmer loop on the running event loop (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.db.metrics_invalidated_callback = self.invalidate
+        self._task = asyncio.create_task(self._run())
+
+    def invalidate(self, guild_id: int, player_names: Optional[List[str]] = None):
+        """Queue players (or a whole guild) for a refresh. Safe to call from any thread."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._add_pending, guild_id, player_names)
+
+    def _add_pending(self, guild_id: int, player_names: Optional[List[str]]):
+        if player_names is None or (guild_id in self._pending and self._pending[guild_id] is None):
+            self._pending[guild_id] = None
+        else:
+            self._pending.setdefault(guild_id, set()).update(player_names)
+        self._wakeup.set()
+
+    async def _run(self):
+        logger.info("🚀 Metrics warmer started")
+
+        # Pick up metrics invalidated while the bot was down
+        for guild_id in await asyncio.to_thread(self.db.get_guilds_with_stale_metrics):
+            self._add_pending(guild_id, None)
+
+        while True:
+            await self._wakeup.wait()
+            # Let a burst of saves (e.g. a bulk scan) land before refreshing
+            await asyncio.sleep(self.debounce_seconds)
+
+            self._wakeup.clear()
+            pending, self._pending = self._pending, {}
+
+            for guild_id, player_names in pending.items():
+                try:
+                    names = sorted(player_names) if player_names is not None else None
+                    refreshed = await asyncio.to_thread(
+                        self.db.refresh_guild_volatile_metrics, guild_id, names
+                    )
+                    version = await asyncio.to_thread(self.db.refresh_leaderboard_snapshots, guild_id)
+                    logger.debug(f"Warmed metrics for {refreshed} players in guild {guild_id} (snapshot v{version})")
+                except Exception as e:
+                    logger.error(f"❌ Metrics warmer failed for guild {guild_id}: {e}")
+
+    def stop(self):
+        """Stop the warmer loop."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.db.metrics_invalidated_callback == self.invalidate:
+            self.db.metrics_invalidated_callback = None
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Versioned, online schema migrations.
+
+Each Migration in migrations.py has a version and a list of idempotent steps.
+The runner applies pending versions in order and records them in
+schema_version, so a deploy runs `python scripts/utilities/migrate.py` and only
+new versions do anything. Steps are written so the bot keeps serving while
+they run:
+- Sql / AddColumns: short DDL under lock_timeout; when a table lock isn't
+  granted in time (a long /stats query holds it) the step backs off and
+  retries instead of queueing every other query behind its ALTER
+- CreateIndex: CREATE INDEX CONCURRENTLY, rebuilding an index a previous
+  interrupted build left invalid
+- Backfill: walks a table in key order, batch_size keys per transaction, with
+  a pause between chunks, logging progress as it goes
+
+Every finished step and every backfill chunk is checkpointed in
+schema_migration_progress (a chunk in the same transaction as its writes), so
+an interrupted run resumes where it stopped. Databases migrated with the old
+one-off scripts are adopted: a pending migration whose applied_if probe is
+already true is recorded without running again.
+
+Usage:
+    runner = MigrationRunner(db)
+    runner.run()                  # everything pending
+    runner.status()               # [{'version', 'name', 'state', ...}, ...]
+    runner.pending_versions()     # [18, 19] - the bot refuses to start while this is non-empty
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.errors
+
+from .config import MIGRATION_BATCH_SIZE, MIGRATION_LOCK_TIMEOUT_MS, MIGRATION_THROTTLE_SECONDS
+
+# Session advisory lock held by the running migrator ('MKWS')
+MIGRATION_LOCK_KEY = 0x4D4B5753
+# DDL attempts before a step gives up on a lock (backoff doubles up to LOCK_RETRY_MAX_DELAY)
+LOCK_RETRIES = 8
+LOCK_RETRY_MAX_DELAY = 30.0
+# Seconds between backfill progress log lines
+PROGRESS_LOG_INTERVAL = 5.0
+
+SCHEMA_TABLES_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        duration_seconds NUMERIC(10,3),
+        adopted BOOLEAN NOT NULL DEFAULT FALSE
+    );
+    CREATE TABLE IF NOT EXISTS schema_migration_progress (
+        version INTEGER NOT NULL,
+        step VARCHAR(100) NOT NULL,
+        last_key BIGINT,
+        rows_done BIGINT NOT NULL DEFAULT 0,
+        completed_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (version, step)
+    );
+"""
+
+
+@dataclass(frozen=True)
+class Sql:
+    """Idempotent statements (CREATE ... IF NOT EXISTS, CREATE OR REPLACE) run in one transaction."""
+    name: str
+    sql: str
+
+
+@dataclass(frozen=True)
+class AddColumns:
+    """ADD COLUMN IF NOT EXISTS for each (column, definition); metadata-only with constant defaults."""
+    table: str
+    columns: Tuple[Tuple[str, str], ...]
+
+    @property
+    def name(self) -> str:
+        return f"{self.table} columns"
+
+
+@dataclass(frozen=True)
+class CreateIndex:
+    """CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS <name> ON <definition>."""
+    name: str
+    definition: str
+    unique: bool = False
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """Chunked data migration over the ordered (integer) keys of a table.
+
+    Each chunk is the next batch_size keys after the checkpoint. sql runs once
+    per chunk with %(first)s / %(last)s (inclusive key bounds) and %(keys)s;
+    apply(db, cursor, keys) can do the work in Python instead and returns the
+    rows it changed. apply must write through the cursor it is given (the
+    cursor-level DatabaseManager helpers, never the pooled methods that commit
+    on their own connection), or its writes won't commit with the checkpoint.
+    Both must be safe to repeat for a chunk.
+    """
+    name: str
+    table: str
+    key: str = 'id'
+    where: str = 'TRUE'
+    distinct: bool = False
+    sql: Optional[str] = None
+    apply: Optional[Callable] = None
+    batch_size: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema version. applied_if: SQL returning TRUE when an older script already made this change."""
+    version: int
+    name: str
+    steps: Tuple = field(default_factory=tuple)
+    applied_if: Optional[str] = None
+
+
+class MigrationRunner:
+    """Applies Migrations to the database behind a DatabaseManager."""
+
+    def __init__(self, db, migrations: Sequence[Migration] = None, batch_size: int = MIGRATION_BATCH_SIZE,
+                 throttle_seconds: float = MIGRATION_THROTTLE_SECONDS,
+                 lock_timeout_ms: int = MIGRATION_LOCK_TIMEOUT_MS):
+        if migrations is None:
+            from .migrations import MIGRATIONS
+            migrations = MIGRATIONS
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError(f"Migration versions must be unique and ascending: {versions}")
+
+        self.db = db
+        self.migrations = list(migrations)
+        self.batch_size = batch_size
+        self.throttle_seconds = throttle_seconds
+        self.lock_timeout_ms = lock_timeout_ms
+
+    # ==================== CONNECTION ====================
+
+    def _connect(self):
+        """Dedicated connection: no statement timeout (index builds and chunks may take a while)."""
+        params = dict(self.db.connection_params)
+        params['options'] = f"-c statement_timeout=0 -c lock_timeout={int(self.lock_timeout_ms)}"
+        params['application_name'] = 'mkw_migrate'
+        conn = psycopg2.connect(**params)
+        try:
+            # Session-level: held across the commits below until the connection closes
+            with conn, conn.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+                if not cursor.fetchone()[0]:
+                    raise RuntimeError("Another migration run holds the migration lock")
+                cursor.execute(SCHEMA_TABLES_SQL)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _with_lock_retries(self, conn, description: str, work: Callable):
+        """Run work(cursor) in a transaction, backing off while a table lock isn't granted."""
+        delay = 0.5
+        for attempt in range(1, LOCK_RETRIES + 1):
+            try:
+                with conn, conn.cursor() as cursor:
+                    return work(cursor)
+            except psycopg2.errors.LockNotAvailable:
+                if attempt == LOCK_RETRIES:
+                    raise
+                logging.warning(f"⚠️ {description}: table busy, retrying in {delay:.1f}s "
+                                f"(attempt {attempt}/{LOCK_RETRIES})")
+                time.sleep(delay)
+                delay = min(delay * 2, LOCK_RETRY_MAX_DELAY)
+
+    # ==================== BOOKKEEPING ====================
+
+    def _applied_versions(self, cursor) -> Dict[int, tuple]:
+        cursor.execute("SELECT version, name, applied_at, duration_seconds, adopted FROM schema_version")
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+
+    def _progress(self, cursor, version: int) -> Dict[str, tuple]:
+        cursor.execute("""
+            SELECT step, last_key, rows_done, completed_at
+            FROM schema_migration_progress WHERE version = %s
+        """, (version,))
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+
+    def _checkpoint(self, cursor, version: int, step: str, last_key=None, rows_done: int = 0,
+                    completed: bool = False) -> None:
+        cursor.execute("""
+            INSERT INTO schema_migration_progress (version, step, last_key, rows_done, completed_at, updated_at)
+            VALUES (%s, %s, %s, %s, CASE WHEN %s THEN CURRENT_TIMESTAMP END, CURRENT_TIMESTAMP)
+            ON CONFLICT (version, step) DO UPDATE SET
+                last_key = EXCLUDED.last_key,
+                rows_done = EXCLUDED.rows_done,
+                completed_at = EXCLUDED.completed_at,
+                updated_at = EXCLUDED.updated_at
+        """, (version, step, last_key, rows_done, completed))
+
+    def _record(self, cursor, migration: Migration, duration: Optional[float], adopted: bool) -> None:
+        cursor.execute("""
+            INSERT INTO schema_version (version, name, duration_seconds, adopted)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (version) DO NOTHING
+        """, (migration.version, migration.name, duration, adopted))
+
+    # ==================== STEPS ====================
+
+    def _run_sql(self, conn, migration: Migration, step: Sql) -> None:
+        def work(cursor):
+            cursor.execute(step.sql)
+            self._checkpoint(cursor, migration.version, step.name, completed=True)
+        self._with_lock_retries(conn, f"v{migration.version} {step.name}", work)
+
+    def _run_add_columns(self, conn, migration: Migration, step: AddColumns) -> None:
+        additions = ", ".join(f"ADD COLUMN IF NOT EXISTS {column} {definition}"
+                              for column, definition in step.columns)
+
+        def work(cursor):
+            cursor.execute(f"ALTER TABLE {step.table} {additions}")
+            self._checkpoint(cursor, migration.version, step.name, completed=True)
+        self._with_lock_retries(conn, f"v{migration.version} {step.name}", work)
+
+    def _run_create_index(self, conn, migration: Migration, step: CreateIndex) -> None:
+        # CONCURRENTLY can't run inside a transaction block
+        conn.autocommit = True
+        try:
+            self._build_index(conn, migration, step)
+        finally:
+            conn.autocommit = False
+
+    def _build_index(self, conn, migration: Migration, step: CreateIndex) -> None:
+        with conn.cursor() as cursor:
+            # An interrupted CONCURRENTLY build leaves an invalid index that IF NOT EXISTS would keep
+            cursor.execute("""
+                SELECT NOT i.indisvalid FROM pg_index i
+                WHERE i.indexrelid = to_regclass(%s)
+            """, (step.name,))
+            row = cursor.fetchone()
+            if row and row[0]:
+                logging.warning(f"⚠️ Rebuilding invalid index {step.name}")
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {step.name}")
+
+            # The build waits for transactions that predate it rather than failing on lock_timeout;
+            # it never blocks reads or writes while it does
+            cursor.execute("SET lock_timeout = 0")
+            try:
+                unique = 'UNIQUE ' if step.unique else ''
+                cursor.execute(f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {step.name} ON {step.definition}")
+            finally:
+                cursor.execute("RESET lock_timeout")
+            self._checkpoint(cursor, migration.version, step.name, completed=True)
+
+    def _chunk_keys_sql(self, step: Backfill, after) -> str:
+        select = f"SELECT DISTINCT {step.key}" if step.distinct else f"SELECT {step.key}"
+        lower = f" AND {step.key} > %(after)s" if after is not None else ""
+        return f"{select} FROM {step.table} WHERE ({step.where}){lower} ORDER BY {step.key} LIMIT %(limit)s"
+
+    def _remaining(self, cursor, step: Backfill, after) -> int:
+        counted = f"DISTINCT {step.key}" if step.distinct else "*"
+        lower = f" AND {step.key} > %(after)s" if after is not None else ""
+        cursor.execute(f"SELECT COUNT({counted}) FROM {step.table} WHERE ({step.where}){lower}", {'after': after})
+        return cursor.fetchone()[0]
+
+    def _run_backfill(self, conn, migration: Migration, step: Backfill, checkpoint: Optional[tuple]) -> None:
+        after, done = (checkpoint[0], checkpoint[1]) if checkpoint else (None, 0)
+        batch_size = step.batch_size or self.batch_size
+        label = f"v{migration.version} {step.name}"
+
+        with conn, conn.cursor() as cursor:
+            total = done + self._remaining(cursor, step, after)
+        if after is not None:
+            logging.info(f"🔄 {label}: resuming after key {after} ({done}/{total})")
+
+        changed = 0
+        last_log = time.monotonic()
+        while True:
+            def chunk(cursor):
+                cursor.execute(self._chunk_keys_sql(step, after), {'after': after, 'limit': batch_size})
+                keys = [row[0] for row in cursor.fetchall()]
+                if not keys:
+                    return keys, 0
+                if step.apply is not None:
+                    rows = step.apply(self.db, cursor, keys) or 0
+                else:
+                    cursor.execute(step.sql, {'first': keys[0], 'last': keys[-1], 'keys': keys})
+                    rows = max(cursor.rowcount, 0)
+                self._checkpoint(cursor, migration.version, step.name, keys[-1], done + len(keys))
+                return keys, rows
+
+            keys, rows = self._with_lock_retries(conn, label, chunk)
+            if not keys:
+                break
+            after = keys[-1]
+            done += len(keys)
+            changed += rows
+
+            if time.monotonic() - last_log >= PROGRESS_LOG_INTERVAL:
+                percent = done / total * 100 if total else 100.0
+                logging.info(f"🔄 {label}: {done}/{total} ({percent:.0f}%), {changed} rows changed")
+                last_log = time.monotonic()
+            if self.throttle_seconds > 0:
+                time.sleep(self.throttle_seconds)
+
+        with conn, conn.cursor() as cursor:
+            self._checkpoint(cursor, migration.version, step.name, after, done, completed=True)
+        logging.info(f"✅ {label}: {done} keys, {changed} rows changed")
+
+    def _run_step(self, conn, migration: Migration, step, checkpoint: Optional[tuple]) -> None:
+        if isinstance(step, Backfill):
+            self._run_backfill(conn, migration, step, checkpoint)
+        elif isinstance(step, CreateIndex):
+            self._run_create_index(conn, migration, step)
+        elif isinstance(step, AddColumns):
+            self._run_add_columns(conn, migration, step)
+        elif isinstance(step, Sql):
+            self._run_sql(conn, migration, step)
+        else:
+            raise TypeError(f"Unknown migration step {step!r}")
+
+    # ==================== RUNNING ====================
+
+    def _apply(self, conn, migration: Migration) -> bool:
+        """Run (or adopt) one migration. Returns False when it was adopted."""
+        with conn, conn.cursor() as cursor:
+            progress = self._progress(cursor, migration.version)
+            # Only adopt untouched versions: a half-run migration already matches its own probe
+            if not progress and migration.applied_if:
+                cursor.execute(f"SELECT {migration.applied_if}")
+                if cursor.fetchone()[0]:
+                    self._record(cursor, migration, None, adopted=True)
+                    logging.info(f"✅ v{migration.version} {migration.name}: already applied, adopted")
+                    return False
+
+        logging.info(f"🔄 Applying v{migration.version} {migration.name}")
+        started = time.monotonic()
+        for step in migration.steps:
+            checkpoint = progress.get(step.name)
+            if checkpoint and checkpoint[2] is not None:
+                continue
+            self._run_step(conn, migration, step, checkpoint)
+
+        duration = time.monotonic() - started
+        with conn, conn.cursor() as cursor:
+            self._record(cursor, migration, round(duration, 3), adopted=False)
+        logging.info(f"✅ v{migration.version} {migration.name} applied in {duration:.1f}s")
+        return True
+
+    def run(self, target: int = None) -> List[int]:
+        """Apply every pending migration up to target (all if None), in version order.
+
+        Returns:
+            Versions that ran (adopted versions are recorded but not returned)
+
+        Raises:
+            RuntimeError: If another run holds the migration lock
+            psycopg2.Error: If a step fails; completed steps and chunks stay checkpointed
+        """
+        conn = self._connect()
+        try:
+            with conn, conn.cursor() as cursor:
+                applied = self._applied_versions(cursor)
+            ran = []
+            for migration in self.migrations:
+                if target is not None and migration.version > target:
+                    break
+                if migration.version in applied:
+                    continue
+                try:
+                    if self._apply(conn, migration):
+                        ran.append(migration.version)
+                except Exception as e:
+                    logging.error(f"❌ Migration v{migration.version} {migration.name} failed: {e}")
+                    raise
+            return ran
+        finally:
+            conn.close()
+
+    def redo(self, version: int) -> None:
+        """Forget one applied migration and run all of its steps again (they are idempotent)."""
+        migration = next((m for m in self.migrations if m.version == version), None)
+        if migration is None:
+            raise ValueError(f"Unknown migration version {version}")
+
+        conn = self._connect()
+        try:
+            with conn, conn.cursor() as cursor:
+                cursor.execute("DELETE FROM schema_version WHERE version = %s", (version,))
+                cursor.execute("DELETE FROM schema_migration_progress WHERE version = %s", (version,))
+            # Without a probe the steps run even though their objects exist
+            self._apply(conn, Migration(migration.version, migration.name, migration.steps))
+        finally:
+            conn.close()
+
+    def pending_versions(self) -> List[int]:
+        """Versions not recorded in schema_version yet.
+
+        Reads through the bot's pool without the migration lock, so it's cheap
+        enough for a startup check and works while a migration is running.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+            applied = set()
+            if cursor.fetchone()[0]:
+                cursor.execute("SELECT version FROM schema_version")
+                applied = {row[0] for row in cursor.fetchall()}
+        return [migration.version for migration in self.migrations if migration.version not in applied]
+
+    def status(self) -> List[Dict]:
+        """Every known migration with its state: 'applied', 'adopted', 'in progress' or 'pending'."""
+        conn = self._connect()
+        try:
+            with conn, conn.cursor() as cursor:
+                applied = self._applied_versions(cursor)
+                cursor.execute("SELECT DISTINCT version FROM schema_migration_progress")
+                started = {row[0] for row in cursor.fetchall()}
+
+                statuses = []
+                for migration in self.migrations:
+                    entry = {'version': migration.version, 'name': migration.name}
+                    if migration.version in applied:
+                        _, applied_at, duration, adopted = applied[migration.version]
+                        entry.update(state='adopted' if adopted else 'applied', applied_at=applied_at,
+                                     duration_seconds=float(duration) if duration is not None else None)
+                    elif migration.version in started:
+                        progress = self._progress(cursor, migration.version)
+                        entry.update(state='in progress', steps={
+                            step: {'rows_done': rows_done, 'completed': completed_at is not None}
+                            for step, (_, rows_done, completed_at) in progress.items()
+                        })
+                    else:
+                        entry['state'] = 'pending'
+                    statuses.append(entry)
+                return statuses
+        finally:
+            conn.close()
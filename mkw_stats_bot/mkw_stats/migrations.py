@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+Schema versions applied by migration_runner.MigrationRunner, oldest first.
+
+Versions 1-19 replace the one-off scripts/utilities/migrate_*.py scripts, in
+the order they were deployed; their applied_if probes let a database those
+scripts already migrated be adopted instead of migrated again. Add a change
+by appending a Migration with the next version number: keep every step
+idempotent, put data changes in a Backfill (never one UPDATE over a whole
+table) and build indexes with CreateIndex. Never edit a version that has
+shipped; add another one.
+"""
+
+from psycopg2.extras import execute_values
+
+from .database import DatabaseManager
+from .guild_cache import CACHE_INVALIDATION_CHANNEL
+from .migration_runner import AddColumns, Backfill, CreateIndex, Migration, Sql
+from .war_fingerprint import resolved_name_map, war_fingerprint
+
+# Backfills that call DatabaseManager per guild checkpoint after this many guilds
+GUILD_BATCH_SIZE = 10
+
+# Player columns served from the roster cache; changes to anything else (war stats) don't notify
+ROSTER_COLUMNS = [
+    'player_name', 'added_by', 'team', 'nicknames', 'member_status', 'country_code',
+    'discord_user_id', 'display_name', 'discord_username', 'is_active', 'guild_id',
+]
+
+
+def _column_exists(table: str, column: str) -> str:
+    return f"""EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema()
+                         AND table_name = '{table}' AND column_name = '{column}')"""
+
+
+def _relation_exists(name: str) -> str:
+    return f"to_regclass('{name}') IS NOT NULL"
+
+
+def _trigger_exists(name: str) -> str:
+    return f"EXISTS (SELECT 1 FROM pg_trigger WHERE NOT tgisinternal AND tgname = '{name}')"
+
+
+def _all(*probes: str) -> str:
+    return " AND ".join(f"({probe})" for probe in probes)
+
+
+def _index_includes(index: str, column: str) -> str:
+    return f"""EXISTS (SELECT 1 FROM pg_attribute
+                       WHERE attrelid = to_regclass('{index}') AND attname = '{column}')"""
+
+
+# ==================== BACKFILLS ====================
+
+def _backfill_war_performances(db, cursor, war_ids) -> int:
+    """player_war_performances rows for a chunk of wars, from players_data (roster players only)."""
+    cursor.execute("""
+        SELECT id, guild_id, race_count, players_data->'results'
+        FROM wars WHERE id = ANY(%s)
+    """, (war_ids,))
+    wars_by_guild = {}
+    for war_id, guild_id, race_count, results in cursor.fetchall():
+        if isinstance(results, list) and results:
+            wars_by_guild.setdefault(guild_id, []).append((war_id, race_count, results))
+
+    rows = []
+    for guild_id, wars in wars_by_guild.items():
+        names = list(dict.fromkeys(r.get('name') for _, _, results in wars for r in results if r.get('name')))
+        matches = db._resolve_names(cursor, names, guild_id)
+        for war_id, race_count, results in wars:
+            for result in results:
+                match = matches.get(result.get('name'))
+                # Unresolved names are opponents or players no longer on the roster
+                if match:
+                    rows.append((match[0], war_id, result.get('score', 0),
+                                 result.get('races_played', race_count), result.get('war_participation', 1.0)))
+    if not rows:
+        return 0
+
+    execute_values(cursor, """
+        INSERT INTO player_war_performances (player_id, war_id, score, races_played, war_participation)
+        VALUES %s
+        ON CONFLICT (player_id, war_id) DO NOTHING
+    """, rows)
+    return len(rows)
+
+
+def _backfill_player_aliases(db, cursor, player_ids) -> int:
+    """player_aliases rows for a chunk of players; aliases are still ranked across the whole guild."""
+    cursor.execute(f"""
+        INSERT INTO player_aliases (guild_id, alias_casefold, player_id, kind)
+        SELECT a.guild_id, a.alias_casefold, a.player_id, a.kind
+        FROM ({DatabaseManager.PLAYER_ALIAS_ROWS_SQL}) AS a(guild_id, alias_casefold, player_id, kind)
+        WHERE a.player_id = ANY(%(player_ids)s)
+        ON CONFLICT (guild_id, alias_casefold) DO NOTHING
+    """, {'player_id': None, 'player_ids': list(player_ids)})
+    return cursor.rowcount
+
+
+def _backfill_player_aggregates(db, cursor, guild_ids) -> int:
+    """Running aggregates and cached stable metrics for a chunk of guilds."""
+    return sum(db._recompute_player_aggregates(cursor, guild_id) for guild_id in guild_ids)
+
+
+def _backfill_leaderboard_snapshots(db, cursor, guild_ids) -> int:
+    """Initial leaderboard snapshot for a chunk of guilds."""
+    for guild_id in guild_ids:
+        db._repair_guild_score_extremes(cursor, guild_id)
+        db._rebuild_leaderboard_snapshot(cursor, guild_id)
+    return len(guild_ids)
+
+
+def _backfill_war_fingerprints(db, cursor, war_ids) -> int:
+    """wars.fingerprint for a chunk of wars, resolving names against each guild's current roster."""
+    cursor.execute("""
+        SELECT id, guild_id, race_count, players_data->'results'
+        FROM wars WHERE id = ANY(%s)
+    """, (war_ids,))
+    wars_by_guild = {}
+    for war_id, guild_id, race_count, results in cursor.fetchall():
+        # Wars without results have nothing to compare, so they keep a NULL fingerprint
+        if isinstance(results, list) and results:
+            wars_by_guild.setdefault(guild_id, []).append((war_id, race_count, results))
+
+    fingerprints = []
+    for guild_id, wars in wars_by_guild.items():
+        names = list(dict.fromkeys(r.get('name') for _, _, results in wars for r in results if r.get('name')))
+        resolved = resolved_name_map(db._resolve_names(cursor, names, guild_id))
+        fingerprints.extend((war_id, war_fingerprint(results, race_count, resolved))
+                            for war_id, race_count, results in wars)
+    if not fingerprints:
+        return 0
+
+    execute_values(cursor, """
+        UPDATE wars w SET fingerprint = v.fingerprint
+        FROM (VALUES %s) AS v(id, fingerprint)
+        WHERE w.id = v.id
+    """, fingerprints)
+    return len(fingerprints)
+
+
+def _leaderboard_indexes():
+    """One partial index per DatabaseManager.LEADERBOARD_SORTS key for the keyset global leaderboard."""
+    return tuple(
+        CreateIndex(f"idx_players_lb_{sortby}", f"""
+            players (({sort_expr}) DESC, id DESC)
+            WHERE is_active = TRUE
+              AND war_count >= {int(DatabaseManager.GLOBAL_LEADERBOARD_MIN_WARS)}
+              AND {sort_filter}
+        """)
+        for sortby, (sort_expr, sort_filter) in DatabaseManager.LEADERBOARD_SORTS.items()
+    )
+
+
+_old_roster = ", ".join(f"OLD.{column}" for column in ROSTER_COLUMNS)
+_new_roster = ", ".join(f"NEW.{column}" for column in ROSTER_COLUMNS)
+
+
+MIGRATIONS = [
+    # What production had before any migration script: guild_configs, fractional war counts
+    Migration(1, 'baseline', (
+        Sql('guild_configs', """
+            CREATE TABLE IF NOT EXISTS guild_configs (
+                id SERIAL PRIMARY KEY,
+                guild_id BIGINT UNIQUE NOT NULL,
+                guild_name VARCHAR(100),
+                team_names JSONB DEFAULT '[]',
+                is_active BOOLEAN DEFAULT TRUE,
+                ocr_channel_id BIGINT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        AddColumns('players', (('total_team_differential', 'INTEGER DEFAULT 0'),)),
+        # Rewrites players, but only on a database older than fractional wars
+        Sql('war_count precision', """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM information_schema.columns
+                           WHERE table_schema = current_schema() AND table_name = 'players'
+                             AND column_name = 'war_count'
+                             AND (numeric_precision IS NULL OR numeric_precision < 8 OR numeric_scale < 3)) THEN
+                    ALTER TABLE players ALTER COLUMN war_count TYPE DECIMAL(8,3);
+                END IF;
+            END $$;
+        """),
+    ), applied_if=_all(
+        _relation_exists('guild_configs'),
+        _column_exists('players', 'total_team_differential'),
+        """EXISTS (SELECT 1 FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = 'players'
+                     AND column_name = 'war_count' AND numeric_precision >= 8 AND numeric_scale >= 3)""",
+    )),
+
+    Migration(2, 'member_status', (
+        AddColumns('players', (('member_status', "VARCHAR(10) DEFAULT 'member'"),)),
+        # NOT VALID + VALIDATE: the scan runs without blocking writes
+        Sql('check_member_status', """
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_member_status') THEN
+                    ALTER TABLE players ADD CONSTRAINT check_member_status
+                        CHECK (member_status IN ('member', 'trial', 'kicked')) NOT VALID;
+                END IF;
+            END $$;
+        """),
+        Sql('validate check_member_status', "ALTER TABLE players VALIDATE CONSTRAINT check_member_status"),
+        CreateIndex('idx_players_member_status', "players (member_status, guild_id)"),
+    ), applied_if=_relation_exists('idx_players_member_status')),
+
+    Migration(3, 'ally_status', (
+        Sql('check_member_status', """
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_member_status'
+                               AND pg_get_constraintdef(oid) LIKE '%''ally''%') THEN
+                    ALTER TABLE players DROP CONSTRAINT IF EXISTS check_member_status;
+                    ALTER TABLE players ADD CONSTRAINT check_member_status
+                        CHECK (member_status IN ('member', 'trial', 'ally', 'kicked')) NOT VALID;
+                END IF;
+            END $$;
+        """),
+        Sql('validate check_member_status', "ALTER TABLE players VALIDATE CONSTRAINT check_member_status"),
+    ), applied_if="""EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_member_status'
+                             AND pg_get_constraintdef(oid) LIKE '%''ally''%')"""),
+
+    Migration(4, 'discord_user_ids', (
+        AddColumns('players', (
+            ('discord_user_id', 'BIGINT'),
+            ('display_name', 'VARCHAR'),        # Auto-synced from Discord
+            ('discord_username', 'VARCHAR'),    # Auto-synced from Discord
+            ('last_role_sync', 'TIMESTAMP'),
+            ('country_code', 'CHAR(2)'),        # Flag display
+        )),
+        AddColumns('guild_configs', (
+            ('role_member_id', 'BIGINT'),
+            ('role_trial_id', 'BIGINT'),
+            ('role_ally_id', 'BIGINT'),
+        )),
+        CreateIndex('idx_players_discord_user', "players (discord_user_id, guild_id)"),
+        CreateIndex('idx_players_display_name', "players (display_name, guild_id)"),
+    ), applied_if=_all(_relation_exists('idx_players_display_name'),
+                       _column_exists('guild_configs', 'role_ally_id'))),
+
+    # Team name -> tag mapping, e.g. {"Let Him Cook": "COOK"}
+    Migration(5, 'team_tags', (
+        AddColumns('guild_configs', (('team_tags', "JSONB DEFAULT '{}'::jsonb"),)),
+    ), applied_if=_column_exists('guild_configs', 'team_tags')),
+
+    Migration(6, 'player_war_performances', (
+        Sql('player_war_performances', """
+            CREATE TABLE IF NOT EXISTS player_war_performances (
+                id SERIAL PRIMARY KEY,
+                player_id INTEGER NOT NULL REFERENCES players(id),
+                war_id INTEGER NOT NULL REFERENCES wars(id) ON DELETE CASCADE,
+                score INTEGER NOT NULL,
+                races_played INTEGER NOT NULL,
+                war_participation DECIMAL(4,3) NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(player_id, war_id)
+            )
+        """),
+        CreateIndex('idx_player_performances', "player_war_performances (player_id, war_id)"),
+        CreateIndex('idx_war_performances', "player_war_performances (war_id)"),
+        CreateIndex('idx_player_created', "player_war_performances (player_id, created_at DESC)"),
+        Backfill('performances from players_data', 'wars', apply=_backfill_war_performances),
+    ), applied_if=_relation_exists('player_war_performances')),
+
+    # Stable metrics are filled by the player_aggregates backfill (v10); volatile ones lazily
+    Migration(7, 'cached_metrics', (
+        AddColumns('players', (
+            ('score_stddev', 'DECIMAL(6,2) DEFAULT 0.0'),
+            ('consistency_score', 'DECIMAL(5,2)'),
+            ('highest_score', 'INTEGER DEFAULT 0'),
+            ('lowest_score', 'INTEGER DEFAULT 0'),
+            ('wins', 'INTEGER DEFAULT 0'),
+            ('losses', 'INTEGER DEFAULT 0'),
+            ('ties', 'INTEGER DEFAULT 0'),
+            ('win_percentage', 'DECIMAL(5,2) DEFAULT 0.0'),
+            ('avg10_score', 'DECIMAL(5,2)'),
+            ('form_score', 'DECIMAL(3,1)'),
+            ('clutch_factor', 'DECIMAL(4,2)'),
+            ('potential', 'DECIMAL(5,1)'),
+            ('hotstreak', 'DECIMAL(6,2)'),
+            ('cached_metrics_updated_at', 'TIMESTAMP WITH TIME ZONE'),
+        )),
+    ), applied_if=_column_exists('players', 'cached_metrics_updated_at')),
+
+    # Persistent OCR job queue, claimed with SELECT ... FOR UPDATE SKIP LOCKED
+    Migration(8, 'ocr_jobs', (
+        Sql('ocr_batches', """
+            CREATE TABLE IF NOT EXISTS ocr_batches (
+                id SERIAL PRIMARY KEY,
+                guild_id BIGINT NOT NULL,
+                user_id BIGINT NOT NULL,
+                channel_id BIGINT NOT NULL,
+                status_message_id BIGINT,
+                total_images INTEGER NOT NULL DEFAULT 0,
+                finalized_at TIMESTAMP WITH TIME ZONE,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        Sql('ocr_jobs', """
+            CREATE TABLE IF NOT EXISTS ocr_jobs (
+                id SERIAL PRIMARY KEY,
+                batch_id INTEGER NOT NULL REFERENCES ocr_batches(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                guild_id BIGINT NOT NULL,
+                discord_message_id BIGINT,
+                author_id BIGINT,
+                image_url TEXT NOT NULL,
+                image_filename VARCHAR(255),
+                message_timestamp TIMESTAMP WITH TIME ZONE,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending'
+                    CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
+                attempts INTEGER NOT NULL DEFAULT 0,
+                locked_by VARCHAR(100),
+                locked_at TIMESTAMP WITH TIME ZONE,
+                result JSONB,
+                error_message TEXT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        # Claim path only ever looks at unfinished jobs, keep that index small
+        CreateIndex('idx_ocr_jobs_claimable', "ocr_jobs (batch_id, position) WHERE status IN ('pending', 'processing')"),
+        CreateIndex('idx_ocr_jobs_batch', "ocr_jobs (batch_id)"),
+        CreateIndex('idx_ocr_batches_unfinalized', "ocr_batches (id) WHERE finalized_at IS NULL"),
+    ), applied_if=_relation_exists('ocr_jobs')),
+
+    Migration(9, 'player_aliases', (
+        Sql('player_aliases', """
+            CREATE TABLE IF NOT EXISTS player_aliases (
+                id SERIAL PRIMARY KEY,
+                guild_id BIGINT NOT NULL,
+                alias_casefold VARCHAR(100) NOT NULL,
+                player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+                kind VARCHAR(20) NOT NULL
+                    CHECK (kind IN ('name', 'nickname', 'display_name', 'username')),
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        CreateIndex('idx_player_aliases_guild_alias', "player_aliases (guild_id, alias_casefold)", unique=True),
+        CreateIndex('idx_player_aliases_player', "player_aliases (player_id)"),
+        Backfill('aliases from players', 'players', where='is_active = TRUE', apply=_backfill_player_aliases),
+    ), applied_if=_relation_exists('idx_player_aliases_guild_alias')),
+
+    # Running Σscore / Σscore² so stats writes update the stable metrics in constant time
+    Migration(10, 'player_aggregates', (
+        AddColumns('players', (
+            ('stat_war_rows', 'INTEGER NOT NULL DEFAULT 0'),
+            ('stat_score_sum', 'BIGINT NOT NULL DEFAULT 0'),
+            ('stat_score_sq_sum', 'BIGINT NOT NULL DEFAULT 0'),
+            ('stat_full_wars', 'INTEGER NOT NULL DEFAULT 0'),
+        )),
+        Backfill('aggregates per guild', 'players', key='guild_id', where='is_active = TRUE', distinct=True,
+                 apply=_backfill_player_aggregates, batch_size=GUILD_BATCH_SIZE),
+    ), applied_if=_column_exists('players', 'stat_full_wars')),
+
+    Migration(11, 'leaderboard_indexes', _leaderboard_indexes(),
+              applied_if=_all(*(_relation_exists(index.name) for index in _leaderboard_indexes()))),
+
+    Migration(12, 'leaderboard_snapshots', (
+        Sql('leaderboard_snapshots', """
+            CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+                guild_id BIGINT NOT NULL,
+                sort_key VARCHAR(20) NOT NULL,
+                rank INTEGER NOT NULL,
+                player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+                sort_value NUMERIC,
+                war_count DECIMAL(8,3),
+                average_score DECIMAL(5,2),
+                total_team_differential INTEGER,
+                last_war_date DATE,
+                PRIMARY KEY (guild_id, sort_key, rank)
+            );
+            CREATE TABLE IF NOT EXISTS leaderboard_snapshot_versions (
+                guild_id BIGINT PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                stale BOOLEAN NOT NULL DEFAULT TRUE,
+                refreshed_at TIMESTAMP WITH TIME ZONE
+            );
+        """),
+        CreateIndex('idx_leaderboard_snapshots_player', "leaderboard_snapshots (player_id)"),
+        Backfill('snapshots per guild', 'players', key='guild_id', where='is_active = TRUE AND guild_id > 0',
+                 distinct=True, apply=_backfill_leaderboard_snapshots, batch_size=GUILD_BATCH_SIZE),
+    ), applied_if=_relation_exists('leaderboard_snapshot_versions')),
+
+    # Keyset war lists without parsing players_data
+    Migration(13, 'war_summary', (
+        AddColumns('wars', (('player_count', 'INTEGER DEFAULT 0'),)),
+        Backfill('player_count', 'wars', sql="""
+            UPDATE wars
+            SET player_count = CASE
+                WHEN jsonb_typeof(players_data->'results') = 'array'
+                THEN jsonb_array_length(players_data->'results')
+                ELSE 0
+            END
+            WHERE id BETWEEN %(first)s AND %(last)s
+        """),
+        CreateIndex('idx_wars_guild_created', "wars (guild_id, created_at DESC, id DESC)"),
+    ), applied_if=_relation_exists('idx_wars_guild_created')),
+
+    # "Last N wars" reads straight off (player_id, war_created_at DESC)
+    Migration(14, 'performance_war_columns', (
+        AddColumns('player_war_performances', (
+            ('war_created_at', 'TIMESTAMP WITH TIME ZONE'),
+            ('guild_id', 'BIGINT'),
+            ('team_differential', 'INTEGER'),
+        )),
+        # Triggers first, so rows written during the backfill are already in sync
+        Sql('sync triggers', """
+            CREATE OR REPLACE FUNCTION pwp_copy_war_columns()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                SELECT created_at, guild_id, team_differential
+                INTO NEW.war_created_at, NEW.guild_id, NEW.team_differential
+                FROM wars WHERE id = NEW.war_id;
+                RETURN NEW;
+            END;
+            $$ language 'plpgsql';
+
+            DROP TRIGGER IF EXISTS pwp_copy_war_columns ON player_war_performances;
+            CREATE TRIGGER pwp_copy_war_columns
+                BEFORE INSERT OR UPDATE OF war_id ON player_war_performances
+                FOR EACH ROW
+                EXECUTE FUNCTION pwp_copy_war_columns();
+
+            CREATE OR REPLACE FUNCTION wars_sync_performance_columns()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE player_war_performances
+                SET war_created_at = NEW.created_at,
+                    guild_id = NEW.guild_id,
+                    team_differential = NEW.team_differential
+                WHERE war_id = NEW.id;
+                RETURN NEW;
+            END;
+            $$ language 'plpgsql';
+
+            DROP TRIGGER IF EXISTS wars_sync_performance_columns ON wars;
+            CREATE TRIGGER wars_sync_performance_columns
+                AFTER UPDATE OF created_at, guild_id, team_differential ON wars
+                FOR EACH ROW
+                EXECUTE FUNCTION wars_sync_performance_columns();
+        """),
+        Backfill('war columns', 'player_war_performances', sql="""
+            UPDATE player_war_performances pwp
+            SET war_created_at = w.created_at,
+                guild_id = w.guild_id,
+                team_differential = w.team_differential
+            FROM wars w
+            WHERE w.id = pwp.war_id
+              AND pwp.id BETWEEN %(first)s AND %(last)s
+              AND (pwp.war_created_at IS DISTINCT FROM w.created_at
+                   OR pwp.guild_id IS DISTINCT FROM w.guild_id
+                   OR pwp.team_differential IS DISTINCT FROM w.team_differential)
+        """),
+        CreateIndex('idx_pwp_player_recent', """
+            player_war_performances (player_id, war_created_at DESC)
+            INCLUDE (score, war_participation, team_differential)
+        """),
+    ), applied_if=_relation_exists('idx_pwp_player_recent')),
+
+    # One index per branch of DatabaseManager._resolve_names_ranked
+    Migration(15, 'name_resolution_indexes', (
+        CreateIndex('idx_players_guild_lower_name', "players (guild_id, LOWER(player_name))"),
+        CreateIndex('idx_players_guild_lower_display', "players (guild_id, LOWER(display_name))"),
+        CreateIndex('idx_players_guild_lower_username', "players (guild_id, LOWER(discord_username))"),
+        CreateIndex('idx_players_lower_nicknames', "players USING GIN ((LOWER(nicknames::text)::jsonb))"),
+    ), applied_if=_relation_exists('idx_players_lower_nicknames')),
+
+    # '<table>:<guild_id>' on CACHE_INVALIDATION_CHANNEL for guild_cache.py listeners
+    Migration(16, 'cache_invalidation', (
+        Sql('notify_cache_invalidation', f"""
+            CREATE OR REPLACE FUNCTION notify_cache_invalidation()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                IF TG_OP <> 'INSERT' THEN
+                    PERFORM pg_notify('{CACHE_INVALIDATION_CHANNEL}', TG_TABLE_NAME || ':' || OLD.guild_id);
+                END IF;
+                IF TG_OP <> 'DELETE' THEN
+                    PERFORM pg_notify('{CACHE_INVALIDATION_CHANNEL}', TG_TABLE_NAME || ':' || NEW.guild_id);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ language 'plpgsql';
+        """),
+        Sql('cache invalidation triggers', f"""
+            DROP TRIGGER IF EXISTS guild_configs_cache_invalidation ON guild_configs;
+            CREATE TRIGGER guild_configs_cache_invalidation
+                AFTER INSERT OR UPDATE OR DELETE ON guild_configs
+                FOR EACH ROW
+                EXECUTE FUNCTION notify_cache_invalidation();
+
+            DROP TRIGGER IF EXISTS players_cache_invalidation_write ON players;
+            CREATE TRIGGER players_cache_invalidation_write
+                AFTER INSERT OR DELETE ON players
+                FOR EACH ROW
+                EXECUTE FUNCTION notify_cache_invalidation();
+
+            DROP TRIGGER IF EXISTS players_cache_invalidation_update ON players;
+            CREATE TRIGGER players_cache_invalidation_update
+                AFTER UPDATE ON players
+                FOR EACH ROW
+                WHEN (({_old_roster}) IS DISTINCT FROM ({_new_roster}))
+                EXECUTE FUNCTION notify_cache_invalidation();
+        """),
+    ), applied_if=_all(_trigger_exists('guild_configs_cache_invalidation'),
+                       _trigger_exists('players_cache_invalidation_update'))),
+
+    # Web dashboard review sessions (the dashboard API also creates these on startup)
+    Migration(17, 'dashboard_tables', (
+        Sql('bulk_scan_sessions', """
+            CREATE TABLE IF NOT EXISTS bulk_scan_sessions (
+                id SERIAL PRIMARY KEY,
+                token UUID UNIQUE NOT NULL DEFAULT gen_random_uuid(),
+                guild_id BIGINT NOT NULL,
+                created_by_user_id BIGINT NOT NULL,
+                status VARCHAR(20) DEFAULT 'pending',
+                total_images INTEGER DEFAULT 0,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP WITH TIME ZONE DEFAULT (CURRENT_TIMESTAMP + INTERVAL '24 hours'),
+                completed_at TIMESTAMP WITH TIME ZONE
+            )
+        """),
+        Sql('bulk_scan_results', """
+            CREATE TABLE IF NOT EXISTS bulk_scan_results (
+                id SERIAL PRIMARY KEY,
+                session_id INTEGER REFERENCES bulk_scan_sessions(id) ON DELETE CASCADE,
+                image_filename VARCHAR(255),
+                image_url TEXT,
+                detected_players JSONB NOT NULL,
+                review_status VARCHAR(20) DEFAULT 'pending',
+                corrected_players JSONB,
+                race_count INTEGER DEFAULT 12,
+                message_timestamp TIMESTAMP WITH TIME ZONE,
+                discord_message_id BIGINT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                reviewed_at TIMESTAMP WITH TIME ZONE
+            )
+        """),
+        Sql('user_sessions', """
+            CREATE TABLE IF NOT EXISTS user_sessions (
+                id SERIAL PRIMARY KEY,
+                discord_user_id BIGINT NOT NULL,
+                discord_username VARCHAR(100),
+                discord_avatar VARCHAR(255),
+                session_token UUID UNIQUE NOT NULL DEFAULT gen_random_uuid(),
+                access_token_encrypted TEXT,
+                refresh_token_encrypted TEXT,
+                guild_permissions JSONB DEFAULT '{}',
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP WITH TIME ZONE DEFAULT (CURRENT_TIMESTAMP + INTERVAL '7 days'),
+                last_active_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        CreateIndex('idx_bulk_sessions_token', "bulk_scan_sessions (token)"),
+        CreateIndex('idx_bulk_sessions_guild', "bulk_scan_sessions (guild_id)"),
+        CreateIndex('idx_bulk_sessions_status', "bulk_scan_sessions (status)"),
+        CreateIndex('idx_bulk_results_session', "bulk_scan_results (session_id)"),
+        CreateIndex('idx_bulk_results_status', "bulk_scan_results (review_status)"),
+        CreateIndex('idx_user_sessions_discord_id', "user_sessions (discord_user_id)"),
+        CreateIndex('idx_user_sessions_token', "user_sessions (session_token)"),
+    ), applied_if=_relation_exists('user_sessions')),
+
+    Migration(18, 'bulk_scan_failures', (
+        Sql('bulk_scan_failures', """
+            CREATE TABLE IF NOT EXISTS bulk_scan_failures (
+                id SERIAL PRIMARY KEY,
+                session_id INTEGER REFERENCES bulk_scan_sessions(id) ON DELETE CASCADE,
+                image_filename VARCHAR(255),
+                image_url TEXT,
+                error_message TEXT,
+                message_timestamp TIMESTAMP WITH TIME ZONE,
+                discord_message_id BIGINT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """),
+        CreateIndex('idx_bulk_failures_session', "bulk_scan_failures (session_id)"),
+    ), applied_if=_relation_exists('bulk_scan_failures')),
+
+    # Content fingerprints for duplicate war detection (war_fingerprint.py)
+    Migration(19, 'war_fingerprints', (
+        AddColumns('wars', (('fingerprint', 'VARCHAR(64)'),)),
+        Backfill('fingerprints', 'wars', where='fingerprint IS NULL', apply=_backfill_war_fingerprints),
+        CreateIndex('idx_wars_guild_fingerprint', "wars (guild_id, fingerprint, created_at DESC)"),
+    ), applied_if=_relation_exists('idx_wars_guild_fingerprint')),
+
+    # idx_pwp_player_recent also covering war_id and races_played, so a player's recent
+    # wars are an index-only scan. The new index is built alongside and then takes over
+    # the old name, so v14's probe still holds.
+    Migration(20, 'covering_recent_performances', (
+        CreateIndex('idx_pwp_player_recent_covering', """
+            player_war_performances (player_id, war_created_at DESC)
+            INCLUDE (score, war_participation, team_differential, war_id, races_played)
+        """),
+        Sql('replace idx_pwp_player_recent', """
+            DO $$
+            BEGIN
+                IF to_regclass('idx_pwp_player_recent_covering') IS NOT NULL THEN
+                    DROP INDEX IF EXISTS idx_pwp_player_recent;
+                    ALTER INDEX idx_pwp_player_recent_covering RENAME TO idx_pwp_player_recent;
+                END IF;
+            END $$;
+        """),
+    ), applied_if=_index_includes('idx_pwp_player_recent', 'races_played')),
+]
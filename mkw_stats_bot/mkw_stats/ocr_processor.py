@@ -1184,8 +1184,31 @@ class OCRProcessor:
         
         return metadata
     
-    def create_debug_overlay(self, image_path: str) -> str:
-        """Create debug overlay showing OCR detection results."""
+    def create_debug_overlay(self, image_path: str, ocr_result: Dict = None) -> str:
+        """
+        Create debug overlay showing OCR detection results.
+
+        Pass the ocr_result from an earlier perform_ocr_on_file call to draw from
+        those cached boxes; OCR is only re-run when no result is given.
+        """
+        try:
+            if ocr_result is None:
+                # No cached result - process and get OCR results for visualization
+                ocr_result = self.perform_ocr_on_file(image_path)
+            
+            return self.render_debug_overlay(image_path, ocr_result)
+            
+        except Exception as e:
+            logging.error(f"❌ Error creating debug overlay: {e}")
+            return None
+    
+    def render_debug_overlay(self, image_path: str, ocr_result: Dict) -> str:
+        """
+        Draw the crop region and OCR boxes from an existing OCR result onto the original image.
+
+        Pure image drawing (no OCR), safe to run in a worker thread. Boxes are
+        relative to the crop, so they are shifted by the result's crop_coords.
+        """
         try:
             logging.info("🎨 Creating debug visualization...")
             
@@ -1194,30 +1217,30 @@ class OCRProcessor:
             img_width, img_height = image.size
             draw = ImageDraw.Draw(image)
             
-            # Draw crop region using format detection
-            table_format = self.detect_table_format(img_width, img_height)
-            crop_coords = TABLE_FORMATS[table_format]['crop_coords']
-            
-            start_x = crop_coords['start_x']
-            start_y = crop_coords['start_y']
-            end_x = crop_coords['end_x']
-            end_y = img_height
+            # Use the crop the OCR actually ran on, fall back to format detection
+            crop_coords = ocr_result.get("crop_coords") if ocr_result else None
+            if crop_coords and any(crop_coords):
+                start_x, start_y, end_x, end_y = crop_coords
+            else:
+                table_format = self.detect_table_format(img_width, img_height)
+                format_coords = TABLE_FORMATS[table_format]['crop_coords']
+                start_x = format_coords['start_x']
+                start_y = format_coords['start_y']
+                end_x = format_coords['end_x']
+                end_y = img_height
             
             # Draw ROI boundaries
             draw.rectangle([start_x, start_y, end_x, end_y], outline="red", width=3)
-            draw.text((start_x, start_y-20), "OCR REGION", fill="red")
-            
-            # Process and get OCR results for visualization
-            ocr_result = self.perform_ocr_on_file(image_path)
+            draw.text((start_x, max(0, start_y-20)), "OCR REGION", fill="red")
             
-            if ocr_result.get("success") and ocr_result.get("results"):
+            if ocr_result and ocr_result.get("success") and ocr_result.get("results"):
                 for i, result in enumerate(ocr_result["results"]):
                     text = result.get("text", "")
                     bbox = result.get("bbox", [])
                     
-                    if bbox and len(bbox) >= 4:
+                    if bbox is not None and len(bbox) >= 4:
                         # Draw bounding box (adjust coordinates)
-                        if isinstance(bbox[0], list):
+                        if isinstance(bbox[0], (list, tuple)):
                             # Polygon format
                             x_coords = [point[0] for point in bbox]
                             y_coords = [point[1] for point in bbox]
@@ -1241,7 +1264,8 @@ class OCRProcessor:
                         draw.text((box_x1, max(0, box_y1-20)), text[:10], fill=color)
             
             # Save visualization
-            output_path = image_path.replace('.png', '_debug.png').replace('.jpg', '_debug.jpg')
+            root, _ = os.path.splitext(image_path)
+            output_path = f"{root}_debug.png"
             image.save(output_path)
             logging.info(f"📊 Debug overlay saved: {output_path}")
             return output_path
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Standalone OCR worker service for MKW Stats Bot.
+
+Runs PaddleOCR in its own process behind a small HTTP API so heavy bulk scans
+don't compete with the discord.py event loop. Start one or more workers and
+point the bot at them with OCR_WORKER_URLS; the bot talks to them through
+ocr_worker_client.py.
+
+Endpoints:
+    GET  /health        - Liveness check
+    POST /ocr/process   - Full OCR + Mario Kart parsing (same result as OCRProcessor.process_image)
+    POST /ocr/raw       - Raw OCR text and boxes (same result as OCRProcessor.perform_ocr_on_file),
+                          plus parsed_results from the joined text when guild_id is given
+
+Both POST endpoints take the image bytes as the request body and guild_id,
+user_id and message_timestamp (ISO 8601) as query parameters.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+from datetime import datetime
+from typing import Dict
+
+from aiohttp import web
+
+from . import config
+from .database import DatabaseManager
+from .ocr_processor import OCRProcessor
+from .logging_config import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Worker-local file paths in OCR results mean nothing to the caller
+LOCAL_PATH_KEYS = ('cropped_path', 'visual_path')
+
+
+def _json_default(value):
+    """Serialize numpy scalars/arrays and datetimes that PaddleOCR results may contain."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_response(data: Dict, status: int = 200) -> web.Response:
+    return web.json_response(data, status=status, dumps=lambda obj: json.dumps(obj, default=_json_default))
+
+
+class OCRWorker:
+    """HTTP front-end around a single OCRProcessor instance."""
+
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.db = DatabaseManager()
+        self.ocr = OCRProcessor(db_manager=self.db)
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(client_max_size=20 * 1024 * 1024, middlewares=[self._auth_middleware])
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_post('/ocr/process', self.handle_process)
+        app.router.add_post('/ocr/raw', self.handle_raw)
+        return app
+
+    @web.middleware
+    async def _auth_middleware(self, request: web.Request, handler):
+        """Require the shared X-API-Key on everything but /health."""
+        if self.api_key and request.path != '/health':
+            if request.headers.get('X-API-Key') != self.api_key:
+                return _json_response({'success': False, 'error': 'Unauthorized'}, status=401)
+        return await handler(request)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return _json_response({'status': 'ok', 'worker_id': self.worker_id})
+
+    async def _save_request_image(self, request: web.Request) -> str:
+        """Write the request body to a temp file and return its path."""
+        image_bytes = await request.read()
+        if not image_bytes:
+            raise web.HTTPBadRequest(text='Empty image body')
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as temp_file:
+            temp_file.write(image_bytes)
+            return temp_file.name
+
+    @staticmethod
+    def _cleanup(*paths: str):
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    async def handle_process(self, request: web.Request) -> web.Response:
+        """Run full OCR + parsing on the posted image."""
+        guild_id = int(request.query.get('guild_id', 0))
+        user_id = int(request.query.get('user_id', 0))
+        timestamp = request.query.get('message_timestamp')
+        message_timestamp = datetime.fromisoformat(timestamp) if timestamp else None
+
+        image_path = await self._save_request_image(request)
+        try:
+            result = await self.ocr.process_image_async(image_path, guild_id, user_id, message_timestamp)
+            result['worker_id'] = self.worker_id
+            return _json_response(result)
+        except Exception as e:
+            logger.error(f"❌ OCR worker processing error: {e}")
+            return _json_response({'success': False, 'error': str(e), 'results': []}, status=500)
+        finally:
+            # process_image crops next to the input file
+            self._cleanup(image_path, *self._derived_paths(image_path))
+
+    async def handle_raw(self, request: web.Request) -> web.Response:
+        """Run raw OCR (text + bounding boxes) on the posted image."""
+        guild_id = request.query.get('guild_id')
+
+        image_path = await self._save_request_image(request)
+        try:
+            result = await asyncio.get_event_loop().run_in_executor(
+                None, self.ocr.perform_ocr_on_file, image_path
+            )
+            for key in LOCAL_PATH_KEYS:
+                result.pop(key, None)
+
+            # Parse here too so the bot never has to load OCRProcessor itself
+            if guild_id is not None and result.get('success') and result.get('text', '').strip():
+                extracted_texts = [{'text': result['text'], 'confidence': 0.9}]
+                result['parsed_results'] = self.ocr._parse_mario_kart_results(extracted_texts, int(guild_id))
+            result['worker_id'] = self.worker_id
+            return _json_response(result)
+        except Exception as e:
+            logger.error(f"❌ OCR worker raw OCR error: {e}")
+            return _json_response({'success': False, 'error': str(e)}, status=500)
+        finally:
+            self._cleanup(image_path, *self._derived_paths(image_path))
+
+    @staticmethod
+    def _derived_paths(image_path: str):
+        """Paths of the crop/visualization files perform_ocr_on_file writes."""
+        return (
+            image_path.replace('.png', '_cropped.png'),
+            image_path.replace('.png', '_visual.png'),
+        )
+
+
+def main():
+    """Run the OCR worker service."""
+    setup_logging()
+
+    worker = OCRWorker(api_key=config.OCR_WORKER_API_KEY)
+    if not config.OCR_WORKER_API_KEY:
+        logger.warning("⚠️ OCR_WORKER_API_KEY not set - worker accepts unauthenticated requests")
+
+    logger.info(f"🚀 OCR worker {worker.worker_id} listening on {config.OCR_WORKER_HOST}:{config.OCR_WORKER_PORT}")
+    web.run_app(worker.create_app(), host=config.OCR_WORKER_HOST, port=config.OCR_WORKER_PORT, print=None)
+
+
+if __name__ == "__main__":
+    main()
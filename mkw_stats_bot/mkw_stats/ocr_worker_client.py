@@ -0,0 +1,113 @@
+"""
+OCR worker client for the MKW Stats Bot.
+Sends images to standalone OCR worker services (see ocr_worker.py).
+"""
+import aiohttp
+import itertools
+import logging
+from typing import Dict, Optional
+
+from .config import OCR_WORKER_URLS, OCR_WORKER_API_KEY, OCR_WORKER_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class OCRWorkerClient:
+    """Client for communicating with OCR worker services."""
+
+    def __init__(self):
+        self.worker_urls = OCR_WORKER_URLS
+        self.api_key = OCR_WORKER_API_KEY
+        self.timeout = OCR_WORKER_TIMEOUT
+        # Round-robin across workers for horizontal scaling
+        self._next_worker = itertools.cycle(self.worker_urls) if self.worker_urls else None
+
+    def is_enabled(self) -> bool:
+        """Check if at least one OCR worker is configured."""
+        return bool(self.worker_urls)
+
+    def _get_headers(self) -> Dict[str, str]:
+        """Get headers for worker requests."""
+        headers = {"Content-Type": "application/octet-stream"}
+        if self.api_key:
+            headers["X-API-Key"] = self.api_key
+        return headers
+
+    async def _post_image(self, path: str, image_path: str, params: Dict) -> Optional[Dict]:
+        """
+        Post an image to the next worker, trying each configured worker once.
+
+        Returns:
+            The worker's JSON result, or None if no worker could process it
+        """
+        if not self.is_enabled():
+            return None
+
+        with open(image_path, 'rb') as image_file:
+            image_bytes = image_file.read()
+
+        for _ in range(len(self.worker_urls)):
+            worker_url = next(self._next_worker)
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(
+                        f"{worker_url}{path}",
+                        data=image_bytes,
+                        params=params,
+                        headers=self._get_headers(),
+                        timeout=aiohttp.ClientTimeout(total=self.timeout)
+                    ) as response:
+                        if response.status == 200:
+                            return await response.json()
+                        error_text = await response.text()
+                        logger.error(f"OCR worker {worker_url} returned {response.status} - {error_text}")
+            except Exception as e:
+                logger.error(f"OCR worker {worker_url} request failed: {e}")
+
+        return None
+
+    async def process_image(self, image_path: str, guild_id: int, user_id: int,
+                            message_timestamp=None) -> Optional[Dict]:
+        """
+        Run full OCR + result parsing on a worker.
+
+        Returns:
+            Same dict as OCRProcessor.process_image, or None if no worker is reachable
+        """
+        params = {"guild_id": str(guild_id), "user_id": str(user_id or 0)}
+        if message_timestamp:
+            params["message_timestamp"] = message_timestamp.isoformat()
+        return await self._post_image("/ocr/process", image_path, params)
+
+    async def perform_ocr(self, image_path: str, guild_id: int = None) -> Optional[Dict]:
+        """
+        Run raw OCR on a worker.
+
+        Args:
+            guild_id: If given, the worker also parses the joined text into parsed_results
+
+        Returns:
+            Same dict as OCRProcessor.perform_ocr_on_file (without local file paths),
+            or None if no worker is reachable
+        """
+        params = {"guild_id": str(guild_id)} if guild_id is not None else {}
+        return await self._post_image("/ocr/raw", image_path, params)
+
+    async def check_health(self) -> bool:
+        """Check if any OCR worker is reachable."""
+        for worker_url in self.worker_urls:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(
+                        f"{worker_url}/health",
+                        timeout=aiohttp.ClientTimeout(total=5)
+                    ) as response:
+                        if response.status == 200:
+                            return True
+            except Exception as e:
+                logger.error(f"OCR worker health check failed for {worker_url}: {e}")
+        return False
+
+
+# Global client instance
+ocr_worker_client = OCRWorkerClient()
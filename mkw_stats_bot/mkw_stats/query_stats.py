@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Per-statement query instrumentation for DatabaseManager.
+
+get_connection() hands out connections whose cursors are InstrumentedCursors
+and records the calling DatabaseManager method as the current call site. Every
+execute()/executemany() is then:
+- counted and timed into a latency histogram per call site
+- logged (SQL only, parameters redacted to their types) when slower than a threshold
+- optionally explained: a sample of slow SELECTs is re-run under
+  EXPLAIN (ANALYZE, BUFFERS) inside a savepoint and the plan kept for review
+- added to the active QueryScope, if any; the bot opens one per slash
+  command, so a command's query count (and N+1 regressions) shows up in its logs
+
+AsyncDatabaseManager copies the caller's context into its threads, so scopes
+follow commands onto the database threads.
+"""
+
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import psycopg2.extensions
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current_scope: contextvars.ContextVar = contextvars.ContextVar('query_scope', default=None)
+
+
+def _normalize_sql(sql, limit: int = 500) -> str:
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    sql = re.sub(r'\s+', ' ', str(sql)).strip()
+    return sql if len(sql) <= limit else sql[:limit] + '…'
+
+
+def _redact(value) -> str:
+    """Describe a parameter without revealing it (names, IDs and scores stay out of logs)."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (list, tuple)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_params(params) -> str:
+    if params is None:
+        return '()'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f"{key}: {_redact(value)}" for key, value in params.items()) + '}'
+    if isinstance(params, (list, tuple)):
+        return '(' + ', '.join(_redact(value) for value in params) + ')'
+    return _redact(params)
+
+
+@dataclass
+class SiteQueryStats:
+    """Statement totals and latency histogram for one call site."""
+    statements: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def add(self, elapsed_ms: float, failed: bool):
+        self.statements += 1
+        self.errors += failed
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile (None if past the last bound)."""
+        target = fraction * self.statements
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+
+class QueryScope:
+    """Query counts for one unit of work (a slash command, a background batch)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queries = 0
+        self.total_ms = 0.0
+        self.by_site: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, site: str, elapsed_ms: float):
+        with self._lock:
+            self.queries += 1
+            self.total_ms += elapsed_ms
+            self.by_site[site] += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'name': self.name,
+                'queries': self.queries,
+                'total_ms': round(self.total_ms, 2),
+                'by_site': dict(self.by_site.most_common()),
+            }
+
+
+@contextmanager
+def query_scope(name: str):
+    """Count every statement issued in this context (and threads it's copied into) under name."""
+    scope = QueryScope(name)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def begin_query_scope(name: str) -> QueryScope:
+    """Start a scope for the rest of the current task, when a with-block can't wrap the work."""
+    scope = QueryScope(name)
+    _current_scope.set(scope)
+    return scope
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """Cursor that reports every statement to its QueryRecorder."""
+
+    recorder: 'QueryRecorder' = None
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute(query, vars)
+            failed = False
+            return result
+        finally:
+            self.recorder.record(self, query, vars, (time.perf_counter() - started) * 1000, failed)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().executemany(query, vars_list)
+            failed = False
+            return result
+        finally:
+            self.recorder.record(self, query, None, (time.perf_counter() - started) * 1000, failed)
+
+
+class QueryRecorder:
+    """Process-wide statement statistics, slow-query log and EXPLAIN samples."""
+
+    def __init__(self, slow_threshold_ms: float = 200.0, explain_sample_rate: float = 0.0,
+                 max_samples: int = 20, max_scopes: int = 50):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sites: Dict[str, SiteQueryStats] = {}
+        self._slow_queries = 0
+        self._explain_samples = deque(maxlen=max_samples)
+        self._recent_scopes = deque(maxlen=max_scopes)
+
+        # Cursor class bound to this recorder, for connection.cursor_factory
+        self.cursor_factory = type('InstrumentedCursor', (InstrumentedCursor,), {'recorder': self})
+
+    @contextmanager
+    def site(self, name: str):
+        """Attribute statements run by this thread to name until the block exits."""
+        stack = getattr(self._local, 'sites', None)
+        if stack is None:
+            stack = self._local.sites = []
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def _current_site(self) -> str:
+        stack = getattr(self._local, 'sites', None)
+        return stack[-1] if stack else 'unknown'
+
+    def record(self, cursor, query, params, elapsed_ms: float, failed: bool):
+        site = self._current_site()
+        with self._lock:
+            stats = self._sites.get(site)
+            if stats is None:
+                stats = self._sites[site] = SiteQueryStats()
+            stats.add(elapsed_ms, failed)
+
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.add(site, elapsed_ms)
+
+        if elapsed_ms < self.slow_threshold_ms:
+            return
+
+        with self._lock:
+            self._slow_queries += 1
+        sql = _normalize_sql(query)
+        logging.warning(f"🐢 Slow query in {site}: {elapsed_ms:.1f}ms | {sql} | params {redact_params(params)}")
+
+        if not failed and self.explain_sample_rate and random.random() < self.explain_sample_rate:
+            self._explain(cursor, site, query, params, elapsed_ms)
+
+    def _explain(self, cursor, site: str, query, params, elapsed_ms: float):
+        """Re-run a slow SELECT under EXPLAIN (ANALYZE, BUFFERS) without disturbing the caller's transaction."""
+        text = query.decode('utf-8', 'replace') if isinstance(query, bytes) else str(query)
+        # ANALYZE executes the statement again, so only ever sample reads
+        if not text.lstrip().upper().startswith('SELECT'):
+            return
+
+        conn = cursor.connection
+        # Plain cursor: the sample itself must not be recorded or explained
+        explain_cursor = psycopg2.extensions.cursor(conn)
+        savepoint = not conn.autocommit
+        try:
+            if savepoint:
+                explain_cursor.execute("SAVEPOINT query_stats_explain")
+            explain_cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + text, params)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            if savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+        except Exception as e:
+            if savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+            logging.debug(f"EXPLAIN sample failed for {site}: {e}")
+            return
+        finally:
+            explain_cursor.close()
+
+        with self._lock:
+            self._explain_samples.append({
+                'site': site,
+                'elapsed_ms': round(elapsed_ms, 2),
+                'sql': _normalize_sql(query),
+                'plan': plan,
+                'captured_at': time.time(),
+            })
+        logging.info(f"🔬 EXPLAIN sample for {site}:\n{plan}")
+
+    def finish_scope(self, scope: QueryScope) -> Dict:
+        """Keep a finished scope's summary for stats() and return it."""
+        summary = scope.summary()
+        with self._lock:
+            self._recent_scopes.append(summary)
+        return summary
+
+    def stats(self) -> Dict:
+        """Per-site counts, latency histograms and percentiles, plus slow-query and scope history."""
+        with self._lock:
+            return {
+                'slow_threshold_ms': self.slow_threshold_ms,
+                'slow_queries': self._slow_queries,
+                'bucket_bounds_ms': list(LATENCY_BUCKETS_MS),
+                'sites': {
+                    site: {
+                        'statements': s.statements,
+                        'errors': s.errors,
+                        'avg_ms': round(s.total_ms / s.statements, 2) if s.statements else 0.0,
+                        'p50_ms': s.percentile(0.5),
+                        'p95_ms': s.percentile(0.95),
+                        'max_ms': round(s.max_ms, 2),
+                        'histogram': list(s.buckets),
+                    }
+                    for site, s in sorted(self._sites.items(), key=lambda item: -item[1].total_ms)
+                },
+                'explain_samples': list(self._explain_samples),
+                'recent_scopes': list(self._recent_scopes),
+            }
+
+    def reset(self):
+        """Clear all counters and samples."""
+        with self._lock:
+            self._sites.clear()
+            self._slow_queries = 0
+            self._explain_samples.clear()
+            self._recent_scopes.clear()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing for DatabaseManager.
+
+With DATABASE_READ_URL set, DatabaseManager opens a second pool on the replica
+and read-only methods run there instead of on the primary that takes war writes.
+A method is read-only when it is decorated with @read_only or listed in the
+class's REPLICA_READ_METHODS (applied by @route_reads). Everything else, and any
+read-only method called from inside another DatabaseManager method, stays on
+the primary, so a write never acts on what it read from a lagging replica.
+
+A routed read still goes to the primary when:
+- the replica is lagging more than max_lag_seconds (checked at most every
+  lag_check_interval seconds, by whichever thread routes a read first)
+- the replica is unreachable (it is retried after the next lag check interval)
+- the read's guild saved or removed a war in the last pin_seconds, so the rest
+  of that interaction (and the /stats right after it) reads its own writes
+
+A replica that is not in recovery (a standalone copy, e.g. a second local
+Postgres in tests) is treated as having no lag.
+"""
+
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .db_pool import InstrumentedConnectionPool
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class ReplicaRouter:
+    """Replica pool plus the lag, availability and pinning checks that decide each read's pool."""
+
+    def __init__(self, connection_params: Dict, minconn: int, maxconn: int,
+                 acquire_timeout: float = 10.0, leak_threshold: float = 60.0,
+                 max_lag_seconds: float = 5.0, lag_check_interval: float = 5.0,
+                 pin_seconds: float = 10.0):
+        self.pool = InstrumentedConnectionPool(
+            minconn, maxconn, acquire_timeout=acquire_timeout,
+            leak_threshold=leak_threshold, **connection_params
+        )
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.pin_seconds = pin_seconds
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._pinned_until: Dict[int, float] = {}
+
+        self._lag_seconds: Optional[float] = None
+        self._available = True
+        self._next_check = 0.0
+
+        self._replica_reads = 0
+        self._fallbacks = {'lagging': 0, 'unavailable': 0, 'pinned': 0}
+
+    # ==================== ROUTING ====================
+
+    @property
+    def routing(self) -> Optional[bool]:
+        """True/False while this thread runs a routed read (replica or primary), None otherwise."""
+        return getattr(self._local, 'use_replica', None)
+
+    @contextmanager
+    def route(self, guild_id: Optional[int] = None):
+        """Decide the pool for one read-only method call on this thread."""
+        self._local.use_replica = self._choose_replica(guild_id)
+        try:
+            yield
+        finally:
+            self._local.use_replica = None
+
+    def _choose_replica(self, guild_id: Optional[int]) -> bool:
+        if guild_id is not None and self._pinned_until.get(guild_id, 0.0) > time.monotonic():
+            self._count_fallback('pinned')
+            return False
+
+        self._maybe_check_lag()
+        if not self._available:
+            self._count_fallback('unavailable')
+            return False
+        if self._lag_seconds is not None and self._lag_seconds > self.max_lag_seconds:
+            self._count_fallback('lagging')
+            return False
+
+        with self._lock:
+            self._replica_reads += 1
+        return True
+
+    def _count_fallback(self, reason: str):
+        with self._lock:
+            self._fallbacks[reason] += 1
+
+    def pin_guild(self, guild_id: int):
+        """Send the guild's routed reads to the primary for the next pin_seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._pinned_until[guild_id] = now + self.pin_seconds
+            # Drop expired pins so the map stays as small as the recently written guilds
+            for expired in [gid for gid, until in self._pinned_until.items() if until <= now]:
+                del self._pinned_until[expired]
+
+    # ==================== HEALTH ====================
+
+    def _maybe_check_lag(self):
+        """Re-measure replica lag once the check interval has passed (one thread at a time)."""
+        if time.monotonic() < self._next_check or not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.lag_check_interval
+            conn = self.pool.getconn(site='replica_lag_check', timeout=1.0)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+                conn.rollback()
+            finally:
+                self.pool.putconn(conn)
+
+            if lag > self.max_lag_seconds and (self._lag_seconds or 0) <= self.max_lag_seconds:
+                logging.warning(f"⚠️ Read replica is {lag:.1f}s behind; reading from the primary")
+            if not self._available:
+                logging.info("✅ Read replica reachable again")
+            self._lag_seconds = lag
+            self._available = True
+        except Exception as e:
+            self.mark_unavailable(e)
+        finally:
+            self._check_lock.release()
+
+    def mark_unavailable(self, error: Exception):
+        """Stop routing to the replica until the next lag check succeeds."""
+        if self._available:
+            logging.warning(f"⚠️ Read replica unavailable, reading from the primary: {error}")
+        self._available = False
+        self._next_check = time.monotonic() + self.lag_check_interval
+
+    def stats(self) -> Dict:
+        """Routing counters and the last replica health check."""
+        with self._lock:
+            return {
+                'replica_reads': self._replica_reads,
+                'primary_fallbacks': dict(self._fallbacks),
+                'pinned_guilds': sum(until > time.monotonic() for until in self._pinned_until.values()),
+                'available': self._available,
+                'lag_seconds': self._lag_seconds,
+                'max_lag_seconds': self.max_lag_seconds,
+                'pool': self.pool.stats(),
+            }
+
+    def close(self):
+        self.pool.closeall()
+
+
+def read_only(method):
+    """Mark a DatabaseManager method as safe to serve from the read replica.
+
+    The call is routed only when it comes from outside DatabaseManager; a read-only
+    method called by another method (e.g. a write re-reading a war) stays on the primary.
+    A 'guild_id' argument is used for read-your-writes pinning.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        router = self.read_router
+        if router is None or router.routing is not None or sys._getframe(1).f_locals.get('self') is self:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind_partial(self, *args, **kwargs)
+        bound.apply_defaults()
+        with router.route(bound.arguments.get('guild_id')):
+            return method(self, *args, **kwargs)
+
+    wrapper.read_only = True
+    return wrapper
+
+
+def route_reads(cls):
+    """Class decorator: wrap every method named in cls.REPLICA_READ_METHODS with @read_only."""
+    for name in cls.REPLICA_READ_METHODS:
+        method = getattr(cls, name)
+        if not getattr(method, 'read_only', False):
+            setattr(cls, name, read_only(method))
+    return cls
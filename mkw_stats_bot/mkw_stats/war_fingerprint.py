@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Canonical content fingerprints for wars.
+
+Two submissions of the same war (the same screenshot scanned twice, a manual
+/addwar of a war OCR already saved) have the same players, scores and race
+count, in whatever order and with whatever nickname the OCR or the user typed.
+war_fingerprint() reduces a war to that content and hashes it; wars.fingerprint
+stores the hash and idx_wars_guild_fingerprint makes a repeat anywhere in a
+guild's history a single index probe (DatabaseManager.find_duplicate_wars, see
+the war_fingerprints migration in migrations.py).
+
+Usage:
+    resolved = {'Nick': 'PlayerName', ...}     # raw name -> players.player_name
+    fingerprint = war_fingerprint(results, race_count, resolved)
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+def canonical_war_results(results: List[Dict], race_count: int,
+                          resolved_names: Optional[Mapping[str, str]] = None) -> Tuple[int, List[Tuple[str, int]]]:
+    """(race_count, sorted [(casefolded resolved name, score), ...]) for a war's results.
+
+    Names missing from resolved_names (players not on the roster) keep their own
+    name. Repeated players stay repeated, so a mis-scanned war doesn't collide
+    with the real one.
+    """
+    resolved_names = resolved_names or {}
+    entries = []
+    for result in results:
+        name = (result.get('name') or '').strip()
+        entries.append((resolved_names.get(name, name).casefold(), int(result.get('score', 0) or 0)))
+    return int(race_count), sorted(entries)
+
+
+def war_fingerprint(results: List[Dict], race_count: int,
+                    resolved_names: Optional[Mapping[str, str]] = None) -> str:
+    """SHA-256 hex digest of canonical_war_results (64 characters, wars.fingerprint)."""
+    canonical = canonical_war_results(results, race_count, resolved_names)
+    # JSON keeps names containing separators unambiguous
+    payload = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def resolved_name_map(matches: Mapping[str, tuple]) -> Dict[str, str]:
+    """{raw name: player_name} from DatabaseManager._resolve_names output."""
+    return {name.strip(): match[1] for name, match in matches.items()}
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+MKWStatsBot - OCR Worker Entry Point
+
+Runs PaddleOCR as a standalone HTTP service so the Discord bot process stays
+responsive during bulk scans. Point the bot at one or more workers with
+OCR_WORKER_URLS (comma-separated).
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mkw_stats.ocr_worker import main
+
+if __name__ == "__main__":
+    main()
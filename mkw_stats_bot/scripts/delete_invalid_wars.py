@@ -1,66 +1,79 @@
 """
 Script to delete invalid wars from the database.
 These wars were created via bulk review before the player stats update fix.
+
+Usage:
+    python delete_invalid_wars.py                      # Delete wars with ID >= 460
+    python delete_invalid_wars.py --min-war-id 500     # Delete wars with ID >= 500
+    python delete_invalid_wars.py --revert-stats       # Also revert their player stats
+
+The wars are removed in one transaction with DatabaseManager.remove_wars_by_ids.
+Stats are not reverted by default because these wars never updated them.
 """
 import os
 import sys
-import psycopg2
+import argparse
 from dotenv import load_dotenv
 
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 # Load environment variables
 load_dotenv()
 
+from mkw_stats.database import DatabaseManager
+
 DATABASE_URL = os.getenv('DATABASE_URL') or os.getenv('DATABASE_PUBLIC_URL')
 
 if not DATABASE_URL:
     print("Error: DATABASE_URL or DATABASE_PUBLIC_URL not found in environment")
     sys.exit(1)
 
+parser = argparse.ArgumentParser(description='Delete invalid wars')
+parser.add_argument('--min-war-id', type=int, default=460, help='Delete wars with ID >= this (default: 460)')
+parser.add_argument('--revert-stats', action='store_true', help="Also revert the wars' player stats")
+args = parser.parse_args()
+
 print(f"Connecting to database...")
 
+db = DatabaseManager(DATABASE_URL)
+
 try:
-    conn = psycopg2.connect(DATABASE_URL)
-    cursor = conn.cursor()
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
 
-    # First, check how many records will be deleted
-    cursor.execute("SELECT COUNT(*) FROM wars WHERE id >= 460")
-    war_count = cursor.fetchone()[0]
-    print(f"Found {war_count} wars with ID >= 460")
+        # First, check how many records will be deleted
+        cursor.execute("SELECT id FROM wars WHERE id >= %s ORDER BY id", (args.min_war_id,))
+        war_ids = [row[0] for row in cursor.fetchall()]
+        print(f"Found {len(war_ids)} wars with ID >= {args.min_war_id}")
 
-    cursor.execute("SELECT COUNT(*) FROM player_war_performances WHERE war_id >= 460")
-    perf_count = cursor.fetchone()[0]
-    print(f"Found {perf_count} player_war_performances records with war_id >= 460")
+        cursor.execute("SELECT COUNT(*) FROM player_war_performances WHERE war_id = ANY(%s)", (war_ids,))
+        perf_count = cursor.fetchone()[0]
+        print(f"Found {perf_count} player_war_performances records for those wars")
 
-    if war_count == 0 and perf_count == 0:
+    if not war_ids:
         print("No records to delete. Exiting.")
         sys.exit(0)
 
     # Confirm deletion
-    confirm = input(f"\nAre you sure you want to delete {war_count} wars and {perf_count} performance records? (yes/no): ")
+    stats_note = " and revert their player stats" if args.revert_stats else ""
+    confirm = input(f"\nAre you sure you want to delete {len(war_ids)} wars and {perf_count} performance records{stats_note}? (yes/no): ")
     if confirm.lower() != 'yes':
         print("Aborted.")
         sys.exit(0)
 
-    # First, delete related player_war_performances
-    cursor.execute("DELETE FROM player_war_performances WHERE war_id >= 460")
-    print(f"Deleted {cursor.rowcount} player_war_performances records")
+    # player_war_performances rows are removed with their wars
+    result = db.remove_wars_by_ids(war_ids, revert_stats=args.revert_stats)
+    if result is None:
+        print("Error: deletion failed, nothing was changed (see logs)")
+        sys.exit(1)
 
-    # Then delete the wars
-    cursor.execute("DELETE FROM wars WHERE id >= 460")
-    print(f"Deleted {cursor.rowcount} wars")
-
-    conn.commit()
+    print(f"Deleted {result['wars_removed']} wars")
+    if args.revert_stats:
+        print(f"Reverted stats for {result['players_reverted']} players")
     print("\nDeletion committed successfully!")
 
-except Exception as e:
-    print(f"Error: {e}")
-    if 'conn' in locals():
-        conn.rollback()
-    sys.exit(1)
 finally:
-    if 'cursor' in locals():
-        cursor.close()
-    if 'conn' in locals():
-        conn.close()
+    db.close()
 
 print("Done!")
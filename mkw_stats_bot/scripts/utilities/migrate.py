@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations
+=================
+
+Applies the pending versions in mkw_stats/migrations.py while the bot keeps
+running: DDL waits briefly for locks and retries, indexes are built
+CONCURRENTLY and backfills commit in small chunks. Progress is checkpointed,
+so an interrupted run (deploy timeout, Ctrl-C) resumes where it stopped when
+started again. A database set up with the old migrate_*.py scripts is
+adopted on the first run.
+
+Usage:
+    python migrate.py                        # Apply every pending version
+    python migrate.py --status               # Show applied / pending versions
+    python migrate.py --target 12            # Stop after version 12
+    python migrate.py --redo 19              # Re-run one version's (idempotent) steps
+    python migrate.py --batch-size 500 --throttle 0.5   # Gentler backfills on a busy database
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mkw_stats.config import MIGRATION_BATCH_SIZE, MIGRATION_LOCK_TIMEOUT_MS, MIGRATION_THROTTLE_SECONDS
+from mkw_stats.database import DatabaseManager
+from mkw_stats.migration_runner import MigrationRunner
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)-8s | %(message)s',
+    datefmt='%H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def print_status(runner: MigrationRunner) -> None:
+    for entry in runner.status():
+        line = f"  v{entry['version']:<3} {entry['name']:<28} {entry['state']}"
+        if entry.get('applied_at'):
+            line += f" ({entry['applied_at']:%Y-%m-%d %H:%M})"
+        logger.info(line)
+        for step, progress in entry.get('steps', {}).items():
+            state = 'done' if progress['completed'] else f"{progress['rows_done']} keys so far"
+            logger.info(f"        {step}: {state}")
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations online')
+    parser.add_argument('--status', action='store_true', help='Show migration state and exit')
+    parser.add_argument('--target', type=int, default=None, help='Highest version to apply')
+    parser.add_argument('--redo', type=int, default=None, help='Run this version again')
+    parser.add_argument('--batch-size', type=int, default=MIGRATION_BATCH_SIZE, help='Rows per backfill chunk')
+    parser.add_argument('--throttle', type=float, default=MIGRATION_THROTTLE_SECONDS,
+                        help='Seconds to pause between backfill chunks')
+    parser.add_argument('--lock-timeout-ms', type=int, default=MIGRATION_LOCK_TIMEOUT_MS,
+                        help='Give up a DDL lock wait after this long, then retry')
+    parser.add_argument('--database-url', default=None, help='Defaults to DATABASE_URL')
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.database_url)
+    try:
+        runner = MigrationRunner(db, batch_size=args.batch_size, throttle_seconds=args.throttle,
+                                 lock_timeout_ms=args.lock_timeout_ms)
+        if args.status:
+            print_status(runner)
+            return True
+
+        if args.redo is not None:
+            runner.redo(args.redo)
+            logger.info(f"✅ Re-ran v{args.redo}")
+            return True
+
+        ran = runner.run(args.target)
+        if ran:
+            logger.info(f"✅ Applied {len(ran)} migrations: {', '.join(f'v{version}' for version in ran)}")
+        else:
+            logger.info("✅ Database schema is up to date")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        logger.info("Completed steps are saved; run again to resume")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
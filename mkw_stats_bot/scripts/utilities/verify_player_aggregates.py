@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Verify Player Aggregates
+========================
+
+Compares the running aggregates that update_player_stats maintains incrementally
+(Σscore, Σscore², war rows, 12-race wars, highest/lowest, wins/losses/ties)
+against a full recompute from player_war_performances.
+
+Usage:
+    python verify_player_aggregates.py                    # Check all guilds
+    python verify_player_aggregates.py --guild-id 123     # Check one guild
+    python verify_player_aggregates.py --fix              # Rebuild aggregates if anything drifted
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mkw_stats.database import DatabaseManager
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)-8s | %(message)s',
+    datefmt='%H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description='Verify incremental player aggregates against a full recompute')
+    parser.add_argument('--guild-id', type=int, default=None, help='Only check this guild')
+    parser.add_argument('--fix', action='store_true', help='Recompute aggregates when mismatches are found')
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    try:
+        mismatches = db.verify_player_aggregates(args.guild_id)
+
+        if not mismatches:
+            logger.info("✅ All player aggregates match a full recompute")
+            return True
+
+        logger.warning(f"⚠️  Found {len(mismatches)} mismatches:")
+        for mismatch in mismatches:
+            logger.warning(
+                f"  [{mismatch['guild_id']}] {mismatch['player_name']} (ID {mismatch['player_id']}): "
+                f"{mismatch['column']} stored={mismatch['stored']} expected={mismatch['expected']}"
+            )
+
+        if not args.fix:
+            logger.info("Run with --fix to rebuild the aggregates")
+            return False
+
+        updated = db.recompute_player_aggregates(args.guild_id)
+        if updated is None:
+            logger.error("❌ Recompute failed")
+            return False
+
+        remaining = db.verify_player_aggregates(args.guild_id)
+        logger.info(f"Recomputed {updated} players, {len(remaining)} mismatches remaining")
+        return not remaining
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Autocomplete Benchmark
+
+Times AutocompleteIndex (mkw_stats/autocomplete_index.py) on a synthetic
+500-player guild against the old per-keystroke approach: substring-filter every
+roster row in Python (not counting the Postgres round trip it also paid).
+No database needed.
+
+Usage: python testing/benchmark_autocomplete.py [player_count]
+"""
+
+import sys
+import os
+import random
+import string
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mkw_stats.autocomplete_index import build_player_index
+
+SYLLABLES = ['ka', 'ri', 'to', 'mo', 'lu', 'zen', 'rex', 'vy', 'no', 'sha', 'kai', 'ash', 'ly', 'dro', 'mi']
+TAGS = ['CAP', 'MKW', 'Lx', 'ΣΔ', 'Rα']
+
+
+def make_roster(count: int, seed: int = 42) -> list:
+    """Random player rows in get_all_players_stats format, with 0-3 nicknames each."""
+    rng = random.Random(seed)
+    players, used = [], set()
+    while len(players) < count:
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if rng.random() < 0.2:
+            name = f"{rng.choice(TAGS)} {name}"
+        if name.lower() in used:
+            continue
+        used.add(name.lower())
+        nicknames = [
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+            for _ in range(rng.randint(0, 3))
+        ]
+        players.append({'player_name': name, 'nicknames': nicknames})
+    return players
+
+
+def old_autocomplete(players: list, current: str) -> list:
+    """What player_autocomplete did before the index (after fetching the roster)."""
+    filtered = [p['player_name'] for p in players if current.lower() in p['player_name'].lower()]
+    return filtered[:25]
+
+
+def time_queries(func, queries: list, repeat: int) -> list:
+    """Per-call latencies in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            func(query)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+    return sorted(samples)
+
+
+def summarize(label: str, samples: list):
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"  {label:<22} mean {sum(samples) / len(samples):8.1f}µs   p50 {p50:8.1f}µs   p99 {p99:8.1f}µs")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    players = make_roster(count)
+
+    print(f"⌨️  Autocomplete Benchmark ({count} players)")
+    print("=" * 40)
+
+    started = time.perf_counter()
+    index = build_player_index(players)
+    print(f"Index build: {(time.perf_counter() - started) * 1000:.2f} ms "
+          f"({sum(1 + len(p['nicknames']) for p in players)} names and nicknames)")
+    print()
+
+    # Keystroke sequences as a user types, plus typos, nicknames and misses
+    sample = random.Random(7).sample(players, 20)
+    queries = ['']
+    for player in sample:
+        name = player['player_name']
+        queries.extend(name[:end] for end in range(1, min(len(name), 6) + 1))
+        queries.append(name[1:4])  # substring
+        if len(name) > 4:
+            queries.append(name[:2] + name[3:])  # typo: dropped letter
+        queries.extend(player['nicknames'][:1])
+    queries.extend(['zzz', 'qx', 'nobody here'])
+
+    repeat = 50
+    print(f"{len(queries)} queries x {repeat}:")
+    new_samples = time_queries(index.search, queries, repeat)
+    old_samples = time_queries(lambda q: old_autocomplete(players, q), queries, repeat)
+    summarize("index.search", new_samples)
+    summarize("old substring filter", old_samples)
+    print()
+
+    print("Sample results:")
+    for query in ['ka', sample[0]['player_name'][:3], sample[1]['player_name'][:2] + sample[1]['player_name'][3:]]:
+        print(f"  '{query}' → {index.search(query, 5)}")
+
+    p99 = new_samples[int(len(new_samples) * 0.99)]
+    print()
+    print(f"{'✅' if p99 < 1000 else '❌'} p99 {'under' if p99 < 1000 else 'over'} 1 ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Database Scaling Benchmark
+
+Times every public DatabaseManager read and write method against synthetic data
+(testing/synthetic_data.py) at one or more scales and prints a comparison
+report: median latency and statement count per method per scale, growth from
+the smallest to the largest scale, and the change against a saved baseline run.
+
+Each scale gets a fresh temporary database on the server given by
+--database-url (or TEST_DATABASE_URL), or on a private initdb cluster when
+neither is set. Writes are paired with setup/teardown calls that undo them, so
+every repetition sees the same data. The guild cache is not started: reads are
+measured against the database.
+
+Usage: python testing/benchmark_database.py [--scales small,medium,large] [--repeat 5]
+                                            [--json results.json] [--baseline old.json]
+                                            [--output report.md]
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mkw_stats.database import DatabaseManager
+from mkw_stats.query_stats import query_scope
+from testing.synthetic_data import SCALES, SyntheticDataGenerator, apply_schema, local_cluster, temporary_database
+
+# Public methods that don't touch the database (or manage it) and aren't timed
+NOT_DATABASE_BOUND = {
+    'get_connection', 'init_database', 'close',
+    'get_bot_owner_id', 'is_bot_owner', 'get_clutch_category',
+    'validate_team_name', 'get_pool_stats', 'get_query_stats', 'get_guild_cache_stats',
+    'get_replica_stats',
+}
+BENCH_GUILD_ID = 700000000000000001  # For create_guild_config, outside the synthetic guild range
+
+
+@dataclass
+class BenchContext:
+    """IDs and names the cases work on, taken from one mid-sized synthetic guild."""
+    db: DatabaseManager
+    guild_id: int
+    player: str
+    nickname: str
+    player_team: str
+    member_status: str
+    team: str  # A configured guild team
+    other_team: str  # Any team other than player_team
+    player_names: List[str]
+    war_id: int
+    discord_user_id: int
+    ocr_channel_id: Optional[int]
+    role_ids: tuple
+    counter: itertools.count = field(default_factory=itertools.count)
+
+    def unique(self, prefix: str) -> str:
+        return f"{prefix} {next(self.counter)}"
+
+    def lineup(self, start: int = 0, size: int = 6) -> List[Dict]:
+        names = self.player_names[start:start + size]
+        return [{'name': name, 'score': 70 + i, 'races_played': 12, 'war_participation': 1.0}
+                for i, name in enumerate(names)]
+
+
+@dataclass
+class Case:
+    """How to time one method: run(ctx, state), with optional untimed setup(ctx) and teardown(ctx, state)."""
+    method: str
+    kind: str
+    run: Callable
+    setup: Optional[Callable] = None
+    teardown: Optional[Callable] = None
+
+
+def build_context(db: DatabaseManager) -> BenchContext:
+    """Pick the median guild and its most active player with a nickname."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT guild_id FROM guild_configs ORDER BY guild_id
+            OFFSET (SELECT COUNT(*) / 2 FROM guild_configs) LIMIT 1
+        """)
+        guild_id = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT player_name, nicknames->>0, team, member_status
+            FROM players
+            WHERE guild_id = %s AND is_active = TRUE AND jsonb_array_length(nicknames) > 0
+            ORDER BY war_count DESC LIMIT 1
+        """, (guild_id,))
+        player, nickname, player_team, member_status = cursor.fetchone()
+        cursor.execute("""
+            SELECT player_name FROM players
+            WHERE guild_id = %s AND is_active = TRUE ORDER BY war_count DESC
+        """, (guild_id,))
+        player_names = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT MAX(id) FROM wars WHERE guild_id = %s", (guild_id,))
+        war_id = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT discord_user_id FROM players
+            WHERE guild_id = %s AND is_active = TRUE AND discord_user_id IS NOT NULL LIMIT 1
+        """, (guild_id,))
+        discord_user_id = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT team_names, ocr_channel_id, role_member_id, role_trial_id, role_ally_id
+            FROM guild_configs WHERE guild_id = %s
+        """, (guild_id,))
+        team_names, ocr_channel_id, *role_ids = cursor.fetchone()
+
+    other_teams = [name for name in team_names + ['Unassigned'] if name != player_team]
+    return BenchContext(
+        db=db, guild_id=guild_id, player=player, nickname=nickname, player_team=player_team,
+        member_status=member_status, team=team_names[0], other_team=other_teams[0],
+        player_names=player_names, war_id=war_id, discord_user_id=discord_user_id,
+        ocr_channel_id=ocr_channel_id, role_ids=tuple(role_ids),
+    )
+
+
+def _read(method: str, call: Callable) -> Case:
+    return Case(method, 'read', lambda ctx, _: call(ctx))
+
+
+def _saved_war(ctx: BenchContext, start: int = 0) -> int:
+    return ctx.db.save_war(ctx.lineup(start), guild_id=ctx.guild_id)['war_id']
+
+
+def _remove_war(ctx: BenchContext, war_id: int):
+    ctx.db.remove_war_by_id(war_id, guild_id=ctx.guild_id)
+
+
+def _recent_wars(ctx: BenchContext, count: int) -> List[tuple]:
+    """(results, race_count) of the guild's latest wars, for the duplicate checks to find."""
+    return [(war['results'], war['race_count']) for war in ctx.db.get_all_wars(limit=count, guild_id=ctx.guild_id)]
+
+
+def _added_player(ctx: BenchContext) -> str:
+    name = ctx.unique('Bench Rookie')
+    ctx.db.add_roster_player(name, 'benchmark', guild_id=ctx.guild_id)
+    return name
+
+
+def _remove_player(ctx: BenchContext, name: str):
+    ctx.db.remove_roster_player(name, ctx.guild_id)
+
+
+def _ocr_batch(ctx: BenchContext, images: int = 1) -> int:
+    return ctx.db.create_ocr_batch(ctx.guild_id, ctx.discord_user_id, ctx.ocr_channel_id or 1, None, [
+        {'image_url': f"https://cdn.example/{i}.png", 'image_filename': f"{i}.png",
+         'discord_message_id': i, 'author_id': ctx.discord_user_id}
+        for i in range(images)
+    ])
+
+
+def _finish_batch(ctx: BenchContext, batch_id: int):
+    """Complete and finalize a batch so its jobs aren't claimed by later cases."""
+    for job in ctx.db.get_ocr_batch_jobs(batch_id):
+        if job.get('status') in ('pending', 'processing'):
+            ctx.db.complete_ocr_job(job['id'], {'results': []})
+    ctx.db.finalize_ocr_batch(batch_id)
+
+
+def _claimed_job(ctx: BenchContext) -> Dict:
+    batch_id = _ocr_batch(ctx)
+    return {'batch_id': batch_id, 'job_id': ctx.db.claim_next_ocr_job('benchmark')['id']}
+
+
+def _completed_batch(ctx: BenchContext) -> int:
+    batch_id = _ocr_batch(ctx)
+    for job in ctx.db.get_ocr_batch_jobs(batch_id):
+        ctx.db.complete_ocr_job(job['id'], {'results': []})
+    return batch_id
+
+
+def _tagged_team(ctx: BenchContext) -> Optional[str]:
+    """Tag the context team and return its original tag."""
+    original = ctx.db.get_team_tag(ctx.guild_id, ctx.team)
+    ctx.db.set_team_tag(ctx.guild_id, ctx.team, 'BT')
+    return original
+
+
+def _restore_team_tag(ctx: BenchContext, original: Optional[str]):
+    if original:
+        ctx.db.set_team_tag(ctx.guild_id, ctx.team, original)
+    else:
+        ctx.db.remove_team_tag(ctx.guild_id, ctx.team)
+
+
+def _retag_team(ctx: BenchContext, original: Optional[str]):
+    """Put back the tag remove_team_tag took off, if the team had one before _tagged_team."""
+    if original:
+        ctx.db.set_team_tag(ctx.guild_id, ctx.team, original)
+
+
+def build_cases() -> List[Case]:
+    today = date.today().isoformat()
+    return [
+        # Guild config and roster reads
+        _read('get_ocr_channel', lambda ctx: ctx.db.get_ocr_channel(ctx.guild_id)),
+        _read('is_channel_allowed', lambda ctx: ctx.db.is_channel_allowed(ctx.guild_id, ctx.ocr_channel_id or 1)),
+        _read('get_guild_config', lambda ctx: ctx.db.get_guild_config(ctx.guild_id)),
+        _read('get_guild_team_names', lambda ctx: ctx.db.get_guild_team_names(ctx.guild_id)),
+        _read('get_guild_teams_with_counts', lambda ctx: ctx.db.get_guild_teams_with_counts(ctx.guild_id)),
+        _read('get_team_tag', lambda ctx: ctx.db.get_team_tag(ctx.guild_id, ctx.team)),
+        _read('get_all_team_tags', lambda ctx: ctx.db.get_all_team_tags(ctx.guild_id)),
+        _read('get_guild_role_config', lambda ctx: ctx.db.get_guild_role_config(ctx.guild_id)),
+        _read('autocomplete_teams', lambda ctx: ctx.db.autocomplete_teams(ctx.guild_id, ctx.team[:2])),
+        _read('resolve_player_name', lambda ctx: ctx.db.resolve_player_name(ctx.nickname, ctx.guild_id)),
+        _read('resolve_player_names', lambda ctx: ctx.db.resolve_player_names(
+            ctx.player_names[:12] + ['Nobody Here'], ctx.guild_id)),
+        _read('autocomplete_players', lambda ctx: ctx.db.autocomplete_players(ctx.guild_id, ctx.player[:2])),
+        _read('get_player_info', lambda ctx: ctx.db.get_player_info(ctx.player, ctx.guild_id)),
+        _read('get_roster_players', lambda ctx: ctx.db.get_roster_players(ctx.guild_id)),
+        _read('get_all_players_stats', lambda ctx: ctx.db.get_all_players_stats(ctx.guild_id)),
+        _read('get_players_by_team', lambda ctx: ctx.db.get_players_by_team(ctx.team, ctx.guild_id)),
+        _read('get_team_roster', lambda ctx: ctx.db.get_team_roster(ctx.team, ctx.guild_id)),
+        _read('get_player_team', lambda ctx: ctx.db.get_player_team(ctx.player, ctx.guild_id)),
+        _read('get_player_nicknames', lambda ctx: ctx.db.get_player_nicknames(ctx.player, ctx.guild_id)),
+        _read('get_players_by_member_status', lambda ctx: ctx.db.get_players_by_member_status('member', ctx.guild_id)),
+        _read('get_member_status_counts', lambda ctx: ctx.db.get_member_status_counts(ctx.guild_id)),
+        _read('get_player_name_by_discord_id', lambda ctx: ctx.db.get_player_name_by_discord_id(
+            ctx.discord_user_id, ctx.guild_id)),
+        _read('get_unlinked_players', lambda ctx: ctx.db.get_unlinked_players(ctx.guild_id)),
+        _read('get_database_info', lambda ctx: ctx.db.get_database_info(ctx.guild_id)),
+        _read('health_check', lambda ctx: ctx.db.health_check()),
+
+        # Stats and leaderboards
+        _read('get_player_stats', lambda ctx: ctx.db.get_player_stats(ctx.player, ctx.guild_id)),
+        _read('get_player_stats_last_x_wars', lambda ctx: ctx.db.get_player_stats_last_x_wars(ctx.player, 10, ctx.guild_id)),
+        _read('get_player_form_score', lambda ctx: ctx.db.get_player_form_score(ctx.player, ctx.guild_id)),
+        _read('get_player_clutch_factor', lambda ctx: ctx.db.get_player_clutch_factor(ctx.player, ctx.guild_id)),
+        _read('get_player_potential', lambda ctx: ctx.db.get_player_potential(ctx.player, ctx.guild_id)),
+        _read('get_player_distinct_war_count', lambda ctx: ctx.db.get_player_distinct_war_count(ctx.player, ctx.guild_id)),
+        _read('get_player_last_war_scores', lambda ctx: ctx.db.get_player_last_war_scores(ctx.player, 10, ctx.guild_id)),
+        _read('get_guild_leaderboard_page', lambda ctx: ctx.db.get_guild_leaderboard_page(
+            ctx.guild_id, 'avg', ctx.player_names, include_unranked=True)),
+        _read('get_global_leaderboard_page', lambda ctx: ctx.db.get_global_leaderboard_page('avg', include_total=True)),
+        _read('get_all_players_stats_global', lambda ctx: ctx.db.get_all_players_stats_global()),
+        _read('get_guilds_with_stale_metrics', lambda ctx: ctx.db.get_guilds_with_stale_metrics()),
+        _read('get_players_missing_metric', lambda ctx: ctx.db.get_players_missing_metric('avg10')),
+        _read('verify_player_aggregates', lambda ctx: ctx.db.verify_player_aggregates(ctx.guild_id)),
+
+        # Wars
+        _read('get_war_by_id', lambda ctx: ctx.db.get_war_by_id(ctx.war_id, ctx.guild_id)),
+        _read('get_wars_page', lambda ctx: ctx.db.get_wars_page(ctx.guild_id)),
+        _read('get_all_wars', lambda ctx: ctx.db.get_all_wars(guild_id=ctx.guild_id)),
+        Case('find_duplicate_war', 'read', lambda ctx, wars: ctx.db.find_duplicate_war(*wars[0], ctx.guild_id),
+             setup=lambda ctx: _recent_wars(ctx, 1)),
+        Case('find_duplicate_wars', 'read', lambda ctx, wars: ctx.db.find_duplicate_wars(wars, ctx.guild_id),
+             setup=lambda ctx: _recent_wars(ctx, 25)),
+
+        # OCR queue reads
+        Case('get_ocr_batch', 'read', lambda ctx, batch: ctx.db.get_ocr_batch(batch),
+             setup=lambda ctx: _ocr_batch(ctx, 10), teardown=_finish_batch),
+        Case('get_ocr_batch_jobs', 'read', lambda ctx, batch: ctx.db.get_ocr_batch_jobs(batch),
+             setup=lambda ctx: _ocr_batch(ctx, 10), teardown=_finish_batch),
+        _read('get_unfinalized_ocr_batch_ids', lambda ctx: ctx.db.get_unfinalized_ocr_batch_ids()),
+
+        # War writes
+        Case('add_race_results', 'write',
+             lambda ctx, _: ctx.db.add_race_results(ctx.lineup(), guild_id=ctx.guild_id),
+             teardown=lambda ctx, war_id: ctx.db.remove_wars_by_ids([war_id], guild_id=ctx.guild_id, revert_stats=False)),
+        Case('save_war', 'write',
+             lambda ctx, _: ctx.db.save_war(ctx.lineup(), guild_id=ctx.guild_id),
+             teardown=lambda ctx, saved: _remove_war(ctx, saved['war_id'])),
+        Case('remove_war_by_id', 'write', lambda ctx, war_id: _remove_war(ctx, war_id), setup=_saved_war),
+        Case('remove_wars_by_ids', 'write',
+             lambda ctx, war_ids: ctx.db.remove_wars_by_ids(war_ids, guild_id=ctx.guild_id),
+             setup=lambda ctx: [_saved_war(ctx, start) for start in (0, 6, 12)]),
+        Case('append_players_to_war_by_id', 'write',
+             lambda ctx, war_id: ctx.db.append_players_to_war_by_id(war_id, ctx.lineup(5, 1), guild_id=ctx.guild_id),
+             setup=lambda ctx: ctx.db.save_war(ctx.lineup(0, 5), guild_id=ctx.guild_id)['war_id'],
+             teardown=_remove_war),
+        Case('update_war_by_id', 'write',
+             lambda ctx, war_id: ctx.db.update_war_by_id(war_id, ctx.lineup(6), 12, guild_id=ctx.guild_id),
+             setup=_saved_war, teardown=_remove_war),
+        Case('update_player_stats', 'write',
+             lambda ctx, _: ctx.db.update_player_stats(ctx.player, 90, 12, 1.0, today, ctx.guild_id, 10),
+             teardown=lambda ctx, _: ctx.db.remove_player_stats_with_participation(ctx.player, 90, 12, 1.0, ctx.guild_id, 10)),
+        Case('remove_player_stats_with_participation', 'write',
+             lambda ctx, _: ctx.db.remove_player_stats_with_participation(ctx.player, 90, 12, 1.0, ctx.guild_id, 10),
+             setup=lambda ctx: ctx.db.update_player_stats(ctx.player, 90, 12, 1.0, today, ctx.guild_id, 10)),
+        Case('recompute_player_aggregates', 'write', lambda ctx, _: ctx.db.recompute_player_aggregates(ctx.guild_id)),
+        Case('refresh_leaderboard_snapshots', 'write', lambda ctx, _: ctx.db.refresh_leaderboard_snapshots(ctx.guild_id)),
+        Case('refresh_guild_volatile_metrics', 'write', lambda ctx, _: ctx.db.refresh_guild_volatile_metrics(ctx.guild_id)),
+
+        # Roster writes
+        Case('add_roster_player', 'write',
+             lambda ctx, name: ctx.db.add_roster_player(name, 'benchmark', guild_id=ctx.guild_id),
+             setup=lambda ctx: ctx.unique('Bench Rookie'), teardown=_remove_player),
+        Case('remove_roster_player', 'write', lambda ctx, name: _remove_player(ctx, name), setup=_added_player),
+        Case('add_roster_player_with_discord', 'write',
+             lambda ctx, name: ctx.db.add_roster_player_with_discord(
+                 10 ** 17 + next(ctx.counter), name, name, name.lower(), 'member', 'benchmark', guild_id=ctx.guild_id),
+             setup=lambda ctx: ctx.unique('Bench Linked'), teardown=_remove_player),
+        Case('link_player_to_discord_user', 'write',
+             lambda ctx, name: ctx.db.link_player_to_discord_user(
+                 name, 10 ** 17 + next(ctx.counter), name, name.lower(), 'member', ctx.guild_id),
+             setup=_added_player, teardown=_remove_player),
+        Case('sync_player_discord_info', 'write',
+             lambda ctx, _: ctx.db.sync_player_discord_info(ctx.discord_user_id, ctx.player, ctx.player.lower(), ctx.guild_id)),
+        Case('sync_player_role', 'write',
+             lambda ctx, _: ctx.db.sync_player_role(ctx.discord_user_id, 'member', ctx.guild_id)),
+        Case('set_player_team', 'write',
+             lambda ctx, _: ctx.db.set_player_team(ctx.player, ctx.other_team, ctx.guild_id),
+             teardown=lambda ctx, _: ctx.db.set_player_team(ctx.player, ctx.player_team, ctx.guild_id)),
+        Case('set_player_member_status', 'write',
+             lambda ctx, _: ctx.db.set_player_member_status(ctx.player, 'trial', ctx.guild_id),
+             teardown=lambda ctx, _: ctx.db.set_player_member_status(ctx.player, ctx.member_status, ctx.guild_id)),
+        Case('add_nickname', 'write',
+             lambda ctx, _: ctx.db.add_nickname(ctx.player, 'benchnick', ctx.guild_id),
+             teardown=lambda ctx, _: ctx.db.remove_nickname(ctx.player, 'benchnick', ctx.guild_id)),
+        Case('remove_nickname', 'write',
+             lambda ctx, _: ctx.db.remove_nickname(ctx.player, 'benchnick', ctx.guild_id),
+             setup=lambda ctx: ctx.db.add_nickname(ctx.player, 'benchnick', ctx.guild_id)),
+        Case('set_player_nicknames', 'write',
+             lambda ctx, original: ctx.db.set_player_nicknames(ctx.player, original + ['benchnick'], ctx.guild_id),
+             setup=lambda ctx: ctx.db.get_player_nicknames(ctx.player, ctx.guild_id),
+             teardown=lambda ctx, original: ctx.db.set_player_nicknames(ctx.player, original, ctx.guild_id)),
+
+        # Guild config writes (values are restored or unchanged)
+        Case('set_ocr_channel', 'write', lambda ctx, _: ctx.db.set_ocr_channel(ctx.guild_id, ctx.ocr_channel_id or 1)),
+        Case('create_guild_config', 'write',
+             lambda ctx, _: ctx.db.create_guild_config(BENCH_GUILD_ID, 'Benchmark Guild', ['Bench'])),
+        Case('update_guild_config', 'write',
+             lambda ctx, config: ctx.db.update_guild_config(ctx.guild_id, guild_name=config['guild_name']),
+             setup=lambda ctx: ctx.db.get_guild_config(ctx.guild_id)),
+        Case('set_guild_role_config', 'write', lambda ctx, _: ctx.db.set_guild_role_config(ctx.guild_id, *ctx.role_ids)),
+        Case('add_guild_team', 'write', lambda ctx, _: ctx.db.add_guild_team(ctx.guild_id, 'Bench Team'),
+             teardown=lambda ctx, _: ctx.db.remove_guild_team(ctx.guild_id, 'Bench Team')),
+        Case('remove_guild_team', 'write', lambda ctx, _: ctx.db.remove_guild_team(ctx.guild_id, 'Bench Team'),
+             setup=lambda ctx: ctx.db.add_guild_team(ctx.guild_id, 'Bench Team')),
+        Case('rename_guild_team', 'write',
+             lambda ctx, _: ctx.db.rename_guild_team(ctx.guild_id, 'Bench Team', 'Bench Team Renamed'),
+             setup=lambda ctx: ctx.db.add_guild_team(ctx.guild_id, 'Bench Team'),
+             teardown=lambda ctx, _: ctx.db.remove_guild_team(ctx.guild_id, 'Bench Team Renamed')),
+        Case('set_team_tag', 'write',
+             lambda ctx, _: ctx.db.set_team_tag(ctx.guild_id, ctx.team, 'BT'),
+             setup=lambda ctx: ctx.db.get_team_tag(ctx.guild_id, ctx.team), teardown=_restore_team_tag),
+        Case('remove_team_tag', 'write',
+             lambda ctx, _: ctx.db.remove_team_tag(ctx.guild_id, ctx.team),
+             setup=_tagged_team, teardown=_retag_team),
+
+        # OCR queue writes
+        Case('create_ocr_batch', 'write', lambda ctx, _: _ocr_batch(ctx, 10), teardown=_finish_batch),
+        Case('claim_next_ocr_job', 'write', lambda ctx, _: ctx.db.claim_next_ocr_job('benchmark'),
+             setup=_ocr_batch, teardown=_finish_batch),
+        Case('complete_ocr_job', 'write',
+             lambda ctx, claimed: ctx.db.complete_ocr_job(claimed['job_id'], {'results': []}),
+             setup=_claimed_job, teardown=lambda ctx, claimed: ctx.db.finalize_ocr_batch(claimed['batch_id'])),
+        Case('fail_ocr_job', 'write',
+             lambda ctx, claimed: ctx.db.fail_ocr_job(claimed['job_id'], 'benchmark'),
+             setup=_claimed_job, teardown=lambda ctx, claimed: ctx.db.finalize_ocr_batch(claimed['batch_id'])),
+        Case('finalize_ocr_batch', 'write', lambda ctx, batch_id: ctx.db.finalize_ocr_batch(batch_id),
+             setup=_completed_batch),
+    ]
+
+
+def uncovered_methods(cases: List[Case]) -> List[str]:
+    """Public DatabaseManager methods with neither a case nor a NOT_DATABASE_BOUND entry."""
+    public = {name for name, _ in inspect.getmembers(DatabaseManager, callable) if not name.startswith('_')}
+    return sorted(public - {case.method for case in cases} - NOT_DATABASE_BOUND)
+
+
+def time_case(ctx: BenchContext, case: Case, repeat: int) -> Dict:
+    """Median/p95/max latency and median statement count of repeat runs (after one warm-up)."""
+    samples, statements = [], []
+    try:
+        for iteration in range(repeat + 1):
+            state = case.setup(ctx) if case.setup else None
+            with query_scope(case.method) as scope:
+                started = time.perf_counter()
+                result = case.run(ctx, state)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            if case.teardown:
+                case.teardown(ctx, state if case.setup else result)
+            if iteration:
+                samples.append(elapsed_ms)
+                statements.append(scope.queries)
+    except Exception as e:
+        return {'kind': case.kind, 'error': f"{type(e).__name__}: {e}"}
+
+    samples.sort()
+    return {
+        'kind': case.kind,
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'max_ms': round(samples[-1], 3),
+        'statements': int(statistics.median(statements)),
+    }
+
+
+def run_scale(server_url: str, scale_name: str, repeat: int, seed: int) -> Dict:
+    scale = SCALES[scale_name]
+    print(f"\n📦 {scale_name}: {scale.guilds} guilds x {scale.players_per_guild} players x {scale.wars_per_guild} wars")
+    with temporary_database(server_url, f"mkw_bench_{scale_name}_{os.getpid()}") as database_url:
+        apply_schema(database_url)
+        db = DatabaseManager(database_url)
+        try:
+            data = SyntheticDataGenerator(scale, seed).generate(db)
+            print(f"   Loaded {data['players']} players, {data['wars']} wars, {data['performances']} performances "
+                  f"in {data['load_seconds']}s (+{data['derive_seconds']}s deriving stats)")
+
+            ctx = build_context(db)
+            methods = {}
+            for case in build_cases():
+                methods[case.method] = time_case(ctx, case, repeat)
+                result = methods[case.method]
+                status = f"{result['p50_ms']:9.2f} ms  {result['statements']:3d} stmts" if 'error' not in result else f"ERROR {result['error']}"
+                print(f"   {case.method:<40} {status}")
+        finally:
+            db.close()
+    return {'scale': asdict(scale), 'data': data, 'methods': methods}
+
+
+def format_report(results: Dict, baseline: Optional[Dict] = None) -> str:
+    """Markdown table: p50 and statements per scale, growth first -> last scale, and change vs baseline."""
+    scales = list(results['scales'])
+    header = ['Method', 'Kind'] + [f"{scale} p50 ms (stmts)" for scale in scales]
+    if len(scales) > 1:
+        header.append(f"Growth {scales[0]}→{scales[-1]}")
+    if baseline:
+        header += [f"Δ {scale} vs baseline" for scale in scales if scale in baseline['scales']]
+
+    lines = [f"# Database benchmark ({results['created_at']})", "",
+             "| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    methods = sorted({method for scale in scales for method in results['scales'][scale]['methods']},
+                     key=lambda m: (results['scales'][scales[0]]['methods'].get(m, {}).get('kind', ''), m))
+    for method in methods:
+        row = [method, results['scales'][scales[0]]['methods'].get(method, {}).get('kind', '')]
+        p50s = []
+        for scale in scales:
+            result = results['scales'][scale]['methods'].get(method, {})
+            if 'p50_ms' in result:
+                row.append(f"{result['p50_ms']:.2f} ({result['statements']})")
+                p50s.append(result['p50_ms'])
+            else:
+                row.append(result.get('error', '—'))
+                p50s.append(None)
+        if len(scales) > 1:
+            row.append(f"{p50s[-1] / p50s[0]:.1f}x" if p50s[0] and p50s[-1] else '—')
+        if baseline:
+            for scale, p50 in zip(scales, p50s):
+                if scale not in baseline['scales']:
+                    continue
+                old = baseline['scales'][scale]['methods'].get(method, {}).get('p50_ms')
+                row.append(f"{(p50 - old) / old * 100:+.0f}%" if p50 and old else '—')
+        lines.append("| " + " | ".join(row) + " |")
+
+    if results['uncovered']:
+        lines += ["", f"Not benchmarked (add a case): {', '.join(results['uncovered'])}"]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time DatabaseManager methods at several data scales")
+    parser.add_argument('--database-url', default=os.getenv('TEST_DATABASE_URL'),
+                        help="Server to create temporary databases on (default: TEST_DATABASE_URL, else a private initdb cluster)")
+    parser.add_argument('--scales', default='small,medium', help=f"Comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per method (after one warm-up)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help="Write raw results here (use as a later --baseline)")
+    parser.add_argument('--baseline', help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--output', help="Write the markdown report here as well")
+    args = parser.parse_args()
+
+    # Repo methods log every call at INFO; keep the benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+
+    cases = build_cases()
+    results = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'uncovered': uncovered_methods(cases),
+        'scales': {},
+    }
+
+    print("🏁 Database Scaling Benchmark")
+    print("=" * 40)
+    with ExitStack() as stack:
+        server_url = args.database_url
+        if not server_url:
+            server_url = stack.enter_context(local_cluster(stack.enter_context(tempfile.TemporaryDirectory())))
+        for scale_name in args.scales.split(','):
+            results['scales'][scale_name] = run_scale(server_url, scale_name.strip(), args.repeat, args.seed)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = format_report(results, baseline)
+    print()
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + "\n")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Fixtures for the database-backed tests (test_query_counts.py, test_stats_engine.py,
+test_read_routing.py).
+
+A session-scoped throwaway Postgres is built from:
+- TEST_DATABASE_URL: a server you can create databases on; a temporary
+  database is created on it and dropped afterwards, or
+- initdb/pg_ctl (on PATH, in PG_BIN, or from pg_config --bindir): a private
+  cluster in a temp directory on a free port, stopped afterwards.
+If neither is available the tests are skipped. test_read_routing.py also needs
+a second server (TEST_REPLICA_DATABASE_URL, or a second private cluster).
+
+The schema comes from synthetic_data.apply_schema() (init_database() plus every
+version in mkw_stats/migrations.py), and a small synthetic guild is
+seeded through the normal DatabaseManager write methods.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_query_counts.py
+"""
+
+import os
+import random
+import sys
+import time
+from contextlib import ExitStack
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testing.synthetic_data import apply_schema, local_cluster, temporary_database
+
+# Synthetic guild: 30 single-word names, two teams, 100 six-player wars (20 per player,
+# enough for the global leaderboard's minimum)
+GUILD_ID = 900000000000000001
+TEAM_NAMES = ['Phantom', 'Specter']
+SYLLABLES = ['ka', 'ri', 'to', 'mo', 'lu', 'zen', 'rex', 'vy', 'no', 'sha']
+PLAYER_COUNT = 30
+WAR_COUNT = 100
+LINEUP_SIZE = 6
+
+
+def _player_names() -> list:
+    rng = random.Random(45)
+    names = []
+    while len(names) < PLAYER_COUNT:
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(3)).capitalize()
+        if name not in names:
+            names.append(name)
+    return names
+
+
+@pytest.fixture(scope='session')
+def postgres_server_url(tmp_path_factory):
+    """URL of a Postgres server the tests can create databases on."""
+    pytest.importorskip('psycopg2')
+
+    server_url = os.getenv('TEST_DATABASE_URL')
+    if server_url:
+        yield server_url
+        return
+    with ExitStack() as stack:
+        try:
+            server_url = stack.enter_context(local_cluster(str(tmp_path_factory.mktemp('pgdata'))))
+        except RuntimeError as e:
+            pytest.skip(f"No Postgres available (set TEST_DATABASE_URL): {e}")
+        yield server_url
+
+
+@pytest.fixture(scope='session')
+def replica_server_url(tmp_path_factory):
+    """URL of a second Postgres server, standing in for a read replica."""
+    pytest.importorskip('psycopg2')
+
+    server_url = os.getenv('TEST_REPLICA_DATABASE_URL')
+    if server_url:
+        yield server_url
+        return
+    with ExitStack() as stack:
+        try:
+            server_url = stack.enter_context(local_cluster(str(tmp_path_factory.mktemp('pgdata_replica'))))
+        except RuntimeError as e:
+            pytest.skip(f"No second Postgres available (set TEST_REPLICA_DATABASE_URL): {e}")
+        yield server_url
+
+
+@pytest.fixture(scope='session')
+def postgres_url(postgres_server_url):
+    """URL of an empty throwaway database."""
+    with temporary_database(postgres_server_url, f"mkw_query_counts_{os.getpid()}") as url:
+        yield url
+
+
+def _seed_guild(db, players: list):
+    assert db.create_guild_config(GUILD_ID, 'Query Count Guild', TEAM_NAMES)
+    for i, name in enumerate(players):
+        assert db.add_roster_player(name, 'pytest', guild_id=GUILD_ID)
+        assert db.set_player_team(name, TEAM_NAMES[i % len(TEAM_NAMES)], GUILD_ID)
+        if i % 3 == 0:
+            assert db.add_nickname(name, name[::-1].lower(), GUILD_ID)
+
+    rng = random.Random(7)
+    for war in range(WAR_COUNT):
+        lineup = [players[(war * LINEUP_SIZE + k) % len(players)] for k in range(LINEUP_SIZE)]
+        results = [{'name': name, 'score': rng.randint(40, 140), 'races': 12} for name in lineup]
+        assert db.save_war(results, guild_id=GUILD_ID)
+
+
+@pytest.fixture(scope='session')
+def guild_id() -> int:
+    """ID of the synthetic guild."""
+    return GUILD_ID
+
+
+@pytest.fixture(scope='session')
+def guild_players() -> list:
+    """Names of the synthetic guild's players."""
+    return _player_names()
+
+
+@pytest.fixture(scope='session')
+def seeded_db(postgres_url, guild_players):
+    """DatabaseManager on the fully migrated schema with the synthetic guild, guild cache running."""
+    from mkw_stats.database import DatabaseManager
+
+    apply_schema(postgres_url)
+    db = DatabaseManager(postgres_url)
+    _seed_guild(db, guild_players)
+
+    db.guild_cache.start()
+    deadline = time.monotonic() + 10
+    while not db.guild_cache.enabled and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert db.guild_cache.enabled, "guild cache listener did not connect"
+
+    # Build the leaderboard snapshot the seeding wars marked stale
+    assert db.get_guild_leaderboard_page(GUILD_ID, 'avg', guild_players) is not None
+
+    yield db
+    db.close()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+
+Builds a production-shaped schema on an empty database and fills it with
+realistic guilds, rosters, nicknames, wars and player_war_performances at a
+chosen scale, bulk-loaded with COPY. Player stats, cached stable metrics,
+player_aliases and leaderboard snapshots are then derived set-based from the
+loaded wars, exactly as the bot would have stored them.
+
+Used by testing/benchmark_database.py and the query-count fixtures
+(testing/conftest.py). Volatile metrics are left NULL, as after any stats
+write, for the metrics warmer or first read to fill.
+
+Usage: python testing/synthetic_data.py DATABASE_URL [small|medium|large] [--seed N]
+       (DATABASE_URL must point at an empty database)
+"""
+
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence
+from urllib.parse import urlparse, urlunparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mkw_stats.war_fingerprint import war_fingerprint
+
+
+@dataclass(frozen=True)
+class Scale:
+    """How much data to generate."""
+    name: str
+    guilds: int
+    players_per_guild: int
+    wars_per_guild: int
+
+
+SCALES = {
+    'small': Scale('small', guilds=5, players_per_guild=20, wars_per_guild=100),
+    'medium': Scale('medium', guilds=50, players_per_guild=40, wars_per_guild=500),
+    'large': Scale('large', guilds=200, players_per_guild=60, wars_per_guild=2000),
+}
+
+FIRST_GUILD_ID = 800000000000000000
+SYLLABLES = ['ka', 'ri', 'to', 'mo', 'lu', 'zen', 'rex', 'vy', 'no', 'sha', 'kai', 'ash', 'ly', 'dro', 'mi',
+             'qua', 'fel', 'bo', 'tan', 'ix']
+CLAN_TAGS = ['CAP', 'MKW', 'Lx', 'ΣΔ', 'Rα', 'HD', 'Vz']
+TEAM_POOL = ['Phantom', 'Specter', 'Academy', 'Black', 'White', 'Nova', 'Eclipse']
+COUNTRIES = ['US', 'CA', 'GB', 'FR', 'DE', 'JP', 'MX', 'BR', 'AU', 'NL', None]
+# member_status weights; 'kicked' players stay on the roster but no longer play
+MEMBER_STATUSES = [('member', 75), ('trial', 10), ('ally', 10), ('kicked', 5)]
+LINEUP_SIZE = 6
+RACES_PER_WAR = 12
+SUB_WAR_RATE = 0.15  # Share of wars where one slot is split between two players
+INACTIVE_PLAYER_RATE = 0.05  # Removed from the roster (is_active = FALSE) but keep their history
+HISTORY_DAYS = 730
+COPY_CHUNK_ROWS = 50000
+
+
+def find_pg_binary(name: str):
+    """Locate a Postgres server binary (initdb, pg_ctl)."""
+    candidates = []
+    if os.getenv('PG_BIN'):
+        candidates.append(os.path.join(os.getenv('PG_BIN'), name))
+    if shutil.which(name):
+        candidates.append(shutil.which(name))
+    if shutil.which('pg_config'):
+        bindir = subprocess.run(['pg_config', '--bindir'], capture_output=True, text=True).stdout.strip()
+        candidates.append(os.path.join(bindir, name))
+    # Debian/Ubuntu keep server binaries off PATH
+    candidates.extend(sorted(glob.glob(f'/usr/lib/postgresql/*/bin/{name}'), reverse=True))
+
+    for candidate in candidates:
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def temporary_database(server_url: str, name: str = None):
+    """Create a database on server_url, yield its URL, then drop it."""
+    import psycopg2
+
+    name = name or f"mkw_synthetic_{os.getpid()}"
+    admin = psycopg2.connect(server_url)
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {name}")
+            # Player names and clan tags aren't ASCII; don't inherit a SQL_ASCII server default
+            cursor.execute(f"CREATE DATABASE {name} ENCODING 'UTF8' TEMPLATE template0")
+        yield urlunparse(urlparse(server_url)._replace(path=f"/{name}"))
+    finally:
+        with admin.cursor() as cursor:
+            # A failed test may leave a DatabaseManager pool open
+            cursor.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+        admin.close()
+
+
+@contextmanager
+def local_cluster(data_dir: str):
+    """Run a private Postgres cluster in data_dir and yield a server URL.
+
+    Raises:
+        RuntimeError: If initdb/pg_ctl are missing or the cluster fails to start
+    """
+    initdb, pg_ctl = find_pg_binary('initdb'), find_pg_binary('pg_ctl')
+    if not initdb or not pg_ctl:
+        raise RuntimeError("initdb/pg_ctl not found (install Postgres or set PG_BIN)")
+
+    result = subprocess.run(
+        [initdb, '-D', data_dir, '-U', 'postgres', '-A', 'trust', '-E', 'UTF8', '--no-sync'],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"initdb failed: {result.stderr.strip()}")
+
+    port = _free_port()
+    options = f"-p {port} -c listen_addresses=127.0.0.1 -k {data_dir} -c fsync=off -c synchronous_commit=off"
+    result = subprocess.run(
+        [pg_ctl, '-D', data_dir, '-l', os.path.join(data_dir, 'server.log'), '-w', '-o', options, 'start'],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"pg_ctl start failed: {result.stderr.strip()}")
+
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, '-D', data_dir, '-m', 'immediate', 'stop'], capture_output=True)
+
+
+def apply_schema(database_url: str):
+    """Create the full current schema on an empty database: init_database(), then every migration."""
+    from mkw_stats.database import DatabaseManager
+    from mkw_stats.migration_runner import MigrationRunner
+
+    db = DatabaseManager(database_url)
+    try:
+        MigrationRunner(db, throttle_seconds=0).run()
+    finally:
+        db.close()
+
+
+def _copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """COPY rows into table in CSV chunks. None becomes NULL; dicts/lists become JSON."""
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = total = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        writer.writerow([json.dumps(value) if isinstance(value, (dict, list)) else value for value in row])
+        pending += 1
+        total += 1
+        if pending >= COPY_CHUNK_ROWS:
+            flush()
+            pending = 0
+    if pending:
+        flush()
+    return total
+
+
+# Base stats exactly as save_war accumulates them, for every player at once
+PLAYER_BASE_STATS_SQL = """
+    UPDATE players p
+    SET total_score = s.total_score,
+        total_races = s.total_races,
+        war_count = s.war_count,
+        average_score = COALESCE(ROUND(s.total_score / NULLIF(s.war_count, 0), 2), 0),
+        last_war_date = s.last_war_date,
+        total_team_differential = s.total_team_differential
+    FROM (
+        SELECT pwp.player_id,
+               SUM(pwp.score) AS total_score,
+               SUM(pwp.races_played) AS total_races,
+               SUM(pwp.war_participation) AS war_count,
+               MAX(w.war_date) AS last_war_date,
+               SUM(TRUNC(w.team_differential * pwp.war_participation)::INTEGER) AS total_team_differential
+        FROM player_war_performances pwp
+        JOIN wars w ON w.id = pwp.war_id
+        GROUP BY pwp.player_id
+    ) s
+    WHERE p.id = s.player_id
+"""
+
+
+class SyntheticDataGenerator:
+    """Deterministic (per seed) guilds, rosters and war history."""
+
+    def __init__(self, scale: Scale, seed: int = 42):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.today = date.today()
+
+    def _unique_name(self, used: set, tagged: bool) -> str:
+        while True:
+            name = ''.join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4))).capitalize()
+            if tagged:
+                name = f"{self.rng.choice(CLAN_TAGS)} {name}"
+            if name.casefold() not in used:
+                used.add(name.casefold())
+                return name
+
+    def _guild(self, index: int) -> Dict:
+        guild_id = FIRST_GUILD_ID + index
+        teams = self.rng.sample(TEAM_POOL, self.rng.randint(1, 3))
+        return {
+            'guild_id': guild_id,
+            'guild_name': f"Synthetic Clan {index + 1}",
+            'team_names': teams,
+            'team_tags': {team: team[:2].upper() for team in teams if self.rng.random() < 0.5},
+            'ocr_channel_id': self._snowflake() if self.rng.random() < 0.7 else None,
+            'role_ids': (self._snowflake(), self._snowflake(), self._snowflake()),
+        }
+
+    def _snowflake(self) -> int:
+        """Random Discord-sized ID for channels, roles and users."""
+        return self.rng.randrange(10 ** 17, 10 ** 18)
+
+    def _roster(self, guild: Dict, first_id: int) -> List[Dict]:
+        used = set()
+        statuses, weights = zip(*MEMBER_STATUSES)
+        players = []
+        for offset in range(self.scale.players_per_guild):
+            name = self._unique_name(used, tagged=self.rng.random() < 0.2)
+            nicknames = [self._unique_name(used, tagged=False).lower() for _ in range(self.rng.choice([0, 0, 1, 1, 2, 3]))]
+            linked = self.rng.random() < 0.7
+            players.append({
+                'id': first_id + offset,
+                'player_name': name,
+                'guild_id': guild['guild_id'],
+                'team': self.rng.choice(guild['team_names'] + ['Unassigned']),
+                'nicknames': nicknames,
+                'member_status': self.rng.choices(statuses, weights)[0],
+                'is_active': self.rng.random() >= INACTIVE_PLAYER_RATE,
+                'discord_user_id': self._snowflake() if linked else None,
+                'display_name': name if linked else None,
+                'discord_username': name.lower().replace(' ', '_') if linked else None,
+                'country_code': self.rng.choice(COUNTRIES) if linked else None,
+                # Skill and how often they play shape their war history
+                'skill': min(140.0, max(40.0, self.rng.gauss(85, 15))),
+                'activity': self.rng.lognormvariate(0, 0.8),
+            })
+        return players
+
+    def _lineup(self, players: List[Dict]) -> List[Dict]:
+        lineup, seen = [], set()
+        weights = [p['activity'] for p in players]
+        while len(lineup) < min(LINEUP_SIZE + 1, len(players)):
+            player = self.rng.choices(players, weights)[0]
+            if player['id'] not in seen:
+                seen.add(player['id'])
+                lineup.append(player)
+        return lineup
+
+    def _score(self, player: Dict, races: int) -> int:
+        full_war = self.rng.gauss(player['skill'], 12)
+        return int(min(15 * races, max(races, round(full_war * races / RACES_PER_WAR))))
+
+    def _wars(self, guild: Dict, players: List[Dict], first_war_id: int):
+        """Yield (war row, [performance rows]) oldest first."""
+        dates = sorted(self.today - timedelta(days=self.rng.randint(0, HISTORY_DAYS))
+                       for _ in range(self.scale.wars_per_guild))
+        for offset, war_date in enumerate(dates):
+            war_id = first_war_id + offset
+            created_at = datetime.combine(war_date, dt_time(self.rng.randint(0, 23), self.rng.randint(0, 59)),
+                                          tzinfo=timezone.utc)
+            # Kicked and removed players played before they left, so they have history too
+            lineup = self._lineup(players)
+            slots = [(player, RACES_PER_WAR) for player in lineup[:LINEUP_SIZE]]
+            if len(lineup) > LINEUP_SIZE and self.rng.random() < SUB_WAR_RATE:
+                races = self.rng.randint(4, 8)
+                slots[-1] = (slots[-1][0], races)
+                slots.append((lineup[LINEUP_SIZE], RACES_PER_WAR - races))
+
+            results = []
+            performances = []
+            for player, races in slots:
+                score = self._score(player, races)
+                participation = round(races / RACES_PER_WAR, 3)
+                results.append({'name': player['player_name'], 'score': score,
+                                'races_played': races, 'war_participation': participation})
+                performances.append((player['id'], war_id, score, races, participation, created_at))
+
+            team_score = sum(result['score'] for result in results)
+            team_differential = team_score - (82 * RACES_PER_WAR - team_score)
+            players_data = {'race_count': RACES_PER_WAR, 'results': results, 'timestamp': created_at.isoformat()}
+            # Results carry roster names, so they resolve to themselves
+            war = (war_id, war_date, RACES_PER_WAR, players_data, guild['guild_id'],
+                   team_score, team_differential, len(results), created_at,
+                   war_fingerprint(results, RACES_PER_WAR))
+            yield war, performances
+
+    def generate(self, db) -> Dict:
+        """Load the synthetic data into db's (empty, migrated) database.
+
+        Returns:
+            Row counts and timings: {'guilds', 'players', 'wars', 'performances', 'load_seconds', 'derive_seconds'}
+        """
+        started = time.perf_counter()
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM players")
+            next_player_id = cursor.fetchone()[0] + 1
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM wars")
+            next_war_id = cursor.fetchone()[0] + 1
+
+            guilds, rosters = [], []
+            for index in range(self.scale.guilds):
+                guild = self._guild(index)
+                roster = self._roster(guild, next_player_id)
+                next_player_id += len(roster)
+                guilds.append(guild)
+                rosters.append(roster)
+
+            _copy_rows(cursor, 'guild_configs', [
+                'guild_id', 'guild_name', 'team_names', 'is_active', 'ocr_channel_id', 'team_tags',
+                'role_member_id', 'role_trial_id', 'role_ally_id',
+            ], [
+                (g['guild_id'], g['guild_name'], g['team_names'], True, g['ocr_channel_id'], g['team_tags'], *g['role_ids'])
+                for g in guilds
+            ])
+
+            player_count = _copy_rows(cursor, 'players', [
+                'id', 'player_name', 'guild_id', 'team', 'nicknames', 'added_by', 'is_active', 'member_status',
+                'discord_user_id', 'display_name', 'discord_username', 'country_code',
+            ], [
+                (p['id'], p['player_name'], p['guild_id'], p['team'], p['nicknames'], 'synthetic', p['is_active'],
+                 p['member_status'], p['discord_user_id'], p['display_name'], p['discord_username'], p['country_code'])
+                for roster in rosters for p in roster
+            ])
+
+            # Wars first (performances reference them), one guild at a time to bound memory
+            war_count = performance_count = 0
+            for guild, roster in zip(guilds, rosters):
+                wars, performances = [], []
+                for war, war_performances in self._wars(guild, roster, next_war_id):
+                    wars.append(war)
+                    performances.extend(war_performances)
+                next_war_id += len(wars)
+                war_count += _copy_rows(cursor, 'wars', [
+                    'id', 'war_date', 'race_count', 'players_data', 'guild_id',
+                    'team_score', 'team_differential', 'player_count', 'created_at', 'fingerprint',
+                ], wars)
+                # war_created_at/guild_id/team_differential are filled by the pwp_copy_war_columns trigger
+                performance_count += _copy_rows(cursor, 'player_war_performances', [
+                    'player_id', 'war_id', 'score', 'races_played', 'war_participation', 'created_at',
+                ], performances)
+
+            for table in ('players', 'wars', 'player_war_performances'):
+                cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), MAX(id)) FROM {table}")
+            conn.commit()
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(PLAYER_BASE_STATS_SQL)
+            cursor.execute(f"""
+                INSERT INTO player_aliases (guild_id, alias_casefold, player_id, kind)
+                {db.PLAYER_ALIAS_ROWS_SQL}
+                ON CONFLICT (guild_id, alias_casefold) DO NOTHING
+            """, {'player_id': None})
+            conn.commit()
+        if db.recompute_player_aggregates() is None:
+            raise RuntimeError("recompute_player_aggregates failed")
+        for guild in guilds:
+            db.refresh_leaderboard_snapshots(guild['guild_id'])
+
+        with db.get_connection() as conn:
+            conn.autocommit = True
+            try:
+                conn.cursor().execute("ANALYZE")
+            finally:
+                conn.autocommit = False
+        derive_seconds = time.perf_counter() - started
+
+        return {
+            'guilds': len(guilds),
+            'players': player_count,
+            'wars': war_count,
+            'performances': performance_count,
+            'load_seconds': round(load_seconds, 2),
+            'derive_seconds': round(derive_seconds, 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill an empty database with synthetic guilds and wars")
+    parser.add_argument('database_url', help="URL of an empty database")
+    parser.add_argument('scale', nargs='?', default='small', choices=sorted(SCALES))
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from mkw_stats.database import DatabaseManager
+
+    database_url, scale, seed = args.database_url, SCALES[args.scale], args.seed
+
+    print(f"🧪 Synthetic data: {scale.guilds} guilds x {scale.players_per_guild} players x "
+          f"{scale.wars_per_guild} wars (seed {seed})")
+    print("=" * 40)
+    apply_schema(database_url)
+    db = DatabaseManager(database_url)
+    try:
+        summary = SyntheticDataGenerator(scale, seed).generate(db)
+    finally:
+        db.close()
+    for key, value in summary.items():
+        print(f"  {key:<14} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Autocomplete index tests.
+
+The unit tests pin AutocompleteIndex's ranking on hand-built rosters: prefix
+matches before substring and fuzzy trigram matches, names before nicknames,
+and case- and accent-insensitive matching. The integration tests check that
+DatabaseManager.autocomplete_players follows the roster when a player is
+removed or renamed (the guild cache rebuilds the index), and that a name alias
+a removed player had taken over goes back to the nickname's owner.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_autocomplete_index.py
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mkw_stats.autocomplete_index import AutocompleteIndex, build_player_index
+
+AUTOCOMPLETE_GUILD_ID = 700000000000000043
+
+
+def index(*entries):
+    return AutocompleteIndex((value, aliases) for value, *aliases in entries)
+
+
+# ==================== UNIT ====================
+
+@pytest.mark.unit
+def test_prefix_matches_rank_before_substrings():
+    roster = index(('Rakai Storm',), ('Akai',), ('Kaito',), ('Kairo',))
+    assert roster.search('kai') == ['Kairo', 'Kaito', 'Akai', 'Rakai Storm']
+
+
+@pytest.mark.unit
+def test_prefix_matches_rank_before_trigram_typos():
+    roster = index(('Kairo',), ('Kairpa',), ('Zed',))
+    # 'kairp' is a prefix of Kairpa and a typo of Kairo
+    assert roster.search('kairp') == ['Kairpa', 'Kairo']
+    assert roster.search('kairo') == ['Kairo', 'Kairpa']
+    # Too few shared trigrams to count as a typo
+    assert roster.search('kiaro') == []
+
+
+@pytest.mark.unit
+def test_word_prefix_ranks_after_name_prefix():
+    roster = index(('CAP ahaha',), ('Ahab',))
+    assert roster.search('aha') == ['Ahab', 'CAP ahaha']
+
+
+@pytest.mark.unit
+def test_matching_ignores_case_and_accents():
+    roster = index(('José',), ('Jose Luis',), ('ZOË', 'Renée'))
+    assert roster.search('JOSE') == ['José', 'Jose Luis']
+    assert roster.search('josé') == ['José', 'Jose Luis']
+    assert roster.search('zoe') == ['ZOË']
+    assert roster.search('RENEE') == ['ZOË']
+
+
+@pytest.mark.unit
+def test_alias_hits_return_the_player_and_rank_below_names():
+    roster = index(('Kaiser',), ('Moka', 'kaiju'), ('Bolt', 'kai'), ('Kai',))
+    # Exact name, exact nickname, name prefix, nickname prefix
+    assert roster.search('kai') == ['Kai', 'Bolt', 'Kaiser', 'Moka']
+    # Fuzzy matches only fill the page after the alias hit
+    assert roster.search('kaij')[0] == 'Moka'
+
+
+@pytest.mark.unit
+def test_roster_rows_index_names_and_nicknames():
+    roster = build_player_index([{'player_name': 'Vyra', 'nicknames': ['vy', None]},
+                                 {'player_name': 'Luma', 'nicknames': None}])
+    assert len(roster) == 2
+    assert roster.search('vy') == ['Vyra']
+    assert roster.search('') == ['Luma', 'Vyra']
+
+
+# ==================== INTEGRATION ====================
+
+def _wait_for(check, timeout=5.0):
+    """Poll until check() is true: cache invalidations from other sessions arrive asynchronously."""
+    deadline = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.fixture
+def roster_db(seeded_db):
+    """seeded_db with its own small guild, so the shared guild's roster isn't touched."""
+    db = seeded_db
+    assert db.create_guild_config(AUTOCOMPLETE_GUILD_ID, 'Autocomplete Guild', ['Phantom'])
+    for name in ('Kairo', 'Kaito', 'Rakai Storm'):
+        assert db.add_roster_player(name, 'pytest', guild_id=AUTOCOMPLETE_GUILD_ID)
+    assert db.add_nickname('Kaito', 'tito', AUTOCOMPLETE_GUILD_ID)
+    yield db
+    with db.get_connection() as conn:
+        conn.cursor().execute("DELETE FROM players WHERE guild_id = %s", (AUTOCOMPLETE_GUILD_ID,))
+        conn.cursor().execute("DELETE FROM guild_configs WHERE guild_id = %s", (AUTOCOMPLETE_GUILD_ID,))
+        conn.commit()
+    db.guild_cache.invalidate(AUTOCOMPLETE_GUILD_ID)
+
+
+@pytest.mark.integration
+def test_removed_player_leaves_autocomplete(roster_db):
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'kai') == ['Kairo', 'Kaito', 'Rakai Storm']
+
+    assert roster_db.remove_roster_player('Kaito', AUTOCOMPLETE_GUILD_ID)
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'kai') == ['Kairo', 'Rakai Storm']
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'tito') == []
+
+
+@pytest.mark.integration
+def test_renamed_player_is_found_by_the_new_name(roster_db):
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'tito') == ['Kaito']
+
+    # A rename from outside the bot (the dashboard, a manual fix) reaches the cache as a notification
+    with roster_db.get_connection() as conn:
+        conn.cursor().execute("""
+            UPDATE players SET player_name = 'Zéphyr' WHERE guild_id = %s AND player_name = 'Kaito'
+        """, (AUTOCOMPLETE_GUILD_ID,))
+        conn.commit()
+
+    assert _wait_for(lambda: roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'kai') == ['Kairo', 'Rakai Storm'])
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'zephyr') == ['Zéphyr']
+    assert roster_db.autocomplete_players(AUTOCOMPLETE_GUILD_ID, 'tito') == ['Zéphyr']
+
+
+@pytest.mark.integration
+def test_freed_name_alias_returns_to_the_nickname_owner(roster_db):
+    def alias_owner(alias):
+        with roster_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.player_name FROM player_aliases pa JOIN players p ON p.id = pa.player_id
+                WHERE pa.guild_id = %s AND pa.alias_casefold = %s
+            """, (AUTOCOMPLETE_GUILD_ID, alias))
+            return [row[0] for row in cursor.fetchall()]
+
+    # A player named like Kaito's nickname takes the alias over...
+    assert roster_db.add_roster_player('Tito', 'pytest', guild_id=AUTOCOMPLETE_GUILD_ID)
+    assert alias_owner('tito') == ['Tito']
+
+    # ...and gives it back when they leave the roster
+    assert roster_db.remove_roster_player('Tito', AUTOCOMPLETE_GUILD_ID)
+    assert alias_owner('tito') == ['Kaito']
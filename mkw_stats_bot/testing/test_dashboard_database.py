@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Dashboard API database tests.
+
+The dashboard (mkw-dashboard-api) writes to the bot's database with its own
+DatabaseManager, so these tests run it against a throwaway database migrated
+with the bot's schema and check the result with the bot's DatabaseManager:
+aliases stay unique and freed aliases return to their owner, a confirmed bulk
+review leaves the running aggregates as the bot would and invalidates the
+cached metrics, its metrics follow the bot's war_count minimums, and the code
+and SQL the dashboard copies from the bot stay identical.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_dashboard_database.py
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'mkw-dashboard-api')
+sys.path.append(DASHBOARD_DIR)
+
+pytest.importorskip('psycopg2')
+pytest.importorskip('pydantic_settings')
+
+DASHBOARD_GUILD_ID = 700000000000000031
+
+
+@pytest.fixture(scope='module')
+def databases(postgres_server_url):
+    """(bot DatabaseManager, dashboard DatabaseManager) on one fully migrated throwaway database."""
+    from mkw_stats.database import DatabaseManager
+    from testing.synthetic_data import apply_schema, temporary_database
+    from app.database import DatabaseManager as DashboardDatabaseManager
+
+    with temporary_database(postgres_server_url, f"mkw_dashboard_{os.getpid()}") as url:
+        apply_schema(url)
+        bot_db = DatabaseManager(url)
+        dashboard_db = DashboardDatabaseManager(url)
+        assert bot_db.create_guild_config(DASHBOARD_GUILD_ID, 'Dashboard Guild', ['Phantom'])
+        yield bot_db, dashboard_db
+        dashboard_db.connection_pool.closeall()
+        bot_db.close()
+
+
+def alias_owner(db, alias):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.player_name FROM player_aliases pa JOIN players p ON p.id = pa.player_id
+            WHERE pa.guild_id = %s AND pa.alias_casefold = %s
+        """, (DASHBOARD_GUILD_ID, alias))
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.mark.unit
+def test_alias_sql_matches_the_bot():
+    from mkw_stats.database import DatabaseManager
+    from app.database import DatabaseManager as DashboardDatabaseManager
+
+    assert DashboardDatabaseManager.PLAYER_ALIAS_ROWS_SQL == DatabaseManager.PLAYER_ALIAS_ROWS_SQL
+    assert DashboardDatabaseManager.PLAYER_AGGREGATE_RECOMPUTE_SQL == DatabaseManager.PLAYER_AGGREGATE_RECOMPUTE_SQL
+    assert DashboardDatabaseManager.PLAYER_AGGREGATE_UPDATE_SQL == DatabaseManager.PLAYER_AGGREGATE_UPDATE_SQL
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('module', ['stats_engine', 'war_fingerprint'])
+def test_copied_modules_match_the_bot(module):
+    """The dashboard deploys without mkw_stats, so it carries copies; only the docstrings may differ."""
+    pytest.importorskip('numpy')
+    import importlib
+
+    bot_module = importlib.import_module(f'mkw_stats.{module}')
+    dashboard_module = importlib.import_module(f'app.{module}')
+    for name, value in vars(dashboard_module).items():
+        if name.startswith('__') or getattr(value, '__module__', module) not in (dashboard_module.__name__, module):
+            continue
+        if inspect.isfunction(value) or inspect.isclass(value):
+            assert inspect.getsource(value) == inspect.getsource(getattr(bot_module, name)), name
+        elif not inspect.ismodule(value):
+            assert value == getattr(bot_module, name), name
+
+
+@pytest.mark.integration
+def test_nickname_of_another_player_is_refused(databases):
+    bot_db, dashboard_db = databases
+    assert dashboard_db.add_player('Orin', DASHBOARD_GUILD_ID)
+    assert dashboard_db.add_player('Pell', DASHBOARD_GUILD_ID)
+    assert dashboard_db.add_nickname('Orin', DASHBOARD_GUILD_ID, 'oro')
+
+    assert not dashboard_db.add_nickname('Pell', DASHBOARD_GUILD_ID, 'ORO')
+    assert not dashboard_db.add_nickname('Pell', DASHBOARD_GUILD_ID, 'orin')
+    assert alias_owner(bot_db, 'oro') == ['Orin']
+    assert bot_db.get_player_nicknames('Pell', DASHBOARD_GUILD_ID) == []
+
+
+@pytest.mark.integration
+def test_freed_name_alias_returns_to_the_nickname_owner(databases):
+    bot_db, dashboard_db = databases
+    assert dashboard_db.add_player('Quill', DASHBOARD_GUILD_ID)
+    assert dashboard_db.add_nickname('Quill', DASHBOARD_GUILD_ID, 'rook')
+
+    # A dashboard-added player named like the nickname takes the alias over...
+    assert dashboard_db.add_player('Rook', DASHBOARD_GUILD_ID)
+    assert alias_owner(bot_db, 'rook') == ['Rook']
+
+    # ...and gives it back when the bot removes them
+    assert bot_db.remove_roster_player('Rook', DASHBOARD_GUILD_ID)
+    assert alias_owner(bot_db, 'rook') == ['Quill']
+
+    # Reactivated from the dashboard, the name wins again
+    assert dashboard_db.add_player('Rook', DASHBOARD_GUILD_ID)
+    assert alias_owner(bot_db, 'rook') == ['Rook']
+
+
+@pytest.mark.integration
+def test_confirmed_bulk_review_keeps_running_aggregates(databases):
+    pytest.importorskip('fastapi')
+    from app.routes.bulk import confirm_session
+
+    bot_db, dashboard_db = databases
+    lineup = ['Sable', 'Tarn', 'Umbra', 'Vale']
+    for name in lineup:
+        assert dashboard_db.add_player(name, DASHBOARD_GUILD_ID)
+    assert bot_db.save_war([{'name': name, 'score': 80 + i, 'races': 12} for i, name in enumerate(lineup)],
+                           guild_id=DASHBOARD_GUILD_ID)
+    assert bot_db.refresh_guild_volatile_metrics(DASHBOARD_GUILD_ID, lineup) == len(lineup)
+    assert bot_db.get_guild_leaderboard_page(DASHBOARD_GUILD_ID, 'avg', lineup)['version'] is not None
+
+    wars = [
+        [{'name': 'Sable', 'score': 150}, {'name': 'Tarn', 'score': 110},
+         {'name': 'Umbra', 'score': 120}, {'name': 'Vale', 'score': 140}],
+        [{'name': 'Sable', 'score': 20}, {'name': 'Tarn', 'score': 45, 'races_played': 6},
+         {'name': 'Umbra', 'score': 60}, {'name': 'Vale', 'score': 50}],
+    ]
+    session = dashboard_db.create_bulk_session(DASHBOARD_GUILD_ID, 1, [{'players': war} for war in wars])
+    for result in dashboard_db.get_bulk_results(session['token']):
+        assert dashboard_db.update_bulk_result(result['id'], 'approved')
+
+    confirmed = asyncio.run(confirm_session(session['token'], db=dashboard_db))
+    assert confirmed['wars_created'] == 2
+
+    assert bot_db.verify_player_aggregates(DASHBOARD_GUILD_ID) == []
+    with bot_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT stale FROM leaderboard_snapshot_versions WHERE guild_id = %s", (DASHBOARD_GUILD_ID,))
+        assert cursor.fetchone() == (True,)
+    sable = bot_db.get_player_stats('Sable', DASHBOARD_GUILD_ID)
+    assert (sable['highest_score'], sable['lowest_score']) == (150, 20)
+    assert (sable['wins'], sable['losses']) == (1, 2)
+
+    # The cached volatile metrics are stale now, and the leaderboards re-queue the players
+    with bot_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM players
+            WHERE guild_id = %s AND player_name = ANY(%s) AND cached_metrics_updated_at IS NULL
+        """, (DASHBOARD_GUILD_ID, lineup))
+        assert cursor.fetchone()[0] == len(lineup)
+    assert bot_db.get_players_missing_metric('clutch', DASHBOARD_GUILD_ID) == {DASHBOARD_GUILD_ID: lineup}
+
+
+@pytest.mark.integration
+def test_metrics_follow_the_war_count_minimums(databases):
+    bot_db, dashboard_db = databases
+    assert dashboard_db.add_player('Wren', DASHBOARD_GUILD_ID)
+
+    # Two half wars, one of them close: enough performances for a clutch factor, but war_count is 1
+    for score in (480, 70):
+        assert bot_db.save_war([{'name': 'Wren', 'score': score, 'races': 6}], guild_id=DASHBOARD_GUILD_ID)
+    metrics = dashboard_db.get_player_metrics(DASHBOARD_GUILD_ID, 'wren')['Wren']
+    assert metrics['clutch_factor'] is None
+
+    assert bot_db.save_war([{'name': 'Wren', 'score': 90, 'races': 12}], guild_id=DASHBOARD_GUILD_ID)
+    metrics = dashboard_db.get_player_metrics(DASHBOARD_GUILD_ID, 'Wren')['Wren']
+    assert metrics['clutch_factor'] is not None
+    assert (metrics['avg10_score'], metrics['form_score'], metrics['potential']) == (None, None, None)
+
+    for score in range(80, 88):
+        assert bot_db.save_war([{'name': 'Wren', 'score': score, 'races': 12}], guild_id=DASHBOARD_GUILD_ID)
+    metrics = dashboard_db.get_player_metrics(DASHBOARD_GUILD_ID, 'Wren')['Wren']
+    assert metrics['avg10_score'] is not None and metrics['potential'] is not None
+
+    # Same values the bot caches
+    assert bot_db.refresh_guild_volatile_metrics(DASHBOARD_GUILD_ID, ['Wren']) == 1
+    cached = bot_db.get_player_stats('Wren', DASHBOARD_GUILD_ID)
+    for metric in ('avg10_score', 'form_score', 'clutch_factor', 'potential'):
+        assert metrics[metric] == cached[metric], metric
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Migration runner tests.
+
+Each test runs against its own throwaway database: the full MIGRATIONS list
+on an empty database (then again, as a no-op), the pending versions the bot
+checks at startup, adoption of a database the old scripts migrated, a
+backfill interrupted mid-run and resumed, a DDL step that waits out a lock
+held by another session, an invalid index left by an interrupted
+CONCURRENTLY build, and the per-guild backfills rolling back with their
+chunk.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_migration_runner.py
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('psycopg2')
+
+from mkw_stats.migration_runner import (
+    MIGRATION_LOCK_KEY, AddColumns, Backfill, CreateIndex, Migration, MigrationRunner, Sql,
+)
+
+COUNTER_ROWS = 50
+
+COUNTER_TABLE = Sql('counters', """
+    CREATE TABLE IF NOT EXISTS counters (id SERIAL PRIMARY KEY, bumps INTEGER NOT NULL DEFAULT 0);
+    INSERT INTO counters (bumps) SELECT 0 FROM generate_series(1, 50) WHERE NOT EXISTS (SELECT 1 FROM counters);
+""")
+
+
+@pytest.fixture
+def db(postgres_server_url, request):
+    from mkw_stats.database import DatabaseManager
+    from testing.synthetic_data import temporary_database
+
+    with temporary_database(postgres_server_url, f"mkw_migrate_{request.node.name[5:30]}_{os.getpid()}") as url:
+        db = DatabaseManager(url)
+        yield db
+        db.close()
+
+
+def query(db, sql, params=None):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+@pytest.mark.integration
+def test_full_schema_then_noop(db):
+    runner = MigrationRunner(db, throttle_seconds=0)
+    assert runner.run() == [migration.version for migration in runner.migrations]
+    assert {entry['state'] for entry in runner.status()} == {'applied'}
+    assert query(db, "SELECT to_regclass('idx_wars_guild_fingerprint') IS NOT NULL")[0][0]
+
+    assert runner.run() == []
+
+
+@pytest.mark.integration
+def test_pending_versions_for_the_startup_check(db):
+    runner = MigrationRunner(db, throttle_seconds=0)
+    versions = [migration.version for migration in runner.migrations]
+    assert runner.pending_versions() == versions
+
+    runner.run(target=versions[-3])
+    # Readable while another process holds the migration lock
+    with db.get_connection() as conn:
+        conn.cursor().execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        try:
+            assert runner.pending_versions() == versions[-2:]
+        finally:
+            conn.cursor().execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+
+
+@pytest.mark.integration
+def test_database_migrated_by_old_scripts_is_adopted(db):
+    runner = MigrationRunner(db, throttle_seconds=0)
+    runner.run()
+    # As if every change had come from the one-off scripts
+    with db.get_connection() as conn:
+        conn.cursor().execute("DELETE FROM schema_version; DELETE FROM schema_migration_progress")
+        conn.commit()
+
+    assert runner.run() == []
+    assert {entry['state'] for entry in runner.status()} == {'adopted'}
+
+
+@pytest.mark.integration
+def test_interrupted_backfill_resumes_after_last_chunk(db):
+    interrupt = {'at': 23}
+
+    def bump(db, cursor, keys):
+        if interrupt['at'] in keys:
+            raise RuntimeError("deploy killed")
+        cursor.execute("UPDATE counters SET bumps = bumps + 1 WHERE id = ANY(%s)", (keys,))
+        return cursor.rowcount
+
+    migrations = [Migration(1, 'counters', (COUNTER_TABLE, Backfill('bump', 'counters', apply=bump)))]
+    runner = MigrationRunner(db, migrations, batch_size=10, throttle_seconds=0)
+
+    with pytest.raises(RuntimeError):
+        runner.run()
+    [status] = runner.status()
+    assert status['state'] == 'in progress'
+    assert status['steps']['bump'] == {'rows_done': 20, 'completed': False}
+    assert query(db, "SELECT COUNT(*) FROM counters WHERE bumps = 1")[0][0] == 20
+
+    interrupt['at'] = None
+    assert runner.run() == [1]
+    # Every row bumped exactly once: committed chunks weren't redone, the failed one was rolled back
+    assert query(db, "SELECT bumps, COUNT(*) FROM counters GROUP BY bumps") == [(1, COUNTER_ROWS)]
+    assert query(db, "SELECT rows_done FROM schema_migration_progress WHERE step = 'bump'") == [(COUNTER_ROWS,)]
+
+
+@pytest.mark.integration
+def test_ddl_retries_while_table_is_locked(db):
+    migrations = [Migration(1, 'counters', (COUNTER_TABLE,)),
+                  Migration(2, 'label', (AddColumns('counters', (('label', 'TEXT'),)),))]
+    runner = MigrationRunner(db, migrations, throttle_seconds=0, lock_timeout_ms=100)
+    runner.run(target=1)
+
+    # A long read holds the table; the ALTER must not queue behind it for more than lock_timeout
+    with db.get_connection() as reader:
+        reader.cursor().execute("LOCK TABLE counters IN ACCESS SHARE MODE")
+        release = threading.Timer(0.5, reader.rollback)
+        release.start()
+        try:
+            assert runner.run() == [2]
+        finally:
+            release.join()
+
+    assert query(db, "SELECT column_name FROM information_schema.columns "
+                     "WHERE table_name = 'counters' AND column_name = 'label'") == [('label',)]
+
+
+@pytest.mark.integration
+def test_invalid_index_is_rebuilt(db):
+    migrations = [Migration(1, 'counters', (COUNTER_TABLE,)),
+                  Migration(2, 'unique bumps', (CreateIndex('idx_counters_unique', "counters (id, bumps)", unique=True),))]
+    runner = MigrationRunner(db, migrations, throttle_seconds=0)
+    runner.run(target=1)
+
+    # A failed CONCURRENTLY build leaves the index behind, marked invalid
+    with db.get_connection() as conn:
+        conn.autocommit = True
+        with pytest.raises(Exception):
+            conn.cursor().execute("CREATE UNIQUE INDEX CONCURRENTLY idx_counters_unique ON counters ((bumps))")
+        conn.autocommit = False
+    assert query(db, "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass('idx_counters_unique')") == [(False,)]
+
+    assert runner.run() == [2]
+    assert query(db, "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass('idx_counters_unique')") == [(True,)]
+    assert query(db, "SELECT pg_get_indexdef('idx_counters_unique'::regclass)")[0][0].endswith("(id, bumps)")
+
+
+@pytest.mark.integration
+def test_guild_backfills_write_through_the_chunk_transaction(db):
+    from mkw_stats.migrations import _backfill_leaderboard_snapshots, _backfill_player_aggregates
+
+    MigrationRunner(db, throttle_seconds=0).run()
+    assert db.create_guild_config(4242, 'Backfill Guild', ['Phantom'])
+    for name in ('Arlo', 'Bex'):
+        assert db.add_roster_player(name, 'pytest', guild_id=4242)
+    assert db.save_war([{'name': 'Arlo', 'score': 90, 'races': 12}, {'name': 'Bex', 'score': 70, 'races': 12}],
+                       guild_id=4242)
+    with db.get_connection() as conn:
+        conn.cursor().execute("UPDATE players SET stat_war_rows = 0 WHERE guild_id = 4242; "
+                              "DELETE FROM leaderboard_snapshots WHERE guild_id = 4242")
+        conn.commit()
+
+    # A chunk that fails after the backfill ran must leave nothing behind
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        assert _backfill_player_aggregates(db, cursor, [4242]) == 2
+        assert _backfill_leaderboard_snapshots(db, cursor, [4242]) == 1
+        conn.rollback()
+    assert query(db, "SELECT SUM(stat_war_rows) FROM players WHERE guild_id = 4242") == [(0,)]
+    assert query(db, "SELECT COUNT(*) FROM leaderboard_snapshots WHERE guild_id = 4242") == [(0,)]
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        _backfill_player_aggregates(db, cursor, [4242])
+        _backfill_leaderboard_snapshots(db, cursor, [4242])
+        conn.commit()
+    assert db.verify_player_aggregates(4242) == []
+    assert query(db, "SELECT COUNT(*) > 0 FROM leaderboard_snapshots WHERE guild_id = 4242") == [(True,)]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Query-count regression tests.
+
+Runs the hot flows against a throwaway Postgres seeded with a 30-player guild
+(see conftest.py) and checks how many statements each issues and how long they
+spend in the database, as counted by query_stats.query_scope. Budgets leave
+headroom over the current cost but sit far below what a per-player query would
+add over 30 players, so an N+1 fails here instead of in production.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_query_counts.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('psycopg2')
+
+from mkw_stats.query_stats import query_scope
+
+pytestmark = pytest.mark.integration
+
+# (max statements, max total DB milliseconds) per flow. Measured on Postgres 16 with the
+# seeded guild, worst of three runs: statements / ms in the comments.
+OCR_PARSE_BUDGET = (3, 100)                 # 1 / 1.0 (roster load)
+ADD_RACE_RESULTS_BUDGET = (4, 100)          # 3 / 2.1
+SAVE_WAR_BUDGET = (8, 150)                  # 6 / 4.4
+REMOVE_WAR_BUDGET = (8, 150)                # 6 / 5.8
+DUPLICATE_CHECK_BUDGET = (3, 50)            # 2 / 1.5
+GUILD_LEADERBOARD_BUDGET = (4, 100)         # 3 / 1.4
+GUILD_LEADERBOARD_STALE_BUDGET = (8, 300)   # 7 / 10.9 (snapshot rebuild 4, page read 3)
+GLOBAL_LEADERBOARD_BUDGET = (4, 150)        # 3 / 1.8
+
+OPPONENT_NAMES = ['Zephyra', 'Quillon', 'Brimble', 'Fennick', 'Oxtavia', 'Wrenlow']
+
+
+def assert_within_budget(scope, budget):
+    max_queries, max_ms = budget
+    summary = scope.summary()
+    assert scope.queries <= max_queries, (
+        f"{scope.name} ran {scope.queries} statements (budget {max_queries}): {summary['by_site']}"
+    )
+    assert scope.total_ms <= max_ms, (
+        f"{scope.name} spent {scope.total_ms:.1f}ms in the database (budget {max_ms}ms): {summary['by_site']}"
+    )
+
+
+def war_results(lineup, base_score=80):
+    return [{'name': name, 'score': base_score + i, 'races': 12} for i, name in enumerate(lineup)]
+
+
+def test_ocr_parse_24_tokens(seeded_db, guild_id, guild_players, monkeypatch):
+    """A 6v6 results table (12 names, 12 scores) resolves from one roster load."""
+    pytest.importorskip('paddleocr')
+    from mkw_stats.ocr_processor import OCRProcessor
+
+    # Parsing only needs the database; don't load the OCR model
+    monkeypatch.setattr(OCRProcessor, '_initialize_ocr', lambda self: None)
+    processor = OCRProcessor(db_manager=seeded_db)
+
+    lineup = guild_players[:6]
+    rows = [(name, 120 - i) for i, name in enumerate(lineup)]
+    rows += [(name, 60 - i) for i, name in enumerate(OPPONENT_NAMES)]
+    extracted_texts = [{'text': f"{name} {score}", 'bbox': None} for name, score in rows]
+    assert sum(len(item['text'].split()) for item in extracted_texts) == 24
+
+    # Cold: the guild's roster is loaded once and every token resolves from it
+    seeded_db.guild_cache.invalidate(guild_id)
+    with query_scope('ocr_parse_cold') as scope:
+        results = processor._parse_mario_kart_results(extracted_texts, guild_id)
+    assert {result['name'] for result in results} == set(lineup)
+    assert_within_budget(scope, OCR_PARSE_BUDGET)
+
+    with query_scope('ocr_parse_warm') as scope:
+        processor._parse_mario_kart_results(extracted_texts, guild_id)
+    assert scope.queries == 0, f"warm OCR parse hit the database: {scope.summary()['by_site']}"
+
+
+def test_add_race_results(seeded_db, guild_id, guild_players):
+    with query_scope('add_race_results') as scope:
+        war_id = seeded_db.add_race_results(war_results(guild_players[:6]), guild_id=guild_id)
+    assert war_id
+    assert_within_budget(scope, ADD_RACE_RESULTS_BUDGET)
+
+    # Results without stats: remove the war without reverting anything
+    assert seeded_db.remove_wars_by_ids([war_id], guild_id=guild_id, revert_stats=False)
+
+
+def test_save_war(seeded_db, guild_id, guild_players):
+    with query_scope('save_war') as scope:
+        saved = seeded_db.save_war(war_results(guild_players[6:12]), guild_id=guild_id)
+    assert saved and len(saved['updated_players']) == 6
+    assert_within_budget(scope, SAVE_WAR_BUDGET)
+
+    assert seeded_db.remove_war_by_id(saved['war_id'], guild_id=guild_id) == 6
+
+
+def test_remove_war_by_id(seeded_db, guild_id, guild_players):
+    saved = seeded_db.save_war(war_results(guild_players[12:18]), guild_id=guild_id)
+    assert saved
+
+    with query_scope('remove_war_by_id') as scope:
+        reverted = seeded_db.remove_war_by_id(saved['war_id'], guild_id=guild_id)
+    assert reverted == 6
+    assert_within_budget(scope, REMOVE_WAR_BUDGET)
+
+
+def test_bulk_duplicate_check(seeded_db, guild_id):
+    """A whole bulk scan is checked against the guild's history in one name resolution and one lookup."""
+    wars = [(war['results'], war['race_count']) for war in seeded_db.get_all_wars(limit=20, guild_id=guild_id)]
+    assert len(wars) == 20
+
+    with query_scope('bulk_duplicate_check') as scope:
+        duplicates = seeded_db.find_duplicate_wars(wars, guild_id)
+    assert all(duplicate and 'war_id' in duplicate for duplicate in duplicates)
+    assert_within_budget(scope, DUPLICATE_CHECK_BUDGET)
+
+
+def _guild_leaderboard(db, guild_id):
+    """The database calls behind /stats with no player (leaderboard_slash + LeaderboardView)."""
+    members = [player['player_name'] for player in db.get_all_players_stats(guild_id)]
+    page = db.get_guild_leaderboard_page(guild_id, 'avg', members, include_unranked=True)
+    db.get_all_team_tags(guild_id)
+    return page
+
+
+def test_guild_leaderboard(seeded_db, guild_id, guild_players):
+    # Fresh snapshot: one page read
+    _guild_leaderboard(seeded_db, guild_id)
+    with query_scope('guild_leaderboard') as scope:
+        page = _guild_leaderboard(seeded_db, guild_id)
+    assert page and page['ranked_count'] == len(guild_players)
+    assert_within_budget(scope, GUILD_LEADERBOARD_BUDGET)
+
+    # After a war the snapshot is rebuilt in a constant number of statements
+    saved = seeded_db.save_war(war_results(guild_players[18:24]), guild_id=guild_id)
+    assert saved
+    try:
+        with query_scope('guild_leaderboard_stale') as scope:
+            assert _guild_leaderboard(seeded_db, guild_id)
+        assert_within_budget(scope, GUILD_LEADERBOARD_STALE_BUDGET)
+    finally:
+        seeded_db.remove_war_by_id(saved['war_id'], guild_id=guild_id)
+
+
+def test_global_leaderboard(seeded_db, guild_id):
+    """The database calls behind /leaderboard: first page with total, team tags, next page."""
+    with query_scope('global_leaderboard') as scope:
+        first_page = seeded_db.get_global_leaderboard_page('avg', include_total=True)
+        for gid in {player['guild_id'] for player in first_page['players']}:
+            seeded_db.get_all_team_tags(gid)
+        last = first_page['players'][-1]
+        next_page = seeded_db.get_global_leaderboard_page('avg', after=(last['sort_value'], last['id']))
+    assert first_page['total_count'] >= 20
+    assert next_page['players']
+    assert_within_budget(scope, GLOBAL_LEADERBOARD_BUDGET)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing tests.
+
+Two separate Postgres servers stand in for the primary and the replica (no
+replication between them): both get the full schema and the same guild, and the
+replica's roster has one extra player, so every read shows which server served
+it. Checks routing of declared read-only methods, read-your-writes pinning after
+a war save, lag and startup fallbacks, and that reads made inside a write stay
+on the primary.
+
+Usage:
+    TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres \\
+    TEST_REPLICA_DATABASE_URL=postgresql://postgres@localhost:5433/postgres \\
+    pytest testing/test_read_routing.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('psycopg2')
+
+from testing.synthetic_data import apply_schema, temporary_database
+
+pytestmark = pytest.mark.integration
+
+GUILD_ID = 910000000000000001
+TEAM_NAMES = ['Phantom']
+ROSTER = ['Kairo', 'Lumen', 'Vyxa', 'Tozen', 'Mirex', 'Shano']
+REPLICA_ONLY_PLAYER = 'Replicant'
+
+
+def _seed(db, players):
+    assert db.create_guild_config(GUILD_ID, 'Routing Guild', TEAM_NAMES)
+    for name in players:
+        assert db.add_roster_player(name, 'pytest', guild_id=GUILD_ID)
+
+
+def _roster_size(db):
+    """Active players, from get_member_status_counts (a declared read-only method)."""
+    return sum(db.get_member_status_counts(GUILD_ID).values())
+
+
+PRIMARY_SIZE = len(ROSTER)
+REPLICA_SIZE = len(ROSTER) + 1
+
+
+@pytest.fixture(scope='module')
+def databases(postgres_server_url, replica_server_url):
+    """(primary URL, replica URL), both migrated and seeded; the replica has one extra player."""
+    from mkw_stats.database import DatabaseManager
+
+    with temporary_database(postgres_server_url, f"mkw_routing_primary_{os.getpid()}") as primary_url, \
+            temporary_database(replica_server_url, f"mkw_routing_replica_{os.getpid()}") as replica_url:
+        for url, players in ((primary_url, ROSTER), (replica_url, ROSTER + [REPLICA_ONLY_PLAYER])):
+            apply_schema(url)
+            seeder = DatabaseManager(url)
+            _seed(seeder, players)
+            seeder.close()
+        yield primary_url, replica_url
+
+
+@pytest.fixture
+def routed_db(databases):
+    """DatabaseManager on the primary with the replica as its read URL."""
+    from mkw_stats.database import DatabaseManager
+
+    primary_url, replica_url = databases
+    db = DatabaseManager(primary_url, read_database_url=replica_url)
+    assert db.read_router is not None
+    yield db
+    db.close()
+
+
+def test_declared_reads_go_to_replica(routed_db):
+    # get_member_status_counts is in REPLICA_READ_METHODS; get_roster_players is not
+    assert _roster_size(routed_db) == REPLICA_SIZE
+    assert REPLICA_ONLY_PLAYER not in routed_db.get_roster_players(GUILD_ID)
+
+    stats = routed_db.get_replica_stats()
+    assert stats['replica_reads'] >= 1
+    assert stats['available'] and stats['lag_seconds'] == 0
+
+
+def test_war_save_pins_guild_reads_to_primary(routed_db):
+    saved = routed_db.save_war([{'name': name, 'score': 80, 'races': 12} for name in ROSTER], guild_id=GUILD_ID)
+    assert saved
+    try:
+        # Right after the save the guild reads its own write from the primary
+        assert _roster_size(routed_db) == PRIMARY_SIZE
+        war = routed_db.get_war_by_id(saved['war_id'], GUILD_ID)
+        assert war is not None
+        assert routed_db.get_replica_stats()['primary_fallbacks']['pinned'] >= 2
+
+        # Once the pin expires, reads go back to the replica
+        routed_db.read_router.pin_seconds = 0
+        routed_db.read_router.pin_guild(GUILD_ID)
+        assert _roster_size(routed_db) == REPLICA_SIZE
+    finally:
+        assert routed_db.remove_war_by_id(saved['war_id'], guild_id=GUILD_ID) == len(ROSTER)
+
+
+def test_reads_inside_writes_stay_on_primary(routed_db):
+    saved = routed_db.save_war([{'name': name, 'score': 70, 'races': 12} for name in ROSTER[:5]], guild_id=GUILD_ID)
+    assert saved
+    # Clear save_war's pin so only the routing rules decide where reads go
+    routed_db.read_router.pin_seconds = 0
+    routed_db.read_router.pin_guild(GUILD_ID)
+    try:
+        # append_players_to_war_by_id re-reads the war inside its own write; the
+        # war only exists on the primary
+        appended = routed_db.append_players_to_war_by_id(
+            saved['war_id'], [{'name': ROSTER[5], 'score': 70, 'races': 12}], guild_id=GUILD_ID
+        )
+        assert appended['updated_players'] == [ROSTER[5]]
+        assert routed_db.get_war_by_id(saved['war_id'], GUILD_ID) is None  # routed: the replica has no such war
+    finally:
+        assert routed_db.remove_war_by_id(saved['war_id'], guild_id=GUILD_ID) == len(ROSTER)
+
+
+def test_lagging_replica_falls_back_to_primary(routed_db):
+    router = routed_db.read_router
+    router.max_lag_seconds = -1  # any lag, even 0, is too much
+    router._next_check = 0       # re-check on the next read
+    assert _roster_size(routed_db) == PRIMARY_SIZE
+    assert router.stats()['primary_fallbacks']['lagging'] >= 1
+
+    router.max_lag_seconds = 5
+    router._next_check = 0
+    assert _roster_size(routed_db) == REPLICA_SIZE
+
+
+def test_unreachable_replica_at_startup_reads_from_primary(databases, replica_server_url):
+    from urllib.parse import urlparse
+
+    from mkw_stats.database import DatabaseManager
+
+    primary_url, _ = databases
+    missing_url = urlparse(replica_server_url)._replace(path='/mkw_routing_missing').geturl()
+    db = DatabaseManager(primary_url, read_database_url=missing_url)
+    try:
+        assert db.read_router is None
+        assert _roster_size(db) == PRIMARY_SIZE
+    finally:
+        db.close()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+stats_engine tests.
+
+The unit tests pin the thresholds on hand-built performances. The integration
+tests load the small synthetic dataset (synthetic_data.py) into a throwaway
+database and check that, for every player, stats_engine's guild-wide results
+equal the per-player DatabaseManager methods (get_player_form_score,
+get_player_clutch_factor, get_player_potential, get_player_stats_last_x_wars),
+that refresh_guild_volatile_metrics caches the same values, and that players
+whose cached metrics were invalidated are found for re-warming
+and stamped once refreshed, even without performance rows.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_stats_engine.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('numpy')
+
+from mkw_stats.stats_engine import (
+    GuildPerformances, clutch_factors, compute_guild_metrics, form_scores, last_x_stats, potentials,
+)
+
+SYNTHETIC_SEED = 47
+ALL_WARS = 1_000_000
+
+LAST_X_KEYS = ['total_score', 'total_races', 'war_count', 'num_wars', 'average_score',
+               'total_team_differential', 'highest_score', 'lowest_score', 'score_stddev',
+               'cv_percent', 'consistency_score', 'wins', 'losses', 'ties', 'win_percentage']
+
+
+def assert_close(actual, expected, label, digits=None):
+    """Equal up to float noise. statistics.mean/pstdev are exact and NumPy's are not, so a
+    value sitting on a rounding boundary may round one unit either way."""
+    if actual == expected:
+        return
+    assert actual is not None and expected is not None, f"{label}: {actual} != {expected}"
+    tolerance = 10 ** -digits + 1e-9 if digits is not None else 1e-6
+    assert abs(actual - expected) <= tolerance, f"{label}: {actual} != {expected}"
+
+
+def performances(player_id, scores, participation=1.0, differential=100, races=12):
+    """Rows for one player, newest first, one day apart."""
+    newest = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [(player_id, score, participation, differential, newest - timedelta(days=i), races)
+            for i, score in enumerate(scores)]
+
+
+# ==================== UNIT ====================
+
+@pytest.mark.unit
+def test_form_score_needs_ten_valid_wars_in_last_twenty():
+    rows = performances(1, [90] * 9)
+    rows += performances(2, [90] * 10)
+    # Player 3: ten valid wars, but the tenth is the 21st most recent performance
+    rows += [(player_id, score, 1.0 if i < 9 or i == 20 else 0.0, differential, created_at, races)
+             for i, (player_id, score, _, differential, created_at, races)
+             in enumerate(performances(3, [90] * 21))]
+
+    scores = form_scores(GuildPerformances.from_rows(rows))
+    assert 1 not in scores
+    assert scores[2] == 7.1  # 90 -> 6.0 + (6 / 16) * 3
+    assert 3 not in scores
+
+
+@pytest.mark.unit
+def test_clutch_factor_close_wars_and_spread():
+    rows = performances(1, [100, 80, 60], differential=150)
+    rows += [(1, 110, 1.0, -20, datetime(2026, 2, 1, tzinfo=timezone.utc), 12)]
+    rows += performances(2, [90, 90, 90], differential=10)          # no spread
+    rows += performances(3, [100, 80], differential=None)           # no close war
+
+    factors = clutch_factors(GuildPerformances.from_rows(rows))
+    assert factors == {1: 1.17}  # (110 - 87.5) / pstdev([110, 100, 80, 60])
+
+
+@pytest.mark.unit
+def test_sub_wars_are_normalized_and_potential_uses_overall_stddev():
+    rows = performances(1, [90] * 9) + [(1, 45, 0.5, 100, datetime(2020, 1, 1, tzinfo=timezone.utc), 6)]
+    perf = GuildPerformances.from_rows(rows)
+
+    last10 = last_x_stats(perf, 10)[1]
+    assert last10['average_score'] == 90.0
+    assert last10['score_stddev'] == 0.0
+    assert last10['war_count'] == 9.5
+    assert last10['lowest_score'] == 90  # sub wars don't count for highest/lowest
+    assert potentials(perf, {1: 4.3}) == {1: 94.3}
+    assert compute_guild_metrics(perf)[1]['consistency_score'] == 100
+
+
+# ==================== SYNTHETIC DATASET ====================
+
+@pytest.fixture(scope='module')
+def synthetic_db(postgres_server_url):
+    """DatabaseManager on a throwaway database holding the small synthetic dataset."""
+    from mkw_stats.database import DatabaseManager
+    from testing.synthetic_data import SCALES, SyntheticDataGenerator, apply_schema, temporary_database
+
+    with temporary_database(postgres_server_url, f"mkw_stats_engine_{os.getpid()}") as url:
+        apply_schema(url)
+        db = DatabaseManager(url)
+        SyntheticDataGenerator(SCALES['small'], SYNTHETIC_SEED).generate(db)
+        yield db
+        db.close()
+
+
+def load_guild(db, guild_id):
+    """({player_id: (player_name, score_stddev, has_tied_timestamps)}, GuildPerformances) for a guild."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.id, p.player_name, p.score_stddev,
+                   EXISTS (SELECT 1 FROM player_war_performances t WHERE t.player_id = p.id
+                           GROUP BY t.war_created_at HAVING COUNT(*) > 1),
+                   pwp.score, pwp.war_participation, pwp.team_differential, pwp.war_created_at,
+                   pwp.races_played
+            FROM players p
+            JOIN player_war_performances pwp ON pwp.player_id = p.id AND pwp.guild_id = p.guild_id
+            WHERE p.guild_id = %s AND p.is_active = TRUE
+        """, (guild_id,))
+        rows = cursor.fetchall()
+    players = {row[0]: (row[1], float(row[2]) if row[2] else 0.0, row[3]) for row in rows}
+    return players, GuildPerformances.from_rows((row[0],) + tuple(row[4:9]) for row in rows)
+
+
+def synthetic_guild_ids(db):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT guild_id FROM guild_configs ORDER BY guild_id")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+def test_engine_matches_per_player_methods(synthetic_db):
+    checked = 0
+    for guild_id in synthetic_guild_ids(synthetic_db):
+        players, perf = load_guild(synthetic_db, guild_id)
+        forms = form_scores(perf, synthetic_db.FORM_SCORE_DECAY_FACTOR, synthetic_db.FORM_SCORE_MIN_WARS)
+        clutch = clutch_factors(perf)
+        last10 = last_x_stats(perf, 10)
+        overall = last_x_stats(perf)
+        potential = potentials(perf, {player_id: stddev for player_id, (_, stddev, _) in players.items()}, last10)
+
+        for player_id, (name, _, tied) in players.items():
+            label = f"{name} (guild {guild_id})"
+            assert_close(clutch.get(player_id), synthetic_db.get_player_clutch_factor(name, guild_id),
+                         f"clutch {label}", digits=2)
+            expected_overall = synthetic_db.get_player_stats_last_x_wars(name, ALL_WARS, guild_id)
+            for key in LAST_X_KEYS:
+                assert_close(overall[player_id][key], expected_overall[key], f"{key} {label}")
+
+            # Recency windows are ambiguous when two wars share a timestamp
+            if tied:
+                continue
+            assert_close(forms.get(player_id), synthetic_db.get_player_form_score(name, guild_id),
+                         f"form {label}", digits=1)
+            assert_close(potential.get(player_id), synthetic_db.get_player_potential(name, guild_id),
+                         f"potential {label}", digits=1)
+            expected_last10 = synthetic_db.get_player_stats_last_x_wars(name, 10, guild_id)
+            for key in LAST_X_KEYS:
+                assert_close(last10[player_id][key], expected_last10[key], f"last10 {key} {label}")
+            checked += 1
+
+    assert checked >= 50
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+def test_refresh_caches_per_player_values(synthetic_db):
+    for guild_id in synthetic_guild_ids(synthetic_db):
+        assert synthetic_db.refresh_guild_volatile_metrics(guild_id) is not None
+        players, _ = load_guild(synthetic_db, guild_id)
+
+        with synthetic_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, player_name, war_count, form_score, clutch_factor, potential
+                FROM players WHERE guild_id = %s AND is_active = TRUE
+            """, (guild_id,))
+            cached = cursor.fetchall()
+
+        for player_id, name, war_count, form_score, clutch_factor, potential in cached:
+            if player_id not in players or players[player_id][2] or float(war_count) < 10:
+                continue
+            label = f"{name} (guild {guild_id})"
+            assert_close(float(form_score) if form_score is not None else None,
+                         synthetic_db.get_player_form_score(name, guild_id), f"form {label}", digits=1)
+            assert_close(float(clutch_factor) if clutch_factor is not None else None,
+                         synthetic_db.get_player_clutch_factor(name, guild_id), f"clutch {label}", digits=2)
+            assert_close(float(potential) if potential is not None else None,
+                         synthetic_db.get_player_potential(name, guild_id), f"potential {label}", digits=1)
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+def test_invalidated_players_are_requeued_from_leaderboards(synthetic_db):
+    guild_id = synthetic_guild_ids(synthetic_db)[0]
+    with synthetic_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE players SET avg10_score = NULL, clutch_factor = NULL, cached_metrics_updated_at = NULL
+            WHERE guild_id = %s AND is_active = TRUE
+            RETURNING player_name, war_count
+        """, (guild_id,))
+        war_counts = dict(cursor.fetchall())
+        conn.commit()
+
+    missing = synthetic_db.get_players_missing_metric('avg10', guild_id, list(war_counts))
+    assert missing == {guild_id: sorted(name for name, wars in war_counts.items() if wars >= 10)}
+    assert set(synthetic_db.get_players_missing_metric('clutch', guild_id)[guild_id]) == \
+        {name for name, wars in war_counts.items() if wars >= 2}
+    assert synthetic_db.get_players_missing_metric('avg', guild_id) == {}
+
+    # Once re-warmed, a player isn't re-queued even if the metric is still NULL
+    assert synthetic_db.refresh_guild_volatile_metrics(guild_id, missing[guild_id]) is not None
+    assert synthetic_db.get_players_missing_metric('avg10', guild_id) == {}
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+def test_players_without_performances_are_stamped(synthetic_db):
+    # war_count without performance rows, as for stats imported before player_war_performances
+    guild_id = synthetic_guild_ids(synthetic_db)[0]
+    assert synthetic_db.add_roster_player('Nopwp', guild_id=guild_id)
+    with synthetic_db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE players SET war_count = 12, cached_metrics_updated_at = NULL
+            WHERE guild_id = %s AND player_name = 'Nopwp'
+        """, (guild_id,))
+        conn.commit()
+    assert guild_id in synthetic_db.get_guilds_with_stale_metrics()
+
+    assert synthetic_db.refresh_guild_volatile_metrics(guild_id) is not None
+    assert guild_id not in synthetic_db.get_guilds_with_stale_metrics()
+    assert synthetic_db.get_players_missing_metric('avg10', guild_id, ['Nopwp']) == {}
+    assert synthetic_db.get_player_stats('Nopwp', guild_id)['avg10_score'] is None
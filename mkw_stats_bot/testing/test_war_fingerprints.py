@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Duplicate war detection tests.
+
+The unit tests pin what war_fingerprint() treats as the same war. The
+integration tests save wars into a throwaway database and check that
+find_duplicate_wars finds repeats anywhere in the window (under nicknames and
+in any order), catches repeats inside a batch before anything is inserted,
+that the war_fingerprints migration backfills the fingerprints save_war stores,
+and that players appended to a war are fingerprinted and reverted with it.
+
+Usage: TEST_DATABASE_URL=postgresql://postgres@localhost:5432/postgres pytest testing/test_war_fingerprints.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mkw_stats.war_fingerprint import war_fingerprint
+
+GUILD_ID = 920000000000000001
+ROSTER = ['Kairo', 'Lumen', 'Vyxa', 'Tozen', 'Mirex', 'Shano']
+NICKNAME = ('Kairo', 'kai')
+
+
+def war(scores, names=ROSTER):
+    return [{'name': name, 'score': score, 'races': 12} for name, score in zip(names, scores)]
+
+
+# ==================== UNIT ====================
+
+@pytest.mark.unit
+def test_fingerprint_is_order_case_and_nickname_insensitive():
+    results = war([90, 85, 80, 75, 70, 65])
+    reordered = [dict(result, name=result['name'].upper()) for result in reversed(results)]
+    reordered[-1]['name'] = 'kai'
+
+    assert war_fingerprint(reordered, 12, {'kai': 'Kairo'}) == war_fingerprint(results, 12)
+    assert war_fingerprint(reordered, 12) != war_fingerprint(results, 12)
+
+
+@pytest.mark.unit
+def test_fingerprint_covers_scores_and_race_count():
+    results = war([90, 85, 80, 75, 70, 65])
+    assert war_fingerprint(war([90, 85, 80, 75, 70, 66]), 12) != war_fingerprint(results, 12)
+    assert war_fingerprint(results, 11) != war_fingerprint(results, 12)
+    # Swapping two players' scores is a different war
+    assert war_fingerprint(war([85, 90, 80, 75, 70, 65]), 12) != war_fingerprint(results, 12)
+
+
+# ==================== DATABASE ====================
+
+@pytest.fixture(scope='module')
+def database_url(postgres_server_url):
+    pytest.importorskip('psycopg2')
+    from testing.synthetic_data import apply_schema, temporary_database
+
+    with temporary_database(postgres_server_url, f"mkw_fingerprints_{os.getpid()}") as url:
+        apply_schema(url)
+        yield url
+
+
+@pytest.fixture(scope='module')
+def db(database_url):
+    """DatabaseManager with a six-player guild (Kairo has the nickname 'kai') and three wars."""
+    from mkw_stats.database import DatabaseManager
+
+    db = DatabaseManager(database_url)
+    assert db.create_guild_config(GUILD_ID, 'Fingerprint Guild', ['Phantom'])
+    for name in ROSTER:
+        assert db.add_roster_player(name, 'pytest', guild_id=GUILD_ID)
+    assert db.add_nickname(*NICKNAME, GUILD_ID)
+    for base in (60, 70, 80):
+        assert db.save_war(war(range(base, base + 6)), guild_id=GUILD_ID)
+    yield db
+    db.close()
+
+
+def _oldest_war_id(db):
+    return min(w['id'] for w in db.get_all_wars(guild_id=GUILD_ID))
+
+
+def _war_count(db):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM wars WHERE guild_id = %s", (GUILD_ID,))
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.integration
+def test_repeat_of_older_war_is_found_within_window(db):
+    oldest = _oldest_war_id(db)
+    repeat = list(reversed(war(range(60, 66))))
+    repeat[-1]['name'] = NICKNAME[1]
+
+    assert db.find_duplicate_war(repeat, 12, GUILD_ID)['war_id'] == oldest
+    assert db.find_duplicate_war(repeat, 11, GUILD_ID) is None
+    # OCR often pads names with whitespace
+    repeat[-1]['name'] = f"  {NICKNAME[1]} "
+    assert db.find_duplicate_war(repeat, 12, GUILD_ID)['war_id'] == oldest
+
+    with db.get_connection() as conn:
+        conn.cursor().execute("UPDATE wars SET created_at = NOW() - INTERVAL '40 days' WHERE id = %s", (oldest,))
+        conn.commit()
+    assert db.find_duplicate_war(repeat, 12, GUILD_ID, window_days=30) is None
+    assert db.find_duplicate_war(repeat, 12, GUILD_ID, window_days=0)['war_id'] == oldest
+
+
+@pytest.mark.integration
+def test_batch_repeats_are_caught_before_insert(db):
+    wars_before = _war_count(db)
+    new = war([99, 98, 97, 96, 95, 94])
+    batch = [(new, 12), (list(reversed(new)), 12), (war(range(80, 86)), 12), (new, 11)]
+
+    duplicates = db.find_duplicate_wars(batch, GUILD_ID)
+    assert duplicates[0] is None
+    assert duplicates[1] == {'batch_index': 0}
+    assert duplicates[2]['war_id'] == max(w['id'] for w in db.get_all_wars(guild_id=GUILD_ID))
+    assert duplicates[3] is None
+    assert _war_count(db) == wars_before
+
+
+@pytest.mark.integration
+def test_edited_war_is_found_by_its_new_results(db):
+    war_id = _oldest_war_id(db)
+    edited = war([50, 51, 52, 53, 54, 55])
+    assert db.update_war_by_id(war_id, edited, 12, guild_id=GUILD_ID)
+    try:
+        assert db.find_duplicate_war(edited, 12, GUILD_ID)['war_id'] == war_id
+        assert db.find_duplicate_war(war(range(60, 66)), 12, GUILD_ID) is None
+    finally:
+        assert db.update_war_by_id(war_id, war(range(60, 66)), 12, guild_id=GUILD_ID)
+
+
+@pytest.mark.integration
+def test_backfill_matches_save_war(db):
+    from mkw_stats.migration_runner import MigrationRunner
+    from mkw_stats.migrations import MIGRATIONS
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, fingerprint FROM wars WHERE guild_id = %s ORDER BY id", (GUILD_ID,))
+        saved = cursor.fetchall()
+        cursor.execute("UPDATE wars SET fingerprint = NULL WHERE guild_id = %s", (GUILD_ID,))
+        conn.commit()
+
+    fingerprints = next(migration for migration in MIGRATIONS if migration.name == 'war_fingerprints')
+    MigrationRunner(db, batch_size=2, throttle_seconds=0).redo(fingerprints.version)
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, fingerprint FROM wars WHERE guild_id = %s ORDER BY id", (GUILD_ID,))
+        assert cursor.fetchall() == saved
+    assert all(fingerprint for _, fingerprint in saved)
+
+
+@pytest.mark.integration
+def test_appended_players_are_reverted_with_the_war(db):
+    def totals(name):
+        stats = db.get_player_stats(name, GUILD_ID)
+        return stats['war_count'], stats['total_score']
+
+    before = {name: totals(name) for name in ROSTER}
+    saved = db.save_war(war([90, 91, 92, 93], ROSTER[:4]), guild_id=GUILD_ID)
+    appended = db.append_players_to_war_by_id(saved['war_id'], war([70], ['Mirex']), guild_id=GUILD_ID)
+    assert appended['updated_players'] == ['Mirex']
+    # Already in the war under a nickname
+    assert db.append_players_to_war_by_id(saved['war_id'], war([70], ['kai']), guild_id=GUILD_ID) is None
+
+    combined = war([90, 91, 92, 93, 70], ROSTER[:4] + ['Mirex'])
+    assert db.find_duplicate_war(combined, 12, GUILD_ID)['war_id'] == saved['war_id']
+    assert totals('Mirex')[0] == before['Mirex'][0] + 1
+
+    assert db.remove_war_by_id(saved['war_id'], guild_id=GUILD_ID) == 5
+    assert {name: totals(name) for name in ROSTER} == before
+    assert db.verify_player_aggregates(GUILD_ID) == []